@@ -1,31 +1,76 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { leads, auth } from '../../services/api';
+import { leads, dashboard, auth } from '../../services/api';
 
 const Dashboard = () => {
   const [leadsData, setLeads] = useState([]);
+  const [summary, setSummary] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [selectedFile, setSelectedFile] = useState(null);
   const [uploadStatus, setUploadStatus] = useState('');
   const [selectedLead, setSelectedLead] = useState(null);
   const [messages, setMessages] = useState(null);
+  const syncToken = useRef(null);
   const navigate = useNavigate();
 
   useEffect(() => {
     fetchLeads();
+    fetchSummary();
   }, []);
 
+  // Totals come from the server-side rollups, not from the loaded lead list
+  const fetchSummary = async () => {
+    try {
+      const response = await dashboard.summary();
+      setSummary(response.data);
+    } catch (err) {
+      handleError(err);
+    }
+  };
+
   const fetchLeads = async () => {
     try {
       const response = await leads.getAll();
       setLeads(response.data);
+      syncToken.current = response.headers?.['x-sync-token'] || null;
       setLoading(false);
     } catch (err) {
       handleError(err);
     }
   };
 
+  // Pull only the leads changed since the last load and merge them in
+  const syncLeads = async () => {
+    if (!syncToken.current) {
+      return fetchLeads();
+    }
+    try {
+      let hasMore = true;
+      while (hasMore) {
+        const { data } = await leads.changes(syncToken.current);
+        const deleted = new Set(data.deleted);
+        setLeads((current) => {
+          const byId = new Map(current.filter((lead) => !deleted.has(lead.id)).map((lead) => [lead.id, lead]));
+          data.changed.forEach((lead) => byId.set(lead.id, lead));
+          return [...byId.values()].sort(
+            (a, b) => (b.lead_score ?? -1) - (a.lead_score ?? -1)
+              || new Date(b.created_at) - new Date(a.created_at)
+          );
+        });
+        syncToken.current = data.next;
+        hasMore = data.has_more;
+      }
+    } catch (err) {
+      if (err.response?.status === 410) {
+        // Token too old for the tombstone log; start over
+        syncToken.current = null;
+        return fetchLeads();
+      }
+      handleError(err);
+    }
+  };
+
   const handleError = (err) => {
     if (err.response?.status === 401) {
       auth.logout();
@@ -56,7 +101,8 @@ const Dashboard = () => {
       setUploadStatus('Uploading...');
       await leads.import(selectedFile);
       setUploadStatus('Upload successful!');
-      fetchLeads();
+      syncLeads();
+      fetchSummary();
     } catch (err) {
       handleError(err);
       setUploadStatus('Upload failed: ' + (err.response?.data?.error || 'Unknown error'));
@@ -66,7 +112,8 @@ const Dashboard = () => {
   const handleProcessLeads = async () => {
     try {
       await leads.process();
-      await fetchLeads(); // Refresh leads list with updated scores
+      await syncLeads(); // Pull only the leads whose scores changed
+      fetchSummary();
     } catch (err) {
       handleError(err);
     }
@@ -139,6 +186,22 @@ const Dashboard = () => {
           </div>
         </div>
 
+        {summary && (
+          <div className="grid grid-cols-2 md:grid-cols-4 gap-4 mb-8">
+            {[
+              ['Total Leads', summary.total_leads],
+              ['Average Score', summary.average_score ?? 'N/A'],
+              ['Qualified', summary.qualified],
+              ['Converted', `${summary.converted} (${(summary.conversion_rate * 100).toFixed(1)}%)`],
+            ].map(([label, value]) => (
+              <div key={label} className="bg-white shadow sm:rounded-lg px-4 py-5">
+                <p className="text-sm font-medium text-gray-500">{label}</p>
+                <p className="mt-1 text-2xl font-semibold text-gray-900">{value}</p>
+              </div>
+            ))}
+          </div>
+        )}
+
         {error && (
           <div className="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded mb-4">
             {error}
@@ -117,6 +117,7 @@ export const auth = {
 // Lead services
 export const leads = {
   getAll: () => api.get('/leads/'),
+  changes: (since, limit) => api.get('/leads/changes/', { params: { since, limit } }),
   import: (file) => {
     const formData = new FormData();
     formData.append('file', file);
@@ -130,4 +131,9 @@ export const leads = {
   generateMessages: (leadId) => api.post('/leads/test-message/', { lead_id: leadId }),
 };
 
+// Dashboard services
+export const dashboard = {
+  summary: (days = 30) => api.get('/dashboard/summary/', { params: { days } }),
+};
+
 export default api;
@@ -26,12 +26,25 @@ const mockMessages = {
   email: 'Dear John,\n\nI hope this email finds you well...',
 };
 
+const mockSummary = {
+  total_leads: 2,
+  average_score: 88.5,
+  qualified: 0,
+  converted: 1,
+  conversion_rate: 0.5,
+};
+
 const server = setupServer(
   // Mock leads list
   rest.get('http://localhost:8000/api/leads/', (req, res, ctx) => {
     return res(ctx.json(mockLeads));
   }),
 
+  // Mock dashboard summary
+  rest.get('http://localhost:8000/api/dashboard/summary/', (req, res, ctx) => {
+    return res(ctx.json(mockSummary));
+  }),
+
   // Mock lead processing
   rest.post('http://localhost:8000/api/leads/process/', (req, res, ctx) => {
     return res(ctx.json({ message: 'Leads processed successfully' }));
@@ -97,6 +110,16 @@ describe('Leads Management Integration', () => {
     });
   });
 
+  test('displays summary figures from the dashboard endpoint', async () => {
+    renderDashboard();
+
+    await waitFor(() => {
+      expect(screen.getByText('Total Leads')).toBeInTheDocument();
+      expect(screen.getByText('88.5')).toBeInTheDocument();
+      expect(screen.getByText('1 (50.0%)')).toBeInTheDocument();
+    });
+  });
+
   test('handles lead processing', async () => {
     renderDashboard();
 
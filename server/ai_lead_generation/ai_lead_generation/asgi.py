@@ -2,6 +2,9 @@
 ASGI config for ai_lead_generation project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server (e.g. ``uvicorn ai_lead_generation.asgi:application``)
+so long-lived streams such as ``api/events/`` hold a coroutine rather than a
+worker thread.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
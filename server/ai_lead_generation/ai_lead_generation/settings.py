@@ -52,6 +52,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'ai_lead_generation.api.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -117,21 +118,62 @@ AUTH_USER_MODEL = 'api.CustomUser'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'ai_lead_generation.api.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'ai_lead_generation.api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'ai_lead_generation.api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+# Responses at least this large are gzip/br compressed when the client accepts it
+API_COMPRESSION_MIN_SIZE = 1024
+
 # JWT settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
 }
 
+# Seconds the admin lead changelist reuses an exact COUNT(*) result
+ADMIN_COUNT_CACHE_TIMEOUT = 60
+
+# Threads that run bulk admin actions (rescore, outreach, mark contacted)
+LEAD_JOB_WORKERS = 2
+# Seconds without progress before a job is treated as lost and requeued
+LEAD_JOB_STALE_SECONDS = 600
+
+# Seconds an authenticated user stays cached by CachedJWTAuthentication. The
+# alias must name a cache shared by all workers (Redis, Memcached, file); a
+# process-local cache is only used when AUTH_USER_CACHE_SINGLE_PROCESS is set.
+AUTH_USER_CACHE_TIMEOUT = 300
+AUTH_USER_CACHE_ALIAS = 'default'
+AUTH_USER_CACHE_SINGLE_PROCESS = False
+
+# Per-process LRU of lead scores keyed by scoring inputs and rule version (0 disables it)
+SCORE_CACHE_MAX_ENTRIES = 50000
+
+# Artifact written by `manage.py train_conversion_model` and read by LeadScorer(mode='model')
+CONVERSION_MODEL_PATH = BASE_DIR / 'artifacts' / 'conversion_model.json'
+
+# Minimum seconds between incremental refreshes of the lookalike vector index
+LOOKALIKE_REFRESH_SECONDS = 5
+
+# Live lead events (SSE). The in-process backend only reaches subscribers on
+# the same worker; multi-process deployments need a shared backend.
+LEAD_EVENTS_BACKEND = 'ai_lead_generation.api.events.InProcessBackend'
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = True  # Only for development
+CORS_EXPOSE_HEADERS = ['X-Sync-Token']
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
@@ -11,6 +11,9 @@ DATABASES = {
 # Disable OpenAI API key requirement for tests
 OPENAI_API_KEY = 'dummy-key-for-testing'
 
+# Tests run in one process, so the local-memory cache may hold users
+AUTH_USER_CACHE_SINGLE_PROCESS = True
+
 # Use test email backend
 EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
 
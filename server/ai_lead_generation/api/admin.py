@@ -4,24 +4,70 @@ from django.urls import reverse, path
 from django.utils.safestring import mark_safe
 from django.http import JsonResponse
 from django.conf import settings
-import groq
-import os
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.views.decorators.cache import never_cache
 from dotenv import load_dotenv
-from .models import Lead, LeadMessage, Outreach
+from .models import Lead, LeadEnrichment, LeadJob, LeadMessage, Outreach, ScoringProfile
+from .jobs import start_job
+from .rollups import ROLLUP_FIELDS, add_rollup_delta, apply_rollup_deltas, new_rollup_deltas
+from .search import unindex_leads
+from .sync import record_deletions
+from .pagination import EstimatedCountPaginator
+from .message_generator import agenerate_llm_messages, generate_llm_messages
 
 load_dotenv()
 
+INDUSTRY_FILTER_CACHE_KEY = 'admin-lead-industries'
+INDUSTRY_FILTER_CACHE_TIMEOUT = 300
+
+class IndustryListFilter(admin.SimpleListFilter):
+    """Industry filter whose options come from a cached distinct list"""
+    title = 'industry'
+    parameter_name = 'industry'
+
+    def lookups(self, request, model_admin):
+        industries = cache.get(INDUSTRY_FILTER_CACHE_KEY)
+        if industries is None:
+            industries = list(
+                Lead.objects.exclude(industry='').order_by('industry')
+                .values_list('industry', flat=True).distinct()
+            )
+            cache.set(INDUSTRY_FILTER_CACHE_KEY, industries, INDUSTRY_FILTER_CACHE_TIMEOUT)
+        return [(industry, industry) for industry in industries]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(industry=self.value())
+        return queryset
+
+class LeadEnrichmentInline(admin.StackedInline):
+    model = LeadEnrichment
+    can_delete = False
+    extra = 0
+    readonly_fields = ('funding_amount', 'industry', 'open_positions', 'source', 'fetched_at')
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
 @admin.register(Lead)
 class LeadAdmin(admin.ModelAdmin):
     list_display = ('name', 'company', 'email', 'industry', 'company_size_display', 
-                   'funding_display', 'lead_score_display', 'status', 'linkedin_url', 'has_outreach')
-    list_filter = ('status', 'industry', 'created_at')
-    search_fields = ('name', 'company', 'email', 'industry', 'metadata__linkedin_url')
-    readonly_fields = ('created_at', 'updated_at', 'lead_score', 'generate_messages_button', 'linkedin_url')
+                   'funding_display', 'lead_score_display', 'status', 'linkedin_link', 'has_outreach')
+    list_filter = ('status', IndustryListFilter, 'created_at')
+    search_fields = ('name', 'company', 'email', 'industry', 'linkedin_url', 'domain')
+    # Large tables: no second COUNT(*) for the unfiltered total, estimated page counts
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    readonly_fields = ('created_at', 'updated_at', 'lead_score', 'generate_messages_button', 'linkedin_link',
+                       'source', 'domain')
+    inlines = (LeadEnrichmentInline,)
+    actions = ('rescore_selected', 'generate_outreach_for_selected', 'mark_selected_contacted')
     
     fieldsets = (
         ('Basic Information', {
-            'fields': ('name', 'email', 'company', 'position', 'linkedin_url')
+            'fields': ('name', 'email', 'company', 'position', 'linkedin_link')
         }),
         ('Company Details', {
             'fields': ('industry', 'company_size', 'funding_amount', 'open_positions')
@@ -33,7 +79,7 @@ class LeadAdmin(admin.ModelAdmin):
             'fields': ('status', 'lead_score', 'last_contacted')
         }),
         ('Additional Information', {
-            'fields': ('notes', 'metadata')
+            'fields': ('notes', 'metadata', 'source', 'domain')
         }),
         ('System Fields', {
             'fields': ('created_by', 'created_at', 'updated_at'),
@@ -41,6 +87,12 @@ class LeadAdmin(admin.ModelAdmin):
         })
     )
 
+    def get_queryset(self, request):
+        # Annotate once instead of running an EXISTS query per changelist row
+        return super().get_queryset(request).annotate(
+            outreach_exists=Exists(Outreach.objects.filter(lead=OuterRef('pk')))
+        )
+
     def get_urls(self):
         urls = super().get_urls()
         custom_urls = [
@@ -49,6 +101,11 @@ class LeadAdmin(admin.ModelAdmin):
                 self.admin_site.admin_view(self.generate_messages_view),
                 name='generate-lead-messages',
             ),
+            path(
+                '<int:lead_id>/generate-messages/async/',
+                never_cache(self.agenerate_messages_view),
+                name='generate-lead-messages-async',
+            ),
         ]
         return custom_urls + urls
 
@@ -66,7 +123,7 @@ class LeadAdmin(admin.ModelAdmin):
                     button.textContent = 'Generating...';
                     resultDiv.innerHTML = '<div style="margin-top: 10px;">Generating messages...</div>';
                     
-                    fetch('/admin/api/lead/{id}/generate-messages/')
+                    fetch('/admin/api/lead/{id}/generate-messages/async/')
                     .then(response => response.json())
                     .then(data => {{
                         button.disabled = false;
@@ -91,18 +148,20 @@ class LeadAdmin(admin.ModelAdmin):
     generate_messages_button.short_description = "Generate Messages"
     generate_messages_button.allow_tags = True
 
-    def linkedin_url(self, obj):
+    def linkedin_link(self, obj):
         """Display LinkedIn URL as a clickable link"""
-        if obj.metadata and 'linkedin_url' in obj.metadata:
-            url = obj.metadata['linkedin_url']
-            return format_html('<a href="{}" target="_blank"><img src="/static/admin/img/icon-yes.svg" alt="LinkedIn" style="height: 15px; width: 15px;"/> LinkedIn</a>', url)
+        if obj.linkedin_url:
+            return format_html('<a href="{}" target="_blank"><img src="/static/admin/img/icon-yes.svg" alt="LinkedIn" style="height: 15px; width: 15px;"/> LinkedIn</a>', obj.linkedin_url)
         return format_html('<img src="/static/admin/img/icon-no.svg" alt="No LinkedIn" style="height: 15px; width: 15px;"/> No LinkedIn')
-    linkedin_url.short_description = 'LinkedIn'
+    linkedin_link.short_description = 'LinkedIn'
 
     def has_outreach(self, obj):
+        if hasattr(obj, 'outreach_exists'):
+            return obj.outreach_exists
         return obj.outreach_emails.exists()
     has_outreach.boolean = True
     has_outreach.short_description = "Has Outreach"
+    has_outreach.admin_order_field = 'outreach_exists'
 
     def company_size_display(self, obj):
         if not obj.company_size:
@@ -133,117 +192,43 @@ class LeadAdmin(admin.ModelAdmin):
         )
     lead_score_display.short_description = 'Lead Score'
 
+    def delete_queryset(self, request, queryset):
+        # QuerySet.delete() skips Lead.delete, so do its bookkeeping in bulk here
+        with transaction.atomic():
+            rows = list(queryset.order_by().values('id', *ROLLUP_FIELDS))
+            queryset.delete()
+            lead_ids = [row['id'] for row in rows]
+            unindex_leads(lead_ids)
+            record_deletions([(row['id'], row['created_by_id']) for row in rows])
+            rollup_deltas = new_rollup_deltas()
+            for row in rows:
+                add_rollup_delta(rollup_deltas, row, -1)
+            apply_rollup_deltas(rollup_deltas)
+
+    def _start_job(self, request, queryset, action):
+        job = start_job(action, queryset.values_list('id', flat=True), user=request.user)
+        url = reverse('admin:api_leadjob_change', args=[job.pk])
+        self.message_user(request, format_html(
+            'Started "{}" for {} leads in the background. <a href="{}">View progress</a>',
+            job.get_action_display(), job.total, url
+        ))
+
+    @admin.action(description='Rescore selected leads')
+    def rescore_selected(self, request, queryset):
+        self._start_job(request, queryset, 'rescore')
+
+    @admin.action(description='Generate outreach for selected leads')
+    def generate_outreach_for_selected(self, request, queryset):
+        self._start_job(request, queryset, 'generate_outreach')
+
+    @admin.action(description='Mark selected leads as contacted')
+    def mark_selected_contacted(self, request, queryset):
+        self._start_job(request, queryset, 'mark_contacted')
+
     def generate_messages_view(self, request, lead_id):
         lead = Lead.objects.get(id=lead_id)
-        client = groq.Groq(api_key=os.getenv('GROQ_API_KEY'))
-        
-        # Build detailed company profile
-        company_profile = {
-            'name': lead.company,
-            'industry': lead.industry,
-            'contact_name': lead.name,
-            'position': lead.position,
-            'achievements': []
-        }
-        
-        # Add funding details if available
-        if lead.funding_amount:
-            amount = float(lead.funding_amount)
-            if amount >= 1_000_000_000:
-                company_profile['achievements'].append(
-                    f"secured ${amount/1_000_000_000:.1f}B in funding"
-                )
-            elif amount >= 1_000_000:
-                company_profile['achievements'].append(
-                    f"raised ${amount/1_000_000:.1f}M"
-                )
-        
-        # Add growth indicators
-        if lead.open_positions:
-            company_profile['achievements'].append(
-                f"actively expanding with {lead.open_positions} open positions"
-            )
-        
-        # Add company size context
-        if lead.company_size:
-            company_profile['size_context'] = f"a {lead.company_size} company in the {lead.industry} space"
-        else:
-            company_profile['size_context'] = f"a company making waves in the {lead.industry} space"
-        
-        # Format achievements for email
-        achievements_text = ""
-        if company_profile['achievements']:
-            achievements_text = " and " + ", ".join(company_profile['achievements'])
-        
-        # Generate email content
-        email_prompt = f"""Generate a personalized email following this exact structure but with natural language:
-
-Hi {{name}},
-
-I came across {company_profile['name']}'s work in the {company_profile['industry']} sector. As {company_profile['size_context']}{achievements_text}, your innovations caught my attention.
-
-Your role as {company_profile['position']} particularly interests me, and I'd love to schedule a quick call to learn more about your work and discuss potential synergies.
-
-Would you have 15 minutes this week for a brief chat?
-
-Best regards,
-[Your name]
-
-REQUIREMENTS:
-1. Use the company details provided but make it sound natural and conversational
-2. Keep the same brief, friendly tone as the template
-3. Maintain the 4-part structure: opening, observation, interest, call to action
-4. Reference their specific achievements naturally in the conversation
-5. Keep it concise and focused on learning about their company
-"""
-        
-        # Generate LinkedIn message
-        linkedin_prompt = f"""Generate a personalized LinkedIn connection message following this exact structure:
-
-Hi {company_profile['contact_name']},
-
-I came across {company_profile['name']}'s innovative work in {company_profile['industry']}. {company_profile['size_context']}{achievements_text}. Would love to connect and learn more about your work as {company_profile['position']}.
-
-REQUIREMENTS:
-1. Use this exact information but make it sound natural:
-   - Company: {company_profile['name']}
-   - Industry: {company_profile['industry']}
-   - Role: {company_profile['position']}
-   - Size: {company_profile['size_context']}
-   - Achievement: {company_profile['achievements'][0] if company_profile['achievements'] else 'growth in the industry'}
-2. Must be under 300 characters
-3. Keep the same friendly, professional tone
-4. Show specific knowledge of their company
-5. Focus on genuine interest in their work
-6. End with connecting to learn more
-7. Do not mention selling or services
-"""
-        
         try:
-            # Generate email content
-            email_completion = client.chat.completions.create(
-                messages=[{
-                    "role": "user", 
-                    "content": email_prompt
-                }],
-                model="mixtral-8x7b-32768",
-                temperature=0.7,
-                max_tokens=1000,
-            )
-            
-            # Generate LinkedIn message
-            linkedin_completion = client.chat.completions.create(
-                messages=[{
-                    "role": "user", 
-                    "content": linkedin_prompt
-                }],
-                model="mixtral-8x7b-32768",
-                temperature=0.7,
-                max_tokens=300,
-            )
-            
-            email_content = email_completion.choices[0].message.content.strip()
-            linkedin_content = linkedin_completion.choices[0].message.content.strip()
+            email_content, linkedin_content = generate_llm_messages(lead)
             
             # Save both messages
             Outreach.objects.create(
@@ -263,10 +248,67 @@ REQUIREMENTS:
                 'message': str(e)
             }, status=500)
 
+    async def agenerate_messages_view(self, request, lead_id):
+        """Async variant of generate_messages_view for ASGI deployments.
+
+        AdminSite.admin_view only wraps sync views, so staff access is checked here.
+        """
+        user = await request.auser()
+        if not (user.is_active and user.is_staff):
+            return JsonResponse({'status': 'error', 'message': 'Permission denied'}, status=403)
+        try:
+            lead = await Lead.objects.aget(id=lead_id)
+        except Lead.DoesNotExist:
+            return JsonResponse({'status': 'error', 'message': f'Lead {lead_id} not found'}, status=404)
+        try:
+            email_content, linkedin_content = await agenerate_llm_messages(lead)
+            await Outreach.objects.acreate(
+                lead=lead,
+                email_content=email_content,
+                linkedin_content=linkedin_content
+            )
+            return JsonResponse({
+                'status': 'success',
+                'message': 'Messages generated successfully'
+            })
+        except Exception as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=500)
+
+@admin.register(LeadJob)
+class LeadJobAdmin(admin.ModelAdmin):
+    list_display = ('action', 'status', 'progress_display', 'failed', 'created_by', 'created_at', 'finished_at')
+    list_filter = ('action', 'status')
+    list_select_related = ('created_by',)
+    readonly_fields = ('action', 'status', 'progress_display', 'total', 'processed', 'failed', 'error',
+                       'created_by', 'created_at', 'started_at', 'heartbeat_at', 'finished_at')
+    exclude = ('lead_ids',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def progress_display(self, obj):
+        return f'{obj.processed}/{obj.total} ({obj.progress}%)'
+    progress_display.short_description = 'Progress'
+
+@admin.register(ScoringProfile)
+class ScoringProfileAdmin(admin.ModelAdmin):
+    list_display = ('user', 'name', 'version', 'updated_at')
+    list_select_related = ('user',)
+    search_fields = ('name', 'user__username', 'user__email')
+    readonly_fields = ('version', 'created_at', 'updated_at')
+    raw_id_fields = ('user',)
+
 @admin.register(Outreach)
 class OutreachAdmin(admin.ModelAdmin):
     list_display = ('lead_company', 'lead_name', 'generated_at', 'email_status', 'linkedin_status', 'message_previews')
     list_filter = ('is_approved', 'is_linkedin_approved', 'generated_at')
+    list_select_related = ('lead',)
     search_fields = ('lead__company', 'lead__name', 'email_content', 'linkedin_content')
     readonly_fields = ('generated_at', 'lead_link', 'email_content', 'linkedin_content')
     
@@ -329,6 +371,7 @@ class OutreachAdmin(admin.ModelAdmin):
 class LeadMessageAdmin(admin.ModelAdmin):
     list_display = ('lead', 'created_at', 'message_preview')
     list_filter = ('created_at',)
+    list_select_related = ('lead',)
     search_fields = ('lead__name', 'lead__company', 'linkedin_message', 'email_content')
     readonly_fields = ('created_at',)
     
@@ -4,3 +4,13 @@ class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ai_lead_generation.api'
     verbose_name = 'Lead Generation API'
+
+    def ready(self):
+        from django.conf import settings
+        from django.db.models.signals import post_delete, post_save
+        from .authentication import invalidate_user_on_change
+
+        post_save.connect(invalidate_user_on_change, sender=settings.AUTH_USER_MODEL,
+                          dispatch_uid='api_invalidate_cached_user_save')
+        post_delete.connect(invalidate_user_on_change, sender=settings.AUTH_USER_MODEL,
+                            dispatch_uid='api_invalidate_cached_user_delete')
@@ -0,0 +1,117 @@
+"""JWT authentication that resolves users from a cache instead of the database.
+
+``CachedJWTAuthentication`` keeps what the token checks need for a user (the
+id, ``is_active`` and a digest of the password hash) in the cache configured
+by ``AUTH_USER_CACHE_ALIAS`` for ``AUTH_USER_CACHE_TIMEOUT`` seconds, so
+authenticating a request on a cache hit runs no queries. The user handed to
+the view has every other field deferred and loads it on first access.
+
+Entries are keyed by user id and a per-user token version kept in the same
+cache. Saving or deleting the user bumps the version, which covers password
+changes and deactivation; ``QuerySet.update()`` on users bypasses this and
+should be followed by ``invalidate_cached_user``.
+
+The cache must be shared by every worker process (Redis, Memcached, a file
+cache), otherwise a worker that did not handle the save keeps authenticating
+a deactivated user until its entry expires. Process-local backends are
+therefore only used when ``AUTH_USER_CACHE_SINGLE_PROCESS`` is set; without
+it the user is loaded from the database on every request.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+AUTH_USER_CACHE_PREFIX = 'jwt-user'
+# Bump when the cached representation changes so stale entries are ignored
+AUTH_USER_CACHE_VERSION = 2
+DEFAULT_AUTH_USER_CACHE_TIMEOUT = 300
+# Backends whose entries are not visible to other worker processes
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+def _cache():
+    """The user cache, or None when it may not be used"""
+    cache = caches[getattr(settings, 'AUTH_USER_CACHE_ALIAS', 'default')]
+    if isinstance(cache, PROCESS_LOCAL_CACHES) and not getattr(settings, 'AUTH_USER_CACHE_SINGLE_PROCESS', False):
+        return None
+    return cache
+
+
+def token_version_key(user_id):
+    return f'{AUTH_USER_CACHE_PREFIX}:{AUTH_USER_CACHE_VERSION}:{user_id}:version'
+
+
+def user_cache_key(user_id, token_version):
+    return f'{AUTH_USER_CACHE_PREFIX}:{AUTH_USER_CACHE_VERSION}:{user_id}:{token_version}'
+
+
+def invalidate_cached_user(user_id):
+    """Bump the user's token version so cached entries for it miss"""
+    cache = _cache()
+    if cache is None:
+        return
+    key = token_version_key(user_id)
+    # The version outlives the entries it guards so a bump is never lost
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, timeout=None)
+
+
+def invalidate_user_on_change(sender, instance, **kwargs):
+    """post_save/post_delete receiver for the user model"""
+    invalidate_cached_user(getattr(instance, api_settings.USER_ID_FIELD))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that caches the checked fields of each user"""
+
+    def get_user(self, validated_token):
+        cache = _cache()
+        if cache is None:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        # Read the version before the user so a save racing a miss can only
+        # leave its stale entry under the version it replaced
+        token_version = cache.get(token_version_key(user_id), 0)
+        key = user_cache_key(user_id, token_version)
+        cached = cache.get(key)
+        if cached is None:
+            user = super().get_user(validated_token)
+            cache.set(key, {
+                'is_active': user.is_active,
+                'password_digest': get_md5_hash_password(user.password),
+            }, getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', DEFAULT_AUTH_USER_CACHE_TIMEOUT))
+            return user
+
+        # The same checks JWTAuthentication makes, against the cached fields
+        if api_settings.CHECK_USER_IS_ACTIVE and not cached['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != cached['password_digest']:
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return self._deferred_user(user_id, cached['is_active'])
+
+    def _deferred_user(self, user_id, is_active):
+        """A user instance holding only the id and is_active; other fields load on access"""
+        id_field = self.user_model._meta.get_field(api_settings.USER_ID_FIELD)
+        known = {id_field.attname: id_field.to_python(user_id), 'is_active': is_active}
+        # from_db expects values in concrete field order
+        names = [field.attname for field in self.user_model._meta.concrete_fields if field.attname in known]
+        return self.user_model.from_db(
+            router.db_for_read(self.user_model), names, [known[name] for name in names]
+        )
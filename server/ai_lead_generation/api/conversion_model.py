@@ -0,0 +1,246 @@
+"""Conversion-probability model trained on recorded lead outcomes.
+
+``train_model`` fits an L2-regularized logistic regression in NumPy on
+leads whose status records an outcome (``converted`` is positive,
+``unqualified`` negative). The features are log company size, log funding
+and a one-hot of the common industries. The fitted model is saved as a
+versioned JSON artifact (``CONVERSION_MODEL_PATH``); ``load_model`` reads it
+once per process and reloads when the file changes. ``predict_frame``
+scores a ``LeadFrame`` in one vectorized pass, so batch inference over a
+snapshot needs no model instances.
+"""
+import json
+import logging
+import math
+import os
+import threading
+from datetime import datetime, timezone as dt_timezone
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = 1
+POSITIVE_STATUSES = ('converted',)
+NEGATIVE_STATUSES = ('unqualified',)
+FEATURE_COLUMNS = ('company_size', 'funding_amount', 'industry')
+MAX_INDUSTRIES = 50
+MIN_INDUSTRY_COUNT = 5
+
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+
+class ModelError(ValueError):
+    """Raised when there is not enough data to train, or an artifact is unusable"""
+
+
+def model_path():
+    return str(getattr(settings, 'CONVERSION_MODEL_PATH', settings.BASE_DIR / 'artifacts' / 'conversion_model.json'))
+
+
+def _size(value):
+    try:
+        return max(int(value), 0) if value else 0
+    except (ValueError, TypeError):
+        return 0
+
+
+def _industry(value):
+    return str(value).strip().lower() if value else ''
+
+
+def _categorical(column, convert):
+    """Apply ``convert`` once per distinct value of a Categorical column"""
+    table = np.empty(len(column.categories), dtype=object)
+    table[:] = [convert(value) for value in column.categories]
+    return table[column.codes]
+
+
+class ConversionModel:
+    """A fitted logistic regression over lead features"""
+
+    def __init__(self, weights, bias, mean, std, industries, version=1, trained_at=None, metrics=None):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.std = np.asarray(std, dtype=np.float64)
+        self.industries = list(industries)
+        self._industry_index = {industry: i for i, industry in enumerate(self.industries)}
+        self.version = version
+        self.trained_at = trained_at
+        self.metrics = metrics or {}
+
+    @staticmethod
+    def numeric_features(sizes, fundings):
+        """log1p of company size and funding, as a ``(rows, 2)`` array"""
+        sizes = np.asarray(sizes, dtype=np.float64)
+        fundings = np.nan_to_num(np.asarray(fundings, dtype=np.float64), nan=0.0)
+        return np.column_stack([np.log1p(sizes), np.log1p(np.maximum(fundings, 0.0))])
+
+    def design_matrix(self, sizes, fundings, industries):
+        """Standardized numeric features followed by the industry one-hot"""
+        numeric = (self.numeric_features(sizes, fundings) - self.mean) / self.std
+        onehot = np.zeros((len(numeric), len(self.industries)))
+        columns = np.fromiter(
+            (self._industry_index.get(industry, -1) for industry in industries), dtype=np.intp, count=len(numeric)
+        )
+        known = columns >= 0
+        onehot[np.nonzero(known)[0], columns[known]] = 1.0
+        return np.hstack([numeric, onehot])
+
+    def predict_raw(self, sizes, fundings, industries):
+        logits = self.design_matrix(sizes, fundings, industries) @ self.weights + self.bias
+        return 1.0 / (1.0 + np.exp(-logits))
+
+    def predict_frame(self, frame):
+        """Conversion probability for every row of a ``LeadFrame``"""
+        sizes, fundings, industries = frame_inputs(frame)
+        return self.predict_raw(sizes, fundings, industries)
+
+    def predict_leads(self, leads):
+        """Conversion probability for lead-like objects"""
+        leads = list(leads)
+        return self.predict_raw(
+            [_size(lead.company_size) for lead in leads],
+            [float(lead.funding_amount) if lead.funding_amount else 0.0 for lead in leads],
+            [_industry(lead.industry) for lead in leads],
+        )
+
+    def to_dict(self):
+        return {
+            'format': ARTIFACT_FORMAT,
+            'version': self.version,
+            'trained_at': self.trained_at,
+            'metrics': self.metrics,
+            'weights': self.weights.tolist(),
+            'bias': self.bias,
+            'mean': self.mean.tolist(),
+            'std': self.std.tolist(),
+            'industries': self.industries,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('format') != ARTIFACT_FORMAT:
+            raise ModelError(f"Unsupported model artifact format: {data.get('format')}")
+        return cls(
+            data['weights'], data['bias'], data['mean'], data['std'], data['industries'],
+            version=data.get('version', 1), trained_at=data.get('trained_at'), metrics=data.get('metrics'),
+        )
+
+    def save(self, path=None):
+        """Write the artifact atomically"""
+        path = path or model_path()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+        return path
+
+
+def frame_inputs(frame):
+    """Raw model inputs ``(sizes, fundings, industries)`` from a ``LeadFrame``"""
+    sizes, industries = frame['company_size'], frame['industry']
+    sizes = _categorical(sizes, _size) if hasattr(sizes, 'codes') else [_size(value) for value in sizes]
+    industries = (_categorical(industries, _industry) if hasattr(industries, 'codes')
+                  else [_industry(value) for value in industries])
+    return np.asarray(sizes, dtype=np.float64), frame['funding_amount'], industries
+
+
+def _log_loss(probabilities, labels):
+    probabilities = np.clip(probabilities, 1e-12, 1 - 1e-12)
+    return float(-np.mean(labels * np.log(probabilities) + (1 - labels) * np.log(1 - probabilities)))
+
+
+def train_model(frame, iterations=500, learning_rate=0.5, l2=1e-3, min_samples=20, version=1):
+    """Fit a ``ConversionModel`` on the labelled rows of a ``LeadFrame``"""
+    statuses = frame.values('status')
+    positive = np.isin(statuses, POSITIVE_STATUSES)
+    labelled = positive | np.isin(statuses, NEGATIVE_STATUSES)
+    if labelled.sum() < min_samples:
+        raise ModelError(f"Need at least {min_samples} converted or unqualified leads, found {int(labelled.sum())}")
+    labels = positive[labelled].astype(np.float64)
+    if labels.min() == labels.max():
+        raise ModelError("Training data needs both converted and unqualified leads")
+
+    sizes, fundings, industries = frame_inputs(frame.filter(labelled))
+    numeric = ConversionModel.numeric_features(sizes, fundings)
+    mean = numeric.mean(axis=0)
+    std = numeric.std(axis=0)
+    std[std == 0] = 1.0
+
+    names, counts = np.unique(np.asarray(industries, dtype=object).astype(str), return_counts=True)
+    common = [(count, name) for name, count in zip(names, counts) if name and count >= MIN_INDUSTRY_COUNT]
+    vocabulary = [name for _, name in sorted(common, key=lambda pair: (-pair[0], pair[1]))[:MAX_INDUSTRIES]]
+
+    model = ConversionModel(np.zeros(2 + len(vocabulary)), 0.0, mean, std, vocabulary, version=version)
+    x = model.design_matrix(sizes, fundings, industries)
+    weights, bias = model.weights, 0.0
+    rows = len(labels)
+    for _ in range(iterations):
+        probabilities = 1.0 / (1.0 + np.exp(-(x @ weights + bias)))
+        error = probabilities - labels
+        weights = weights - learning_rate * (x.T @ error / rows + l2 * weights)
+        bias -= learning_rate * float(error.mean())
+    model.weights, model.bias = weights, bias
+
+    probabilities = model.predict_raw(sizes, fundings, industries)
+    model.metrics = {
+        'samples': rows,
+        'positives': int(labels.sum()),
+        'log_loss': round(_log_loss(probabilities, labels), 4),
+        'accuracy': round(float(np.mean((probabilities >= 0.5) == (labels == 1))), 4),
+    }
+    model.trained_at = datetime.now(dt_timezone.utc).isoformat()
+    return model
+
+
+def train_from_database(queryset=None, path=None, **kwargs):
+    """Train on the leads in ``queryset`` and save the next artifact version"""
+    from .frames import LeadFrame
+    from .models import Lead
+
+    if queryset is None:
+        queryset = Lead.objects.filter(status__in=POSITIVE_STATUSES + NEGATIVE_STATUSES)
+    frame = LeadFrame.load(queryset, columns=('status',) + FEATURE_COLUMNS)
+    previous = load_model(path)
+    model = train_model(frame, version=previous.version + 1 if previous else 1, **kwargs)
+    model.save(path)
+    return model
+
+
+def load_model(path=None):
+    """Return the saved model, or None if there is no usable artifact.
+
+    Models are cached per process and reloaded when the file changes.
+    """
+    path = path or model_path()
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    cached = _loaded.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path) as f:
+            model = ConversionModel.from_dict(json.load(f))
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.error(f"Could not load conversion model from {path}: {str(e)}")
+        return None
+    with _loaded_lock:
+        _loaded[path] = (mtime, model)
+    return model
+
+
+def predict_conversion(queryset=None, path=None):
+    """Batch inference: return ``(ids, probabilities)`` for the leads in ``queryset``"""
+    from .frames import LeadFrame
+
+    model = load_model(path)
+    if model is None:
+        raise ModelError("No conversion model has been trained")
+    frame = LeadFrame.load(queryset, columns=FEATURE_COLUMNS)
+    return frame.ids, model.predict_frame(frame)
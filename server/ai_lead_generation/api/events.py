@@ -0,0 +1,158 @@
+"""Live lead events pushed to clients over server-sent events.
+
+Writers call ``publish_event`` with the owning user's id; the event is handed
+to the configured backend once the surrounding transaction commits. The
+default ``InProcessBackend`` fans events out to subscribers held by this
+process, which is enough for a single ASGI worker. Deployments with several
+workers point ``LEAD_EVENTS_BACKEND`` at a backend that shares events between
+processes; it only needs ``subscribe(user_id)`` and ``publish(user_id, event)``.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import threading
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EVENTS_BACKEND = 'ai_lead_generation.api.events.InProcessBackend'
+EVENTS_HEARTBEAT_SECONDS = 15
+SUBSCRIBER_QUEUE_SIZE = 100
+
+_event_ids = itertools.count(1)
+_backend = None
+_backend_lock = threading.Lock()
+
+
+class Subscription:
+    """One open event stream; events are queued on the subscriber's event loop"""
+
+    def __init__(self, backend, user_id, loop):
+        self.backend = backend
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def deliver(self, event):
+        """Queue an event; safe to call from any thread"""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self._put(event)
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The subscriber's loop has gone away
+            self.close()
+
+    def _put(self, event):
+        if self.queue.full():
+            # Slow consumer: drop the oldest event rather than block writers
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout=None):
+        """Wait for the next event; raises ``asyncio.TimeoutError`` after ``timeout``"""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    def close(self):
+        self.backend.unsubscribe(self)
+
+
+class InProcessBackend:
+    """Deliver events to subscribers in the current process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, user_id):
+        subscription = Subscription(self, user_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+def get_backend():
+    """Return the process-wide events backend"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                path = getattr(settings, 'LEAD_EVENTS_BACKEND', DEFAULT_EVENTS_BACKEND)
+                _backend = import_string(path)()
+    return _backend
+
+
+def publish_event(user_id, event_type, data):
+    """Publish an event to ``user_id``'s streams after the current transaction commits"""
+    if user_id is None:
+        return
+    event = {'id': next(_event_ids), 'type': event_type, 'data': data}
+
+    def send():
+        try:
+            get_backend().publish(user_id, event)
+        except Exception as e:
+            logger.error(f"Error publishing {event_type} event: {str(e)}")
+
+    transaction.on_commit(send)
+
+
+def publish_lead_change(before, lead):
+    """Publish ``lead.updated`` if the lead's score or status changed"""
+    if not before:
+        return
+    if before.get('status') == lead.status and before.get('lead_score') == lead.lead_score:
+        return
+    publish_event(lead.created_by_id, 'lead.updated', {
+        'id': lead.pk,
+        'status': lead.status,
+        'lead_score': lead.lead_score,
+    })
+
+
+def format_event(event):
+    """Encode an event in the text/event-stream wire format"""
+    payload = json.dumps(event['data'], separators=(',', ':'), default=str)
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n"
+
+
+async def event_stream(subscription, heartbeat=EVENTS_HEARTBEAT_SECONDS):
+    """Yield SSE frames for ``subscription`` until the client disconnects"""
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            try:
+                event = await subscription.get(timeout=heartbeat)
+            except asyncio.TimeoutError:
+                # Comment frames keep proxies from closing an idle stream
+                yield ': keepalive\n\n'
+                continue
+            yield format_event(event)
+    finally:
+        subscription.close()
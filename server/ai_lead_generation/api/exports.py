@@ -0,0 +1,65 @@
+"""Streaming serializers used by the lead export endpoint."""
+import csv
+import json
+import zlib
+from django.core.serializers.json import DjangoJSONEncoder
+
+EXPORT_FIELDS = (
+    'id', 'name', 'email', 'company', 'position', 'industry', 'company_size',
+    'funding_amount', 'lead_score', 'open_positions', 'status',
+    'last_contacted', 'created_at', 'updated_at',
+)
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """File-like object whose write() hands the value straight back"""
+    def write(self, value):
+        return value
+
+
+def iter_lead_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield export rows as tuples without materializing model instances"""
+    return queryset.order_by('id').values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+
+
+def stream_csv(rows):
+    """Yield a CSV document one line at a time"""
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_ndjson(rows):
+    """Yield one JSON object per line"""
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+def stream_gzip(lines, flush_size=64 * 1024):
+    """Gzip a stream of text lines, emitting compressed blocks of bounded size"""
+    compressor = zlib.compressobj(wbits=31)  # 31 selects the gzip container
+    buffer = []
+    buffered = 0
+    for line in lines:
+        data = line.encode('utf-8')
+        buffer.append(data)
+        buffered += len(data)
+        if buffered >= flush_size:
+            block = compressor.compress(b''.join(buffer))
+            buffer, buffered = [], 0
+            if block:
+                yield block
+    yield compressor.compress(b''.join(buffer)) + compressor.flush()
+
+
+def stream_leads(queryset, export_format, compress=False):
+    """Return an iterator over the encoded export of ``queryset``"""
+    rows = iter_lead_rows(queryset)
+    lines = stream_csv(rows) if export_format == 'csv' else stream_ndjson(rows)
+    return stream_gzip(lines) if compress else lines
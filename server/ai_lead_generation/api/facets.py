@@ -0,0 +1,89 @@
+"""Aggregate facet counts over a lead queryset, computed in the database."""
+import numpy as np
+from django.db.models import Case, CharField, Count, Value, When
+from django.db.models.functions import TruncMonth
+
+# Lower bound (inclusive) of each score band, highest first; matches the admin colours
+SCORE_BANDS = (
+    ('high', 70),
+    ('medium', 40),
+    ('low', 0),
+)
+UNSCORED_BAND = 'unscored'
+FACETS = ('status', 'industry', 'score_band', 'created_month')
+
+
+def score_band(score):
+    """Return the band name for a single score"""
+    if score is None:
+        return UNSCORED_BAND
+    for band, lower in SCORE_BANDS:
+        if score >= lower:
+            return band
+    return SCORE_BANDS[-1][0]
+
+
+def score_band_expression(field='lead_score'):
+    """SQL expression that buckets ``field`` into the score bands"""
+    return Case(
+        *[When(**{f'{field}__gte': lower}, then=Value(band)) for band, lower in SCORE_BANDS],
+        default=Value(UNSCORED_BAND),
+        output_field=CharField(),
+    )
+
+
+def _grouped_counts(queryset, key, expression=None):
+    queryset = queryset.order_by()
+    if expression is not None:
+        queryset = queryset.annotate(**{key: expression})
+    return queryset.values(key).annotate(count=Count('id')).order_by('-count', key)
+
+
+def lead_facets(queryset, facets=FACETS):
+    """Return ``{facet: [{'value': ..., 'count': ...}, ...]}`` using one grouped query per facet"""
+    result = {}
+    if 'status' in facets:
+        result['status'] = [
+            {'value': row['status'], 'count': row['count']}
+            for row in _grouped_counts(queryset, 'status')
+        ]
+    if 'industry' in facets:
+        result['industry'] = [
+            {'value': row['industry'], 'count': row['count']}
+            for row in _grouped_counts(queryset, 'industry')
+        ]
+    if 'score_band' in facets:
+        result['score_band'] = [
+            {'value': row['score_band'], 'count': row['count']}
+            for row in _grouped_counts(queryset, 'score_band', score_band_expression())
+        ]
+    if 'created_month' in facets:
+        result['created_month'] = [
+            {'value': row['created_month'].strftime('%Y-%m'), 'count': row['count']}
+            for row in _grouped_counts(queryset, 'created_month', TruncMonth('created_at'))
+        ]
+    return result
+
+
+def frame_facets(frame, facets=('status', 'industry', 'score_band')):
+    """Facet counts from a ``LeadFrame`` in memory, in the same shape as ``lead_facets``"""
+    result = {}
+    for facet in facets:
+        if facet == 'score_band':
+            scores = frame['lead_score']
+            # Band per row: SCORE_BANDS are highest first, so search the reversed bounds
+            bounds = [lower for _, lower in reversed(SCORE_BANDS)]
+            names = [band for band, _ in reversed(SCORE_BANDS)]
+            positions = np.searchsorted(bounds, np.nan_to_num(scores, nan=-np.inf), side='right') - 1
+            counts = {}
+            unscored = int(np.isnan(scores).sum())
+            if unscored:
+                counts[UNSCORED_BAND] = unscored
+            for position, count in zip(*np.unique(positions[~np.isnan(scores)], return_counts=True)):
+                band = names[max(position, 0)]
+                counts[band] = counts.get(band, 0) + int(count)
+            pairs = sorted(counts.items(), key=lambda pair: (-pair[1], pair[0]))
+        else:
+            pairs = frame[facet].value_counts()
+        result[facet] = [{'value': value, 'count': count} for value, count in pairs]
+    return result
@@ -0,0 +1,34 @@
+"""Query-string filters shared by the lead list and the endpoints built on it."""
+from django.core.exceptions import ValidationError
+
+# Query parameters accepted by the lead list and mapped to ORM lookups
+LEAD_FILTERS = {
+    'status': 'status',
+    'industry': 'industry__iexact',
+    'company': 'company__icontains',
+    'source': 'source',
+    'domain': 'domain',
+    'min_score': 'lead_score__gte',
+    'max_score': 'lead_score__lte',
+    'created_after': 'created_at__gte',
+    'created_before': 'created_at__lte',
+    'enrichment_source': 'enrichment__source',
+    'enrichment_industry': 'enrichment__industry__iexact',
+    'min_enriched_funding': 'enrichment__funding_amount__gte',
+    'enriched_after': 'enrichment__fetched_at__gte',
+}
+# Filters on columns stored lowercased, so they can use a plain index
+LOWERCASE_FILTERS = ('domain',)
+
+
+def filter_leads(queryset, query_params):
+    """Apply the lead list filters found in ``query_params`` to ``queryset``"""
+    lookups = {}
+    for param, lookup in LEAD_FILTERS.items():
+        value = query_params.get(param)
+        if value not in (None, ''):
+            lookups[lookup] = value.lower() if param in LOWERCASE_FILTERS else value
+    try:
+        return queryset.filter(**lookups)
+    except (ValueError, TypeError, ValidationError) as e:
+        raise ValueError(f"Invalid filter value: {str(e)}")
@@ -0,0 +1,177 @@
+"""Columnar lead snapshots for in-memory analytics.
+
+``LeadFrame.load`` reads only the requested columns with ``values_list`` in
+id-ordered chunks and stores each one as a typed NumPy array: numbers as
+``float64`` (``NaN`` for NULL), timestamps as UTC ``datetime64[us]`` and
+low-cardinality text such as status and industry dictionary-encoded as
+``Categorical`` (integer codes plus the distinct values). A million leads
+then take tens of megabytes instead of a million model instances.
+"""
+from datetime import timezone as dt_timezone
+import numpy as np
+from django.db import models
+
+FRAME_CHUNK_SIZE = 5000
+# Text columns with few distinct values, stored as codes into a value table
+CATEGORICAL_COLUMNS = frozenset({'status', 'industry', 'company_size', 'source', 'domain'})
+
+
+class Categorical:
+    """A dictionary-encoded column: ``categories[codes[i]]`` is row ``i``'s value"""
+    __slots__ = ('codes', 'categories')
+
+    def __init__(self, codes, categories):
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return self.categories[self.codes[index]]
+        return Categorical(self.codes[index], self.categories)
+
+    def code(self, value):
+        """Code of ``value``, or -1 if it does not occur"""
+        try:
+            return self.categories.index(value)
+        except ValueError:
+            return -1
+
+    def decode(self):
+        """Return the values as an object array"""
+        table = np.empty(len(self.categories), dtype=object)
+        table[:] = self.categories
+        return table[self.codes]
+
+    def value_counts(self):
+        """Return ``[(value, count), ...]``, most frequent first"""
+        counts = np.bincount(self.codes, minlength=len(self.categories))
+        pairs = [(value, int(count)) for value, count in zip(self.categories, counts) if count]
+        return sorted(pairs, key=lambda pair: (-pair[1], str(pair[0])))
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes
+
+
+def _column_kind(field):
+    if field.name in CATEGORICAL_COLUMNS:
+        return 'category'
+    if isinstance(field, (models.IntegerField, models.ForeignKey)):
+        # NULL needs NaN, so nullable integers are stored as floats
+        return 'float' if field.null else 'int'
+    if isinstance(field, (models.DecimalField, models.FloatField)):
+        return 'float'
+    if isinstance(field, models.DateTimeField):
+        return 'datetime'
+    if isinstance(field, models.BooleanField):
+        return 'bool'
+    return 'object'
+
+
+def _to_datetime64(value):
+    if value is None:
+        return np.datetime64('NaT')
+    if value.tzinfo is not None:
+        value = value.astimezone(dt_timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, 'us')
+
+
+class _ColumnBuilder:
+    """Accumulates one column chunk by chunk"""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.chunks = []
+        self.index = {}
+
+    def add(self, values):
+        if self.kind == 'category':
+            index = self.index
+            codes = [index.setdefault(value, len(index)) for value in values]
+            self.chunks.append(np.array(codes, dtype=np.int32))
+        elif self.kind == 'int':
+            self.chunks.append(np.array(values, dtype=np.int64))
+        elif self.kind == 'float':
+            self.chunks.append(np.array(
+                [np.nan if value is None else float(value) for value in values], dtype=np.float64
+            ))
+        elif self.kind == 'datetime':
+            self.chunks.append(np.array([_to_datetime64(value) for value in values], dtype='datetime64[us]'))
+        elif self.kind == 'bool':
+            self.chunks.append(np.array(values, dtype=bool))
+        else:
+            chunk = np.empty(len(values), dtype=object)
+            chunk[:] = values
+            self.chunks.append(chunk)
+
+    def build(self):
+        dtype = {'category': np.int32, 'int': np.int64, 'float': np.float64,
+                 'datetime': 'datetime64[us]', 'bool': bool}.get(self.kind, object)
+        data = np.concatenate(self.chunks) if self.chunks else np.empty(0, dtype=dtype)
+        if self.kind == 'category':
+            return Categorical(data, list(self.index))
+        return data
+
+
+class LeadFrame:
+    """Column arrays for a set of leads, aligned by row; ``ids`` holds the lead ids"""
+
+    def __init__(self, columns):
+        self.columns = columns
+
+    @classmethod
+    def load(cls, queryset=None, columns=('status', 'industry', 'company_size', 'funding_amount', 'lead_score'),
+             chunk_size=FRAME_CHUNK_SIZE):
+        """Load ``columns`` of the leads in ``queryset`` (all leads by default)"""
+        from .models import Lead
+
+        if queryset is None:
+            queryset = Lead.objects.all()
+        names = ['id'] + [column for column in columns if column != 'id']
+        fields = [queryset.model._meta.get_field(name) for name in names]
+        attnames = [field.attname for field in fields]
+        builders = [_ColumnBuilder(_column_kind(field)) for field in fields]
+
+        queryset = queryset.order_by('id').values_list(*attnames)
+        last_id = None
+        while True:
+            # Keyset pagination keeps every chunk query cheap
+            page = queryset if last_id is None else queryset.filter(id__gt=last_id)
+            rows = list(page[:chunk_size])
+            if not rows:
+                break
+            for position, values in enumerate(zip(*rows)):
+                builders[position].add(values)
+            last_id = rows[-1][0]
+            if len(rows) < chunk_size:
+                break
+        return cls({name: builder.build() for name, builder in zip(names, builders)})
+
+    def __len__(self):
+        return len(self.columns['id'])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    @property
+    def ids(self):
+        return self.columns['id']
+
+    def values(self, name):
+        """Decoded values of a column (categoricals become object arrays)"""
+        column = self.columns[name]
+        return column.decode() if isinstance(column, Categorical) else column
+
+    def filter(self, mask):
+        """Return a frame holding the rows selected by a boolean mask or index array"""
+        return LeadFrame({name: column[mask] for name, column in self.columns.items()})
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self.columns.values())
@@ -0,0 +1,228 @@
+"""Background jobs for bulk admin actions.
+
+Admin actions create a ``LeadJob`` and hand it to ``start_job``, which runs
+it on a small thread pool once the creating transaction commits, so the
+changelist request returns immediately. Jobs work through their leads in
+chunks with bulk queries and record progress on the job row in the same
+transaction as each chunk's writes; the admin links to the job's page to
+follow it. Slow per-lead work such as LLM calls runs before that
+transaction opens. A running job heartbeats after every chunk, and
+``requeue_stale_jobs`` resumes jobs whose process died. Each claim of a job
+gets a run token; a run whose job was requeued under it stops at its next
+chunk and rolls that chunk back instead of repeating another run's work.
+"""
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .events import publish_event
+from .message_generator import generate_llm_messages
+from .services import bulk_update_leads
+
+logger = logging.getLogger(__name__)
+
+JOB_CHUNK_SIZE = 500
+# Actions that call the LLM per lead report progress in smaller steps
+JOB_CHUNK_SIZES = {'generate_outreach': 20}
+DEFAULT_JOB_WORKERS = 2
+DEFAULT_JOB_STALE_SECONDS = 600
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'LEAD_JOB_WORKERS', DEFAULT_JOB_WORKERS),
+            thread_name_prefix='lead-job',
+        )
+    return _executor
+
+
+def rescore_leads(leads, context):
+    from .models import SCORE_FIELDS
+
+    for lead in leads:
+        lead.refresh_score(force=True)
+    bulk_update_leads(leads, SCORE_FIELDS)
+    return 0
+
+
+def mark_contacted(leads, context):
+    now = timezone.now()
+    for lead in leads:
+        lead.status = 'contacted'
+        lead.last_contacted = now
+    bulk_update_leads(leads, ['status', 'last_contacted'])
+    return 0
+
+
+def draft_outreach(leads, context):
+    """Generate messages for ``leads`` with the LLM into ``context['drafts']``.
+
+    This makes no database writes, so callers run it outside a transaction.
+    """
+    if 'client' not in context:
+        import groq
+        context['client'] = groq.Groq(api_key=os.getenv('GROQ_API_KEY'))
+
+    drafts = {}
+    for lead in leads:
+        try:
+            drafts[lead.id] = generate_llm_messages(lead, client=context['client'])
+        except Exception as e:
+            logger.error(f"Error generating outreach for lead {lead.id}: {str(e)}")
+    context['drafts'] = drafts
+
+
+def generate_outreach(leads, context):
+    from .models import Outreach
+
+    if 'drafts' not in context:
+        draft_outreach(leads, context)
+    drafts = context.pop('drafts')
+    outreach = [
+        Outreach(lead=lead, email_content=drafts[lead.id][0], linkedin_content=drafts[lead.id][1])
+        for lead in leads if lead.id in drafts
+    ]
+    failed = len(leads) - len(outreach)
+
+    # bulk_create bypasses Outreach.save(), so publish the events here
+    for item in Outreach.objects.bulk_create(outreach, batch_size=500):
+        publish_event(item.lead.created_by_id, 'outreach.created', {'id': item.pk, 'lead_id': item.lead_id})
+    return failed
+
+
+def generate_outreach_chunk(start, end, status='new'):
+    """Generate outreach for leads in ``[start, end)`` that have none yet (work queue handler)"""
+    from .models import Lead
+
+    leads = list(Lead.objects.filter(id__gte=start, id__lt=end, outreach_emails__isnull=True,
+                                     status=status))
+    step = JOB_CHUNK_SIZES['generate_outreach']
+    context = {}
+    failed = 0
+    for offset in range(0, len(leads), step):
+        batch = leads[offset:offset + step]
+        # LLM calls first, so the transaction only covers the insert
+        draft_outreach(batch, context)
+        with transaction.atomic():
+            failed += generate_outreach(batch, context)
+    return [len(leads), failed]
+
+
+# action -> handler(leads, context) returning the number of leads that failed
+JOB_HANDLERS = {
+    'rescore': rescore_leads,
+    'generate_outreach': generate_outreach,
+    'mark_contacted': mark_contacted,
+}
+
+# action -> preparer(leads, context) run for each chunk before its transaction opens
+JOB_PREPARERS = {
+    'generate_outreach': draft_outreach,
+}
+
+
+class _LostClaim(Exception):
+    """The job was requeued and claimed by another run"""
+
+
+def run_job(job_id, chunk_size=None):
+    """Run a pending job to completion in the current thread.
+
+    A job requeued after its process died resumes after the last chunk it
+    recorded.
+    """
+    from .models import Lead, LeadJob
+
+    now = timezone.now()
+    run_token = uuid.uuid4().hex
+    claimed = LeadJob.objects.filter(pk=job_id, status='pending').update(
+        status='running', started_at=now, heartbeat_at=now, run_token=run_token
+    )
+    if not claimed:
+        return
+    # Updates that only apply while this run still owns the job
+    owned = LeadJob.objects.filter(pk=job_id, status='running', run_token=run_token)
+    job = LeadJob.objects.get(pk=job_id)
+    handler = JOB_HANDLERS[job.action]
+    prepare = JOB_PREPARERS.get(job.action)
+    chunk_size = chunk_size or JOB_CHUNK_SIZES.get(job.action, JOB_CHUNK_SIZE)
+    # Per-run state shared between chunks, e.g. the LLM client
+    context = {}
+    try:
+        for start in range(job.processed + job.failed, len(job.lead_ids), chunk_size):
+            chunk = job.lead_ids[start:start + chunk_size]
+            leads = list(Lead.objects.filter(id__in=chunk))
+            if prepare is not None:
+                prepare(leads, context)
+            with transaction.atomic():
+                failed = handler(leads, context)
+                # Leads deleted since the job was queued count as processed
+                if not owned.update(
+                    processed=F('processed') + len(chunk) - failed,
+                    failed=F('failed') + failed,
+                    heartbeat_at=timezone.now(),
+                ):
+                    raise _LostClaim()
+        owned.update(status='done', finished_at=timezone.now())
+    except _LostClaim:
+        logger.warning(f"Lead job {job_id} was requeued elsewhere; stopping this run")
+    except Exception as e:
+        logger.error(f"Lead job {job_id} failed: {str(e)}")
+        owned.update(status='failed', error=str(e), finished_at=timezone.now())
+
+
+def _run_in_background(job_id):
+    try:
+        run_job(job_id)
+    finally:
+        close_old_connections()
+
+
+def _submit(job_id):
+    transaction.on_commit(lambda: _get_executor().submit(_run_in_background, job_id))
+
+
+def start_job(action, lead_ids, user=None):
+    """Create a job and run it in the background after the current transaction commits"""
+    from .models import LeadJob
+
+    lead_ids = sorted(lead_ids)
+    job = LeadJob.objects.create(action=action, lead_ids=lead_ids, total=len(lead_ids), created_by=user)
+    _submit(job.pk)
+    requeue_stale_jobs()
+    return job
+
+
+def requeue_stale_jobs(stale_after=None):
+    """Resubmit jobs whose process died; returns their ids.
+
+    The executor lives in the web process, so a restart drops its jobs: a
+    running job stops heartbeating and a pending one is never picked up.
+    Either kind is considered lost once it has been quiet for
+    ``LEAD_JOB_STALE_SECONDS``. Running jobs are put back to pending and
+    resume after their last recorded chunk; if the old run was only slow, it
+    finds its run token replaced and stops.
+    """
+    from .models import LeadJob
+
+    if stale_after is None:
+        stale_after = timedelta(seconds=getattr(settings, 'LEAD_JOB_STALE_SECONDS', DEFAULT_JOB_STALE_SECONDS))
+    cutoff = timezone.now() - stale_after
+    stale = list(LeadJob.objects.filter(
+        Q(status='running', heartbeat_at__lt=cutoff) | Q(status='pending', created_at__lt=cutoff)
+    ).values_list('id', flat=True))
+    for job_id in stale:
+        # Only one caller moves a running job back to pending
+        LeadJob.objects.filter(pk=job_id, status='running', heartbeat_at__lt=cutoff).update(status='pending')
+        logger.warning(f"Requeueing stale lead job {job_id}")
+        _submit(job_id)
+    return stale
@@ -0,0 +1,246 @@
+"""Lookalike search: find unworked leads that resemble converted ones.
+
+Each lead is encoded as a fixed-width, unit-length ``float32`` vector: log
+company size, log funding and a hashed one-hot of its industry. The
+process-wide ``LeadVectorIndex`` keeps every vector in one NumPy matrix and
+answers queries by brute force inside a block, the rows owned by the
+asking user, with ``argpartition`` picking the top K. One matrix-vector
+product over a million rows takes milliseconds.
+
+The index is built once from a ``LeadFrame`` snapshot and then refreshed
+incrementally: each refresh (at most every ``LOOKALIKE_REFRESH_SECONDS``)
+upserts leads updated since the last watermark and drops leads with a
+deletion tombstone, so it never rebuilds from scratch.
+"""
+import hashlib
+import math
+import threading
+import time
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+from .conversion_model import frame_inputs
+from .sync import SYNC_SAFETY_WINDOW
+
+INDUSTRY_BUCKETS = 30
+VECTOR_DIM = 2 + INDUSTRY_BUCKETS
+SIZE_SCALE = math.log1p(100000)
+FUNDING_SCALE = math.log1p(10 ** 10)
+DEFAULT_REFRESH_SECONDS = 5
+INDEX_COLUMNS = ('created_by', 'status', 'company_size', 'funding_amount', 'industry')
+# Leads nobody has worked yet; the default lookalike candidates
+UNWORKED_STATUSES = ('new',)
+SEED_STATUSES = ('converted',)
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def _industry_bucket(industry):
+    if not industry:
+        return -1
+    digest = hashlib.md5(industry.encode('utf-8')).digest()
+    return int.from_bytes(digest[:4], 'little') % INDUSTRY_BUCKETS
+
+
+def encode_frame(frame):
+    """Return the ``(rows, VECTOR_DIM)`` unit vectors for a ``LeadFrame``"""
+    sizes, fundings, industries = frame_inputs(frame)
+    vectors = np.zeros((len(frame), VECTOR_DIM), dtype=np.float32)
+    vectors[:, 0] = np.minimum(np.log1p(sizes) / SIZE_SCALE, 1.0)
+    fundings = np.maximum(np.nan_to_num(np.asarray(fundings, dtype=np.float64), nan=0.0), 0.0)
+    vectors[:, 1] = np.minimum(np.log1p(fundings) / FUNDING_SCALE, 1.0)
+    buckets = {}
+    columns = np.fromiter(
+        (buckets[industry] if industry in buckets else buckets.setdefault(industry, _industry_bucket(industry))
+         for industry in industries),
+        dtype=np.intp, count=len(frame),
+    )
+    known = columns >= 0
+    vectors[np.nonzero(known)[0], 2 + columns[known]] = 1.0
+    norms = np.linalg.norm(vectors, axis=1)
+    norms[norms == 0] = 1.0
+    return vectors / norms[:, None]
+
+
+class LeadVectorIndex:
+    """Lead vectors in a growable matrix, queried in per-owner blocks"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._size = 0
+        self.ids = np.empty(0, dtype=np.int64)
+        self.owners = np.empty(0, dtype=np.int64)
+        self.statuses = np.empty(0, dtype=np.int16)
+        self._status_codes = {}
+        self.vectors = np.empty((0, VECTOR_DIM), dtype=np.float32)
+        self.alive = np.empty(0, dtype=bool)
+        self.rows = {}
+        self._blocks = {}
+        self.watermark = None
+        self.refreshed_at = 0.0
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _grow(self, needed):
+        capacity = len(self.ids)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 1024)
+        extra = capacity - len(self.ids)
+        self.ids = np.concatenate([self.ids, np.zeros(extra, dtype=np.int64)])
+        self.owners = np.concatenate([self.owners, np.full(extra, -1, dtype=np.int64)])
+        self.statuses = np.concatenate([self.statuses, np.full(extra, -1, dtype=np.int16)])
+        self.vectors = np.concatenate([self.vectors, np.zeros((extra, VECTOR_DIM), dtype=np.float32)])
+        self.alive = np.concatenate([self.alive, np.zeros(extra, dtype=bool)])
+
+    def upsert(self, frame):
+        """Insert or replace the leads of a ``LeadFrame`` loaded with ``INDEX_COLUMNS``"""
+        if not len(frame):
+            return
+        vectors = encode_frame(frame)
+        owners = np.nan_to_num(frame['created_by'], nan=-1).astype(np.int64)
+        statuses = frame.values('status')
+        with self._lock:
+            self._grow(self._size + len(frame))
+            for position, lead_id in enumerate(frame.ids.tolist()):
+                row = self.rows.get(lead_id)
+                if row is None:
+                    row = self.rows[lead_id] = self._size
+                    self._size += 1
+                else:
+                    self._blocks.pop(int(self.owners[row]), None)
+                self.ids[row] = lead_id
+                self.owners[row] = owners[position]
+                self.statuses[row] = self._status_code(statuses[position])
+                self.vectors[row] = vectors[position]
+                self.alive[row] = True
+                self._blocks.pop(int(owners[position]), None)
+
+    def _status_code(self, value):
+        return self._status_codes.setdefault(value, len(self._status_codes))
+
+    def remove(self, lead_ids):
+        with self._lock:
+            for lead_id in lead_ids:
+                row = self.rows.pop(lead_id, None)
+                if row is not None:
+                    self.alive[row] = False
+                    self._blocks.pop(int(self.owners[row]), None)
+            if self._size > 1024 and len(self.rows) < self._size * 0.75:
+                self._compact()
+
+    def _compact(self):
+        keep = np.nonzero(self.alive[:self._size])[0]
+        self.ids = self.ids[keep]
+        self.owners = self.owners[keep]
+        self.statuses = self.statuses[keep]
+        self.vectors = self.vectors[keep]
+        self.alive = self.alive[keep]
+        self._size = len(keep)
+        self.rows = {lead_id: row for row, lead_id in enumerate(self.ids.tolist())}
+        self._blocks.clear()
+
+    def block(self, owner_id):
+        """Rows of the index owned by ``owner_id``"""
+        with self._lock:
+            rows = self._blocks.get(owner_id)
+            if rows is None:
+                size = self._size
+                rows = np.nonzero((self.owners[:size] == owner_id) & self.alive[:size])[0]
+                self._blocks[owner_id] = rows
+            return rows
+
+    def vectors_for(self, lead_ids):
+        with self._lock:
+            rows = [self.rows[lead_id] for lead_id in lead_ids if lead_id in self.rows]
+            return self.vectors[rows]
+
+    def search(self, owner_id, query, k=20, statuses=UNWORKED_STATUSES, exclude=()):
+        """Return ``[(lead_id, similarity), ...]`` for the ``k`` rows of ``owner_id`` closest to ``query``"""
+        with self._lock:
+            rows = self.block(owner_id)
+            if statuses:
+                codes = [self._status_codes[value] for value in statuses if value in self._status_codes]
+                rows = rows[np.isin(self.statuses[rows], codes)]
+            if exclude:
+                rows = rows[~np.isin(self.ids[rows], list(exclude))]
+            if not len(rows) or k <= 0:
+                return []
+            if len(rows) * 4 > self._size:
+                # A large block: one pass over the whole matrix beats gathering its rows
+                similarities = (self.vectors[:self._size] @ query)[rows]
+            else:
+                similarities = self.vectors[rows] @ query
+            ids = self.ids[rows]
+        if len(rows) > k:
+            top = np.argpartition(-similarities, k - 1)[:k]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.lexsort((ids[top], -similarities[top]))]
+        return [(int(ids[i]), round(float(similarities[i]), 4)) for i in top]
+
+    def refresh(self, force=False):
+        """Bring the index up to date with leads changed since the last refresh"""
+        from .frames import LeadFrame
+        from .models import Lead, LeadDeletion
+
+        interval = getattr(settings, 'LOOKALIKE_REFRESH_SECONDS', DEFAULT_REFRESH_SECONDS)
+        with self._lock:
+            if not force and self.watermark is not None and time.monotonic() - self.refreshed_at < interval:
+                return
+            # Rows committed late can carry an earlier updated_at, so overlap the window
+            started = timezone.now() - SYNC_SAFETY_WINDOW
+            leads = Lead.objects.all()
+            if self.watermark is not None:
+                leads = leads.filter(updated_at__gte=self.watermark)
+                self.remove(
+                    LeadDeletion.objects.filter(deleted_at__gte=self.watermark).values_list('lead_id', flat=True)
+                )
+            self.upsert(LeadFrame.load(leads, columns=INDEX_COLUMNS))
+            self.watermark = started
+            self.refreshed_at = time.monotonic()
+
+
+def get_index():
+    """Return the process-wide index, refreshed if it is due"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = LeadVectorIndex()
+    _index.refresh()
+    return _index
+
+
+def reset_index():
+    """Drop the process-wide index; the next ``get_index`` rebuilds it"""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def find_lookalikes(user, seed_ids=None, k=20, statuses=UNWORKED_STATUSES):
+    """Return ``(seed_ids, [(lead_id, similarity), ...])`` for ``user``'s leads.
+
+    Without ``seed_ids`` the user's converted leads are the seeds. The query
+    is the normalized mean of the seed vectors.
+    """
+    from .models import Lead
+
+    seeds = Lead.objects.filter(created_by=user)
+    if seed_ids:
+        seeds = seeds.filter(id__in=seed_ids)
+    else:
+        seeds = seeds.filter(status__in=SEED_STATUSES)
+    seed_ids = list(seeds.values_list('id', flat=True))
+    index = get_index()
+    seed_vectors = index.vectors_for(seed_ids)
+    if not len(seed_vectors):
+        return seed_ids, []
+    query = seed_vectors.mean(axis=0)
+    norm = np.linalg.norm(query)
+    if norm:
+        query = query / norm
+    return seed_ids, index.search(user.pk, query, k=k, statuses=statuses, exclude=seed_ids)
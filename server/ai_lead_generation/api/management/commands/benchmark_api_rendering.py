@@ -0,0 +1,63 @@
+import gzip
+import time
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from ...middleware import brotli
+from ...models import Lead
+from ...renderers import FastJSONRenderer, orjson
+from ...serializers import LeadSerializer
+
+class Command(BaseCommand):
+    help = 'Compare JSON rendering speed and compressed payload sizes for lead lists'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--leads', type=int, default=1000,
+                            help='Number of synthetic leads in the payload')
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Number of times each renderer is timed')
+
+    def _leads(self, count):
+        now = timezone.now()
+        industries = ['Technology', 'Healthcare', 'Finance', 'Retail', 'Manufacturing']
+        return [
+            Lead(
+                id=i + 1,
+                name=f'Lead {i}',
+                email=f'lead{i}@example.com',
+                company=f'Company {i % 97}',
+                industry=industries[i % len(industries)],
+                company_size=(i * 37) % 5000 + 1,
+                funding_amount=Decimal(i * 12345) / 100,
+                lead_score=i % 100,
+                metadata={'linkedin_url': f'https://linkedin.com/company/company-{i}', 'source': 'csv'},
+                created_at=now - timedelta(minutes=i),
+                updated_at=now,
+            )
+            for i in range(count)
+        ]
+
+    def _time(self, renderer, data, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            body = renderer.render(data)
+        return (time.perf_counter() - start) / repeat, body
+
+    def handle(self, *args, **options):
+        data = LeadSerializer(self._leads(options['leads']), many=True).data
+        repeat = options['repeat']
+
+        baseline, body = self._time(JSONRenderer(), data, repeat)
+        fast, fast_body = self._time(FastJSONRenderer(), data, repeat)
+        if body != fast_body:
+            self.stdout.write(self.style.WARNING('Renderer outputs differ'))
+
+        self.stdout.write(f"Payload: {options['leads']} leads, {len(body)} bytes")
+        self.stdout.write(f"JSONRenderer:     {baseline * 1000:.2f} ms")
+        label = 'FastJSONRenderer:' if orjson is not None else 'FastJSONRenderer (orjson missing):'
+        self.stdout.write(f"{label} {fast * 1000:.2f} ms ({baseline / fast:.1f}x)")
+        self.stdout.write(f"gzip:             {len(gzip.compress(body, compresslevel=6))} bytes")
+        if brotli is not None:
+            self.stdout.write(f"br:               {len(brotli.compress(body, quality=4))} bytes")
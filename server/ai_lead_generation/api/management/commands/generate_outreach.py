@@ -0,0 +1,34 @@
+import time
+from functools import partial
+from django.core.management.base import BaseCommand
+from ...jobs import generate_outreach_chunk
+from ...models import Lead
+from ...rescoring import DEFAULT_CHUNK_SIZE, id_chunks
+from ...workqueue import enqueue_chunks, queue_status, run_workers
+
+class Command(BaseCommand):
+    help = 'Generate outreach for leads without any, claiming chunks from a work queue shared by several hosts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('run', help='Run label; start the same run on every host')
+        parser.add_argument('--workers', type=int, default=1, help='Worker processes on this host')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Lead ids per chunk')
+        parser.add_argument('--status', default='new', help='Only leads with this status')
+
+    def handle(self, *args, **options):
+        run = options['run']
+        enqueue_chunks('outreach', run, id_chunks(Lead.objects.all(), options['chunk_size']))
+        started = time.monotonic()
+        results = run_workers('outreach', run, partial(generate_outreach_chunk, status=options['status']),
+                              max(1, options['workers']))
+        elapsed = time.monotonic() - started
+
+        scanned = sum(result[0] for result in results)
+        failed = sum(result[1] for result in results)
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated outreach for {scanned - failed} of {scanned} leads from {len(results)} chunks "
+            f"of run {run} in {elapsed:.1f}s"
+        ))
+        status = queue_status('outreach', run)
+        if status.get('failed'):
+            self.stdout.write(self.style.WARNING(f"{status['failed']} chunks failed; see WorkChunk.error"))
@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from ...sync import prune_deletions
+
+class Command(BaseCommand):
+    help = 'Delete lead tombstones older than the delta-sync retention window'
+
+    def handle(self, *args, **options):
+        deleted = prune_deletions()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} lead tombstones"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from ...rollups import rebuild_rollups
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-user daily lead rollups used by the dashboard summary'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids',
+                            help='Only rebuild rollups for this user id (repeatable)')
+
+    def handle(self, *args, **options):
+        rows = rebuild_rollups(user_ids=options['user_ids'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} rollup rows"))
@@ -0,0 +1,9 @@
+from django.core.management.base import BaseCommand
+from ...jobs import requeue_stale_jobs
+
+class Command(BaseCommand):
+    help = 'Resume background lead jobs left running or pending by a process that died (run at startup)'
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale_jobs()
+        self.stdout.write(self.style.SUCCESS(f"Requeued {len(requeued)} lead jobs"))
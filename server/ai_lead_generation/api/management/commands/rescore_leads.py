@@ -0,0 +1,124 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from ...models import Lead
+from ...rescoring import DEFAULT_CHUNK_SIZE, id_chunks, rescore_chunk
+from ...scoring import SCORE_VERSION
+from ...workqueue import enqueue_chunks, init_worker_process, queue_status, run_workers
+
+def _run_chunk(chunk, stale_only):
+    start, end = chunk
+    try:
+        return chunk, rescore_chunk(start, end, stale_only=stale_only)
+    finally:
+        connections.close_all()
+
+class Command(BaseCommand):
+    help = ('Rescore leads in parallel id-range chunks, resuming from a checkpoint file, '
+            'or from a work queue shared by several hosts (--queue)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Worker processes (1 runs in this process)')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help='Lead ids per chunk')
+        parser.add_argument('--stale-only', action='store_true',
+                            help='Only rescore leads whose score predates the current rules')
+        parser.add_argument('--checkpoint', default='rescore_leads.checkpoint.json',
+                            help='File recording finished chunks')
+        parser.add_argument('--restart', action='store_true',
+                            help='Ignore an existing checkpoint and start over')
+        parser.add_argument('--queue', metavar='RUN',
+                            help='Claim chunks of the named run from the shared work queue instead '
+                                 'of using a checkpoint; start the same run on every host')
+
+    def _load_checkpoint(self, path, params):
+        if not os.path.exists(path):
+            return set()
+        with open(path) as f:
+            state = json.load(f)
+        if state.get('params') != params:
+            raise CommandError(
+                f"Checkpoint {path} was written with different options; use --restart to start over"
+            )
+        return {tuple(chunk) for chunk in state['done']}
+
+    def _save_checkpoint(self, path, params, done):
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'params': params, 'done': sorted(done)}, f)
+        os.replace(tmp_path, path)
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        chunk_size = options['chunk_size']
+        stale_only = options['stale_only']
+        checkpoint = options['checkpoint']
+        if chunk_size < 1:
+            raise CommandError('--chunk-size must be positive')
+
+        if options['queue']:
+            return self._handle_queue(options['queue'], workers, chunk_size, stale_only)
+
+        params = {'chunk_size': chunk_size, 'stale_only': stale_only, 'score_version': SCORE_VERSION}
+        if options['restart'] and os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        done = self._load_checkpoint(checkpoint, params)
+        chunks = [chunk for chunk in id_chunks(Lead.objects.all(), chunk_size) if chunk not in done]
+        if done:
+            self.stdout.write(f"Resuming: {len(done)} chunks already done, {len(chunks)} to go")
+
+        scanned = updated = 0
+        started = time.monotonic()
+
+        def finished(chunk, result):
+            nonlocal scanned, updated
+            scanned += result[0]
+            updated += result[1]
+            done.add(chunk)
+            self._save_checkpoint(checkpoint, params, done)
+            if options['verbosity'] > 1:
+                rate = scanned / max(time.monotonic() - started, 1e-9)
+                self.stdout.write(f"Chunk {chunk[0]}-{chunk[1] - 1}: {result[1]}/{result[0]} updated "
+                                  f"({rate:.0f} leads/sec)")
+
+        if workers == 1:
+            for chunk in chunks:
+                finished(chunk, rescore_chunk(*chunk, stale_only=stale_only))
+        else:
+            # Children must not share the parent's database connections
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker_process) as pool:
+                futures = [pool.submit(_run_chunk, chunk, stale_only) for chunk in chunks]
+                for future in as_completed(futures):
+                    finished(*future.result())
+
+        elapsed = time.monotonic() - started
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        rate = scanned / elapsed if elapsed > 0 else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Rescored {scanned} leads ({updated} changed) in {elapsed:.1f}s "
+            f"with {workers} worker(s): {rate:.0f} leads/sec"
+        ))
+
+    def _handle_queue(self, run, workers, chunk_size, stale_only):
+        enqueue_chunks('rescore', run, id_chunks(Lead.objects.all(), chunk_size))
+        started = time.monotonic()
+        results = run_workers('rescore', run, partial(rescore_chunk, stale_only=stale_only), workers)
+        elapsed = time.monotonic() - started
+
+        scanned = sum(result[0] for result in results)
+        updated = sum(result[1] for result in results)
+        rate = scanned / elapsed if elapsed > 0 else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Rescored {scanned} leads ({updated} changed) from {len(results)} chunks of run {run} "
+            f"in {elapsed:.1f}s with {workers} worker(s): {rate:.0f} leads/sec"
+        ))
+        status = queue_status('rescore', run)
+        if status.get('failed'):
+            self.stdout.write(self.style.WARNING(f"{status['failed']} chunks failed; see WorkChunk.error"))
@@ -0,0 +1,37 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from ...conversion_model import ModelError, model_path, predict_conversion, train_from_database
+
+class Command(BaseCommand):
+    help = 'Train the conversion-probability model on converted and unqualified leads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Artifact path (defaults to CONVERSION_MODEL_PATH)')
+        parser.add_argument('--iterations', type=int, default=500, help='Gradient descent iterations')
+        parser.add_argument('--min-samples', type=int, default=20,
+                            help='Minimum number of labelled leads required to train')
+        parser.add_argument('--score-all', action='store_true',
+                            help='Afterwards, score every lead with the new model and report throughput')
+
+    def handle(self, *args, **options):
+        path = options['output'] or model_path()
+        try:
+            model = train_from_database(path=path, iterations=options['iterations'],
+                                        min_samples=options['min_samples'])
+        except ModelError as e:
+            raise CommandError(str(e))
+        metrics = model.metrics
+        self.stdout.write(self.style.SUCCESS(
+            f"Trained conversion model v{model.version} on {metrics['samples']} leads "
+            f"({metrics['positives']} converted): log loss {metrics['log_loss']}, "
+            f"accuracy {metrics['accuracy']:.1%}. Saved to {path}"
+        ))
+
+        if options['score_all']:
+            started = time.monotonic()
+            ids, probabilities = predict_conversion(path=path)
+            elapsed = max(time.monotonic() - started, 1e-6)
+            self.stdout.write(
+                f"Scored {len(ids)} leads in {elapsed:.2f}s ({len(ids) / elapsed:.0f} leads/sec), "
+                f"mean probability {float(probabilities.mean()) if len(ids) else 0.0:.3f}"
+            )
@@ -1,20 +1,21 @@
+from decimal import Decimal
 from django.core.management.base import BaseCommand
-from api.models import Lead
-from api.scoring import LeadScorer
+from django.utils import timezone
+from ...models import Lead, LeadEnrichment
 import pandas as pd
-import json
 
 class Command(BaseCommand):
     help = 'Update lead scores based on company data from CSV'
 
     def add_arguments(self, parser):
         parser.add_argument('csv_file', type=str, help='Path to the CSV file with company data')
+        parser.add_argument('--apply-to-lead', action='store_true',
+                            help="Overwrite the lead's funding and industry with the CSV values "
+                                 "(by default only blank fields are filled)")
 
     def handle(self, *args, **options):
         csv_file = options['csv_file']
-        
-        # Initialize scorer
-        scorer = LeadScorer(target_industry="SaaS")
+        overwrite = options['apply_to_lead']
         
         try:
             # Read CSV file
@@ -22,38 +23,41 @@ class Command(BaseCommand):
             
             # Process each row
             for index, row in df.iterrows():
-                company_data = {
-                    'company_name': row.get('company_name'),
-                    'funding_amount': row.get('funding_amount'),
-                    'industry': row.get('industry'),
-                    'hiring_data': {
-                        'open_positions': row.get('open_positions', 0)
-                    }
+                company_name = row.get('company_name')
+                funding = row.get('funding_amount')
+                industry = row.get('industry')
+                open_positions = row.get('open_positions', 0)
+                enrichment = {
+                    'funding_amount': Decimal(str(funding)) if pd.notna(funding) else None,
+                    'industry': industry if pd.notna(industry) else '',
+                    'open_positions': int(open_positions) if pd.notna(open_positions) else None,
                 }
                 
-                # Calculate score
-                score = scorer.calculate_total_score(company_data)
-                
                 # Update lead in database
-                leads = Lead.objects.filter(company__iexact=company_data['company_name'])
-                if leads.exists():
-                    lead = leads.first()
-                    lead.lead_score = score
-                    lead.metadata = json.dumps({
-                        'funding_amount': float(company_data['funding_amount']) if pd.notna(company_data['funding_amount']) else None,
-                        'industry': company_data['industry'] if pd.notna(company_data['industry']) else None,
-                        'open_positions': company_data['hiring_data']['open_positions']
-                    })
+                lead = Lead.objects.filter(company__iexact=company_name).first()
+                if lead is not None:
+                    # Fill in company data the lead lacks without replacing what
+                    # users entered; save() rescores it with the standard rules
+                    if enrichment['funding_amount'] is not None and (overwrite or lead.funding_amount is None):
+                        lead.funding_amount = enrichment['funding_amount']
+                    if enrichment['industry'] and (overwrite or not lead.industry):
+                        lead.industry = enrichment['industry']
                     lead.save()
+                    score = lead.lead_score
+                    LeadEnrichment.objects.update_or_create(lead=lead, defaults={
+                        **enrichment,
+                        'source': 'csv',
+                        'fetched_at': timezone.now(),
+                    })
                     self.stdout.write(
                         self.style.SUCCESS(
-                            f"Updated score for {company_data['company_name']}: {score}"
+                            f"Updated score for {company_name}: {score}"
                         )
                     )
                 else:
                     self.stdout.write(
                         self.style.WARNING(
-                            f"No lead found for company: {company_data['company_name']}"
+                            f"No lead found for company: {company_name}"
                         )
                     )
                     
@@ -1,7 +1,14 @@
+import asyncio
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+LLM_MODEL = "mixtral-8x7b-32768"
+LLM_TEMPERATURE = 0.7
+EMAIL_MAX_TOKENS = 1000
+LINKEDIN_MAX_TOKENS = 300
+
 class MessageGenerator:
     def generate_email_content(self, lead):
         """Generate personalized email content for a lead"""
@@ -60,3 +67,133 @@ def generate_messages(lead):
         'linkedin_message': linkedin_template,
         'email': email_template
     }
+
+
+def build_outreach_prompts(lead):
+    """Build the LLM prompts for a lead's outreach email and LinkedIn message"""
+    # Build detailed company profile
+    company_profile = {
+        'name': lead.company,
+        'industry': lead.industry,
+        'contact_name': lead.name,
+        'position': lead.position,
+        'achievements': []
+    }
+    
+    # Add funding details if available
+    if lead.funding_amount:
+        amount = float(lead.funding_amount)
+        if amount >= 1_000_000_000:
+            company_profile['achievements'].append(
+                f"secured ${amount/1_000_000_000:.1f}B in funding"
+            )
+        elif amount >= 1_000_000:
+            company_profile['achievements'].append(
+                f"raised ${amount/1_000_000:.1f}M"
+            )
+    
+    # Add growth indicators
+    if lead.open_positions:
+        company_profile['achievements'].append(
+            f"actively expanding with {lead.open_positions} open positions"
+        )
+    
+    # Add company size context
+    if lead.company_size:
+        company_profile['size_context'] = f"a {lead.company_size} company in the {lead.industry} space"
+    else:
+        company_profile['size_context'] = f"a company making waves in the {lead.industry} space"
+    
+    # Format achievements for email
+    achievements_text = ""
+    if company_profile['achievements']:
+        achievements_text = " and " + ", ".join(company_profile['achievements'])
+    
+    # Generate email content
+    email_prompt = f"""Generate a personalized email following this exact structure but with natural language:
+
+Hi {{name}},
+
+I came across {company_profile['name']}'s work in the {company_profile['industry']} sector. As {company_profile['size_context']}{achievements_text}, your innovations caught my attention.
+
+Your role as {company_profile['position']} particularly interests me, and I'd love to schedule a quick call to learn more about your work and discuss potential synergies.
+
+Would you have 15 minutes this week for a brief chat?
+
+Best regards,
+[Your name]
+
+REQUIREMENTS:
+1. Use the company details provided but make it sound natural and conversational
+2. Keep the same brief, friendly tone as the template
+3. Maintain the 4-part structure: opening, observation, interest, call to action
+4. Reference their specific achievements naturally in the conversation
+5. Keep it concise and focused on learning about their company
+"""
+    
+    # Generate LinkedIn message
+    linkedin_prompt = f"""Generate a personalized LinkedIn connection message following this exact structure:
+
+Hi {company_profile['contact_name']},
+
+I came across {company_profile['name']}'s innovative work in {company_profile['industry']}. {company_profile['size_context']}{achievements_text}. Would love to connect and learn more about your work as {company_profile['position']}.
+
+REQUIREMENTS:
+1. Use this exact information but make it sound natural:
+   - Company: {company_profile['name']}
+   - Industry: {company_profile['industry']}
+   - Role: {company_profile['position']}
+   - Size: {company_profile['size_context']}
+   - Achievement: {company_profile['achievements'][0] if company_profile['achievements'] else 'growth in the industry'}
+2. Must be under 300 characters
+3. Keep the same friendly, professional tone
+4. Show specific knowledge of their company
+5. Focus on genuine interest in their work
+6. End with connecting to learn more
+7. Do not mention selling or services
+"""
+
+    return email_prompt, linkedin_prompt
+
+def _completion_kwargs(prompt, max_tokens):
+    return {
+        'messages': [{"role": "user", "content": prompt}],
+        'model': LLM_MODEL,
+        'temperature': LLM_TEMPERATURE,
+        'max_tokens': max_tokens,
+    }
+
+def generate_llm_messages(lead, client=None):
+    """Generate email and LinkedIn content with the Groq API.
+
+    Returns ``(email_content, linkedin_content)``.
+    """
+    if client is None:
+        import groq
+        client = groq.Groq(api_key=os.getenv('GROQ_API_KEY'))
+    email_prompt, linkedin_prompt = build_outreach_prompts(lead)
+
+    email_completion = client.chat.completions.create(**_completion_kwargs(email_prompt, EMAIL_MAX_TOKENS))
+    linkedin_completion = client.chat.completions.create(**_completion_kwargs(linkedin_prompt, LINKEDIN_MAX_TOKENS))
+
+    return (
+        email_completion.choices[0].message.content.strip(),
+        linkedin_completion.choices[0].message.content.strip(),
+    )
+
+async def agenerate_llm_messages(lead, client=None):
+    """Async variant of ``generate_llm_messages``; both completions run concurrently"""
+    if client is None:
+        import groq
+        client = groq.AsyncGroq(api_key=os.getenv('GROQ_API_KEY'))
+    email_prompt, linkedin_prompt = build_outreach_prompts(lead)
+
+    email_completion, linkedin_completion = await asyncio.gather(
+        client.chat.completions.create(**_completion_kwargs(email_prompt, EMAIL_MAX_TOKENS)),
+        client.chat.completions.create(**_completion_kwargs(linkedin_prompt, LINKEDIN_MAX_TOKENS)),
+    )
+
+    return (
+        email_completion.choices[0].message.content.strip(),
+        linkedin_completion.choices[0].message.content.strip(),
+    )
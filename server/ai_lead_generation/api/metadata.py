@@ -0,0 +1,42 @@
+"""Lead metadata keys that are promoted to real, indexed columns.
+
+``Lead.metadata`` stays the place clients write these values; every write
+path copies them into ``Lead.linkedin_url``, ``Lead.source`` and
+``Lead.domain`` so filters and searches hit plain indexes instead of JSON
+key lookups. Company enrichment data lives in ``LeadEnrichment`` instead.
+"""
+import json
+
+# Metadata key -> column max_length
+PROMOTED_METADATA_KEYS = {
+    'linkedin_url': 500,
+    'source': 100,
+    'domain': 255,
+}
+
+
+# Keys older enrichment runs stored in metadata; they belong in LeadEnrichment
+ENRICHMENT_METADATA_KEYS = ('funding_amount', 'industry', 'open_positions')
+
+
+def decode_metadata(metadata):
+    """Return ``metadata`` as a dict, unwrapping objects stored as JSON strings"""
+    while isinstance(metadata, str):
+        try:
+            metadata = json.loads(metadata)
+        except ValueError:
+            return {}
+    return metadata if isinstance(metadata, dict) else {}
+
+
+def promoted_metadata_values(metadata):
+    """Return the column values for the promoted keys found in ``metadata``"""
+    metadata = decode_metadata(metadata)
+    values = {}
+    for key, max_length in PROMOTED_METADATA_KEYS.items():
+        value = metadata.get(key)
+        value = str(value).strip()[:max_length] if value else ''
+        if key == 'domain':
+            value = value.lower()
+        values[key] = value
+    return values
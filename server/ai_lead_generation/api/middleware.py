@@ -0,0 +1,94 @@
+"""Negotiated response compression for API responses."""
+import gzip
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+DEFAULT_MIN_SIZE = 1024
+# API payloads only. HTML pages (admin, DRF's browsable API) carry CSRF
+# tokens, and compressing them next to reflected input exposes them to BREACH.
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/csv')
+
+
+def parse_accept_encoding(header):
+    """Return ``{coding: q}`` for an Accept-Encoding header"""
+    codings = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding] = q
+    return codings
+
+
+def choose_encoding(header):
+    """Pick the best supported coding the client accepts, or None"""
+    codings = parse_accept_encoding(header or '')
+    wildcard = codings.get('*', 0.0)
+    candidates = (['br'] if brotli is not None else []) + ['gzip']
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = codings.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Compress large responses with Brotli or gzip, whichever the client prefers.
+
+    Only ``COMPRESSIBLE_TYPES`` are compressed, so HTML is never touched.
+    Brotli is used when the ``brotli`` package is installed. Responses smaller
+    than ``API_COMPRESSION_MIN_SIZE`` bytes, streaming responses (including
+    the event stream) and responses that already carry a Content-Encoding are
+    passed through untouched. ``MiddlewareMixin`` makes it both sync and async
+    capable, so under ASGI async views are not pushed onto a thread.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, 'API_COMPRESSION_MIN_SIZE', DEFAULT_MIN_SIZE)
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '')
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < self.min_size:
+            return response
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING'))
+        if encoding is None:
+            return response
+
+        if encoding == 'br':
+            compressed = brotli.compress(response.content, quality=4)
+        else:
+            compressed = gzip.compress(response.content, compresslevel=6)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            # The representation changed, so a strong ETag no longer applies
+            response['ETag'] = 'W/' + etag
+        return response
@@ -0,0 +1,68 @@
+# Generated by Django 5.0.2 on 2026-10-19 09:12
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# The index as of this migration; 0017 rebuilds it once the promoted columns exist.
+# Kept inline so later changes to api.search cannot change this migration.
+FTS_TABLE = 'api_lead_fts'
+SEARCH_COLUMNS = (
+    ('name', 'A'),
+    ('company', 'A'),
+    ('email', 'B'),
+    ('industry', 'B'),
+)
+SEARCH_METADATA_KEYS = (
+    ('linkedin_url', 'C'),
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchVector
+        from django.db.models import TextField, Value
+        from django.db.models.fields.json import KeyTextTransform
+        from django.db.models.functions import Coalesce
+
+        vector = None
+        for column, weight in SEARCH_COLUMNS:
+            part = SearchVector(column, weight=weight, config='english')
+            vector = part if vector is None else vector + part
+        for key, weight in SEARCH_METADATA_KEYS:
+            value = Coalesce(KeyTextTransform(key, 'metadata'), Value(''), output_field=TextField())
+            vector = vector + SearchVector(value, weight=weight, config='english')
+        Lead = apps.get_model('api', 'Lead')
+        Lead.objects.using(schema_editor.connection.alias).update(search_vector=vector)
+    elif vendor == 'sqlite':
+        names = [column for column, _ in SEARCH_COLUMNS] + [key for key, _ in SEARCH_METADATA_KEYS]
+        columns = [column for column, _ in SEARCH_COLUMNS]
+        columns += [f"json_extract(metadata, '$.{key}')" for key, _ in SEARCH_METADATA_KEYS]
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5({', '.join(names)}, tokenize='unicode61')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(names)}) SELECT id, {', '.join(columns)} FROM api_lead"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_alter_customuser_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lead',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
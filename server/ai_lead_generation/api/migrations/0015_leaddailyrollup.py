@@ -0,0 +1,70 @@
+# Generated by Django 5.0.2 on 2026-10-19 11:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Score bands as of this migration (api.facets.SCORE_BANDS)
+SCORE_BANDS = (
+    ('high', 70),
+    ('medium', 40),
+    ('low', 0),
+)
+
+
+def build_rollups(apps, schema_editor):
+    from django.db.models import Case, CharField, Count, Sum, Value, When
+    from django.db.models.functions import Coalesce, TruncDate
+
+    Lead = apps.get_model('api', 'Lead')
+    LeadDailyRollup = apps.get_model('api', 'LeadDailyRollup')
+    db = schema_editor.connection.alias
+    rows = Lead.objects.using(db).filter(created_by__isnull=False).order_by().annotate(
+        day=TruncDate('created_at'),
+        score_band=Case(
+            *[When(lead_score__gte=lower, then=Value(band)) for band, lower in SCORE_BANDS],
+            default=Value('unscored'),
+            output_field=CharField(),
+        ),
+    ).values('created_by_id', 'day', 'status', 'score_band').annotate(
+        lead_count=Count('id'),
+        scored_count=Count('lead_score'),
+        score_sum=Coalesce(Sum('lead_score'), 0),
+    )
+    LeadDailyRollup.objects.using(db).bulk_create([
+        LeadDailyRollup(
+            user_id=row['created_by_id'], day=row['day'], status=row['status'],
+            score_band=row['score_band'], lead_count=row['lead_count'],
+            scored_count=row['scored_count'], score_sum=row['score_sum']
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_lead_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeadDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(help_text='Day the leads were created')),
+                ('status', models.CharField(max_length=20)),
+                ('score_band', models.CharField(max_length=10)),
+                ('lead_count', models.IntegerField(default=0)),
+                ('scored_count', models.IntegerField(default=0, help_text='Leads in this bucket with a score')),
+                ('score_sum', models.BigIntegerField(default=0, help_text='Sum of lead scores in this bucket')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lead_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'day', 'status', 'score_band'), name='unique_lead_daily_rollup')],
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
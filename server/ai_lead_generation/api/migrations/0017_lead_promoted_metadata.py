@@ -0,0 +1,99 @@
+# Generated by Django 5.0.2 on 2026-10-19 16:20
+
+from django.db import migrations, models
+
+
+# Copies of api.metadata and api.search as of this migration, so later
+# changes to those modules cannot change it
+PROMOTED_METADATA_KEYS = {
+    'linkedin_url': 500,
+    'source': 100,
+    'domain': 255,
+}
+FTS_TABLE = 'api_lead_fts'
+SEARCH_COLUMNS = (
+    ('name', 'A'),
+    ('company', 'A'),
+    ('email', 'B'),
+    ('industry', 'B'),
+    ('linkedin_url', 'C'),
+    ('domain', 'C'),
+)
+
+
+def promoted_metadata_values(metadata):
+    metadata = metadata if isinstance(metadata, dict) else {}
+    values = {}
+    for key, max_length in PROMOTED_METADATA_KEYS.items():
+        value = metadata.get(key)
+        value = str(value).strip()[:max_length] if value else ''
+        if key == 'domain':
+            value = value.lower()
+        values[key] = value
+    return values
+
+
+def backfill_promoted_metadata(apps, schema_editor):
+    Lead = apps.get_model('api', 'Lead')
+    leads = Lead.objects.using(schema_editor.connection.alias)
+    batch = []
+    for lead in leads.exclude(metadata=None).only('id', 'metadata').iterator(chunk_size=2000):
+        values = promoted_metadata_values(lead.metadata)
+        if not any(values.values()):
+            continue
+        for field, value in values.items():
+            setattr(lead, field, value)
+        batch.append(lead)
+        if len(batch) >= 2000:
+            leads.bulk_update(batch, list(PROMOTED_METADATA_KEYS))
+            batch = []
+    if batch:
+        leads.bulk_update(batch, list(PROMOTED_METADATA_KEYS))
+
+
+def rebuild_search_index(apps, schema_editor):
+    # The index now reads the promoted columns instead of the metadata blob
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchVector
+
+        vector = None
+        for column, weight in SEARCH_COLUMNS:
+            part = SearchVector(column, weight=weight, config='english')
+            vector = part if vector is None else vector + part
+        Lead = apps.get_model('api', 'Lead')
+        Lead.objects.using(schema_editor.connection.alias).update(search_vector=vector)
+    elif vendor == 'sqlite':
+        columns = ', '.join(column for column, _ in SEARCH_COLUMNS)
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({columns}, tokenize='unicode61')"
+        )
+        schema_editor.execute(f'INSERT INTO {FTS_TABLE} (rowid, {columns}) SELECT id, {columns} FROM api_lead')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_lead_sync'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lead',
+            name='domain',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='lead',
+            name='linkedin_url',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=500),
+        ),
+        migrations.AddField(
+            model_name='lead',
+            name='source',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=100),
+        ),
+        migrations.RunPython(backfill_promoted_metadata, migrations.RunPython.noop),
+        migrations.RunPython(rebuild_search_index, migrations.RunPython.noop),
+    ]
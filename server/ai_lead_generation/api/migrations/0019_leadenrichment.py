@@ -0,0 +1,108 @@
+# Generated by Django 5.0.2 on 2026-10-19 18:30
+
+import json
+import django.db.models.deletion
+import django.utils.timezone
+from decimal import Decimal, InvalidOperation
+from django.db import migrations, models
+
+
+# Copies of api.metadata as of this migration, so later changes to that
+# module cannot change it
+PROMOTED_METADATA_KEYS = {
+    'linkedin_url': 500,
+    'source': 100,
+    'domain': 255,
+}
+ENRICHMENT_METADATA_KEYS = ('funding_amount', 'industry', 'open_positions')
+
+
+def decode_metadata(metadata):
+    while isinstance(metadata, str):
+        try:
+            metadata = json.loads(metadata)
+        except ValueError:
+            return {}
+    return metadata if isinstance(metadata, dict) else {}
+
+
+def promoted_metadata_values(metadata):
+    values = {}
+    for key, max_length in PROMOTED_METADATA_KEYS.items():
+        value = metadata.get(key)
+        value = str(value).strip()[:max_length] if value else ''
+        if key == 'domain':
+            value = value.lower()
+        values[key] = value
+    return values
+
+
+def _decimal(value):
+    try:
+        return Decimal(str(value)) if value is not None else None
+    except InvalidOperation:
+        return None
+
+
+def _int(value):
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def convert_encoded_metadata(apps, schema_editor):
+    """Unwrap metadata stored as a JSON string and move enrichment keys out of it"""
+    Lead = apps.get_model('api', 'Lead')
+    LeadEnrichment = apps.get_model('api', 'LeadEnrichment')
+    db = schema_editor.connection.alias
+    fields = ['metadata'] + list(PROMOTED_METADATA_KEYS)
+    leads = []
+    enrichments = []
+    for lead in Lead.objects.using(db).exclude(metadata=None).only('id', 'metadata', 'updated_at').iterator(chunk_size=2000):
+        if not isinstance(lead.metadata, str):
+            continue
+        metadata = decode_metadata(lead.metadata)
+        enrichment = {key: metadata.pop(key) for key in ENRICHMENT_METADATA_KEYS if key in metadata}
+        if enrichment:
+            enrichments.append(LeadEnrichment(
+                lead_id=lead.id,
+                funding_amount=_decimal(enrichment.get('funding_amount')),
+                industry=enrichment.get('industry') or '',
+                open_positions=_int(enrichment.get('open_positions')),
+                source='csv',
+                fetched_at=lead.updated_at,
+            ))
+        lead.metadata = metadata or None
+        for field, value in promoted_metadata_values(metadata).items():
+            setattr(lead, field, value)
+        leads.append(lead)
+        if len(leads) >= 2000:
+            Lead.objects.using(db).bulk_update(leads, fields)
+            LeadEnrichment.objects.using(db).bulk_create(enrichments, ignore_conflicts=True)
+            leads, enrichments = [], []
+    Lead.objects.using(db).bulk_update(leads, fields)
+    LeadEnrichment.objects.using(db).bulk_create(enrichments, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_leadjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeadEnrichment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('funding_amount', models.DecimalField(blank=True, db_index=True, decimal_places=2, help_text='Funding amount in USD reported by the source', max_digits=15, null=True)),
+                ('industry', models.CharField(blank=True, db_index=True, max_length=255)),
+                ('open_positions', models.IntegerField(blank=True, null=True)),
+                ('source', models.CharField(blank=True, db_index=True, help_text='Where the data came from', max_length=100)),
+                ('fetched_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('lead', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='enrichment', to='api.lead')),
+            ],
+        ),
+        migrations.RunPython(convert_encoded_metadata, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.2 on 2026-10-19 19:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_leadenrichment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lead',
+            name='score_inputs_hash',
+            field=models.CharField(blank=True, editable=False, help_text='Fingerprint of the fields the current score was computed from', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='lead',
+            name='score_version',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Scoring rules version the current score was computed with'),
+        ),
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(fields=['score_version'], name='lead_score_version_idx'),
+        ),
+    ]
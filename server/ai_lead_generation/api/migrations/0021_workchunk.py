@@ -0,0 +1,35 @@
+# Generated by Django 5.0.2 on 2026-10-19 21:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0020_lead_score_tracking'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('queue', models.CharField(help_text='Kind of work, e.g. rescore or outreach', max_length=50)),
+                ('run', models.CharField(help_text='Label shared by all chunks of one run', max_length=100)),
+                ('start_id', models.BigIntegerField()),
+                ('end_id', models.BigIntegerField(help_text='Exclusive upper bound')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('claimed', 'Claimed'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('worker', models.CharField(blank=True, max_length=255)),
+                ('attempts', models.IntegerField(default=0)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['queue', 'run', 'status'], name='work_chunk_claim_idx')],
+                'constraints': [models.UniqueConstraint(fields=('queue', 'run', 'start_id'), name='unique_work_chunk')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.0.2 on 2026-10-19 22:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0021_workchunk'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoringProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=100)),
+                ('weights', models.JSONField(blank=True, default=dict, help_text='Factor weights, e.g. {"industry": 2}; missing factors keep weight 1')),
+                ('company_size_tiers', models.JSONField(blank=True, default=list, help_text='[[employees, points], ...] scored when the size is above the threshold; empty keeps the defaults')),
+                ('funding_tiers', models.JSONField(blank=True, default=list, help_text='[[amount, points], ...] scored when funding is above the threshold; empty keeps the defaults')),
+                ('target_industries', models.JSONField(blank=True, default=list, help_text='Industries that earn the industry points; empty keeps the defaults')),
+                ('version', models.PositiveIntegerField(default=1, editable=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='scoring_profile', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.2 on 2026-10-19 21:10
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0022_scoringprofile'),
+    ]
+
+    operations = [
+        # Earlier deployments created this index with raw SQL; it is now declared on the model
+        migrations.RunSQL('DROP INDEX IF EXISTS api_lead_search_vector_gin', migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='lead',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='api_lead_search_vector_gin'),
+        ),
+    ]
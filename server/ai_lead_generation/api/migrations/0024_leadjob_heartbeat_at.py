@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-19 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0023_lead_search_vector_gin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='leadjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, help_text='Last progress from the running process', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-19 22:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0024_leadjob_heartbeat_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lead',
+            name='score_profile',
+            field=models.CharField(blank=True, editable=False, help_text='Scoring profile (id:version) the current score was computed with; empty for the default rules', max_length=40),
+        ),
+    ]
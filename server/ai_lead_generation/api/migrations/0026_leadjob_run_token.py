@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-19 23:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0025_lead_score_profile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='leadjob',
+            name='run_token',
+            field=models.CharField(blank=True, editable=False, help_text='Identifies the run that currently owns the job', max_length=32),
+        ),
+    ]
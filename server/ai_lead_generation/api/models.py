@@ -3,6 +3,17 @@ from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.contrib.auth.models import AbstractUser, Group, Permission, User
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.conf import settings
+from .search import SEARCH_FIELDS, index_leads, unindex_leads
+from .rollups import ROLLUP_FIELDS, lead_rollup_values, record_lead_change
+from .sync import record_deletions
+from .events import publish_event, publish_lead_change
+from .metadata import PROMOTED_METADATA_KEYS, promoted_metadata_values
+from .scoring import SCORE_VERSION, score_inputs_hash
+from .score_cache import get_score_cache
+from .scoring_profiles import invalidate_profile, profile_key, rescore_user_leads, rules_for_user, validate_profile
 import json
 
 # Create your models here.
@@ -55,6 +66,9 @@ class Company(models.Model):
         if not self.location:
             raise ValidationError('Location cannot be empty.')
 
+# Fields written whenever a lead is (re)scored
+SCORE_FIELDS = ('lead_score', 'score_inputs_hash', 'score_version', 'score_profile')
+
 class Lead(models.Model):
     # Basic Information
     name = models.CharField(max_length=255, default='Unknown')
@@ -80,6 +94,23 @@ class Lead(models.Model):
         blank=True,
         help_text="Lead score from 0-100"
     )
+    score_inputs_hash = models.CharField(
+        max_length=32,
+        blank=True,
+        editable=False,
+        help_text="Fingerprint of the fields the current score was computed from"
+    )
+    score_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Scoring rules version the current score was computed with"
+    )
+    score_profile = models.CharField(
+        max_length=40,
+        blank=True,
+        editable=False,
+        help_text="Scoring profile (id:version) the current score was computed with; empty for the default rules"
+    )
     
     # Hiring Information
     open_positions = models.IntegerField(
@@ -122,12 +153,82 @@ class Lead(models.Model):
         help_text="Additional metadata about the lead"
     )
 
+    # Frequently queried metadata keys, copied from ``metadata`` on save
+    linkedin_url = models.CharField(max_length=500, blank=True, db_index=True, editable=False)
+    source = models.CharField(max_length=100, blank=True, db_index=True, editable=False)
+    domain = models.CharField(max_length=255, blank=True, db_index=True, editable=False)
+
+    # Full-text search (populated on PostgreSQL; SQLite uses an FTS5 table)
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+
     def __str__(self):
         return f"{self.name} - {self.company}"
 
     class Meta:
         ordering = ['-lead_score', '-created_at']
-        
+        indexes = [
+            # Delta sync walks a user's leads in (updated_at, id) order
+            models.Index(fields=['created_by', 'updated_at', 'id'], name='lead_sync_idx'),
+            # Finds leads scored under older rules
+            models.Index(fields=['score_version'], name='lead_score_version_idx'),
+            # Full-text search on PostgreSQL (a plain index elsewhere)
+            GinIndex(fields=['search_vector'], name='api_lead_search_vector_gin'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot()
+        return instance
+
+    def _snapshot(self):
+        """Remember the stored values of the fields that feed derived tables"""
+        deferred = self.get_deferred_fields()
+        self._loaded_values = {
+            field: getattr(self, field) for field in ROLLUP_FIELDS if field not in deferred
+        }
+
+    def refresh_score(self, force=False):
+        """Recompute ``lead_score`` if its inputs, the scoring rules or the owner's profile changed.
+
+        A score assigned by the caller since the lead was loaded (or given
+        when creating it) is kept and recorded as current unless ``force``
+        is set. Returns True if the score fields need writing.
+        """
+        inputs_hash = score_inputs_hash(self)
+        current_profile = profile_key(self.created_by_id)
+        if self._state.adding:
+            assigned = self.lead_score is not None
+        else:
+            loaded = getattr(self, '_loaded_values', {})
+            assigned = 'lead_score' in loaded and loaded['lead_score'] != self.lead_score
+        stale = (inputs_hash != self.score_inputs_hash or self.score_version != SCORE_VERSION
+                 or self.score_profile != current_profile)
+        if force:
+            stale, assigned = True, False
+        if not (assigned or stale or self.lead_score is None):
+            return False
+        if self.lead_score is None or (stale and not assigned):
+            self.lead_score = self.calculate_lead_score()
+        self.score_inputs_hash = inputs_hash
+        self.score_version = SCORE_VERSION
+        self.score_profile = current_profile
+        return True
+
+    def _stored_values(self):
+        """Return the values last written to the database, or None for a new lead"""
+        if self._state.adding or self.pk is None:
+            return None
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None or len(loaded) < len(ROLLUP_FIELDS):
+            loaded = Lead.objects.filter(pk=self.pk).values(*ROLLUP_FIELDS).first()
+        return loaded
+
+    def promote_metadata(self):
+        """Copy the promoted metadata keys into their columns"""
+        for field, value in promoted_metadata_values(self.metadata).items():
+            setattr(self, field, value)
+
     def get_metadata_display(self):
         """Returns formatted metadata for admin display"""
         if not self.metadata:
@@ -139,44 +240,237 @@ class Lead(models.Model):
 
     def calculate_lead_score(self):
         """Calculate lead score based on various factors"""
-        score = 0
-        
-        # Company size score (max 30 points)
+        return get_score_cache().score(rules_for_user(self.created_by_id), self)
+
+    def save(self, *args, **kwargs):
+        rescored = self.refresh_score()
+        self.promote_metadata()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if 'metadata' in update_fields:
+                update_fields |= set(PROMOTED_METADATA_KEYS)
+            if rescored:
+                update_fields |= set(SCORE_FIELDS)
+            kwargs['update_fields'] = update_fields
+        before = self._stored_values()
+        super().save(*args, **kwargs)
+
+        if update_fields is None or update_fields & SEARCH_FIELDS:
+            index_leads([self.pk])
+        after = lead_rollup_values(self)
+        if before != after:
+            record_lead_change(before, after)
+            publish_lead_change(before, self)
+        self._snapshot()
+
+    def delete(self, *args, **kwargs):
+        lead_id = self.pk
+        before = self._stored_values()
+        result = super().delete(*args, **kwargs)
+        unindex_leads([lead_id])
+        record_lead_change(before, None)
+        if before:
+            record_deletions([(lead_id, before['created_by_id'])])
+        return result
+
+class WorkChunk(models.Model):
+    """An id range of leads queued for a batch worker on any host"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('claimed', 'Claimed'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    queue = models.CharField(max_length=50, help_text="Kind of work, e.g. rescore or outreach")
+    run = models.CharField(max_length=100, help_text="Label shared by all chunks of one run")
+    start_id = models.BigIntegerField()
+    end_id = models.BigIntegerField(help_text="Exclusive upper bound")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    worker = models.CharField(max_length=255, blank=True)
+    attempts = models.IntegerField(default=0)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"{self.queue}/{self.run} [{self.start_id}, {self.end_id}) {self.status}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['queue', 'run', 'start_id'], name='unique_work_chunk'),
+        ]
+        indexes = [
+            models.Index(fields=['queue', 'run', 'status'], name='work_chunk_claim_idx'),
+        ]
+
+class LeadEnrichment(models.Model):
+    """Company data fetched for a lead from an external source"""
+    lead = models.OneToOneField(Lead, on_delete=models.CASCADE, related_name='enrichment')
+    funding_amount = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="Funding amount in USD reported by the source"
+    )
+    industry = models.CharField(max_length=255, blank=True, db_index=True)
+    open_positions = models.IntegerField(null=True, blank=True)
+    source = models.CharField(max_length=100, blank=True, db_index=True, help_text="Where the data came from")
+    fetched_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"Enrichment for lead {self.lead_id} from {self.source or 'unknown'}"
+
+class ScoringProfile(models.Model):
+    """A user's overrides of the lead scoring rules"""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='scoring_profile'
+    )
+    name = models.CharField(max_length=100, blank=True)
+    weights = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Factor weights, e.g. {\"industry\": 2}; missing factors keep weight 1"
+    )
+    company_size_tiers = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="[[employees, points], ...] scored when the size is above the threshold; empty keeps the defaults"
+    )
+    funding_tiers = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="[[amount, points], ...] scored when funding is above the threshold; empty keeps the defaults"
+    )
+    target_industries = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Industries that earn the industry points; empty keeps the defaults"
+    )
+    version = models.PositiveIntegerField(default=1, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name or f"Scoring profile for user {self.user_id}"
+
+    def clean(self):
         try:
-            size = int(self.company_size)
-            if size > 1000:
-                score += 30
-            elif size > 500:
-                score += 20
-            elif size > 100:
-                score += 10
-        except (ValueError, TypeError):
-            pass
-        
-        # Funding amount score (max 40 points)
-        if self.funding_amount:
-            funding = float(self.funding_amount)
-            if funding > 10000000:  # > 10M
-                score += 40
-            elif funding > 5000000:  # > 5M
-                score += 30
-            elif funding > 1000000:  # > 1M
-                score += 20
-            elif funding > 500000:  # > 500K
-                score += 10
-        
-        # Industry score (max 30 points)
-        tech_industries = ['tech', 'technology', 'software', 'it', 'saas']
-        if self.industry and self.industry.lower() in tech_industries:
-            score += 30
-        
-        # Ensure score is between 0 and 100
-        return max(0, min(100, score))
+            validate_profile(self.weights, self.company_size_tiers, self.funding_tiers, self.target_industries)
+        except ValueError as e:
+            raise ValidationError(str(e))
 
     def save(self, *args, **kwargs):
-        if self.lead_score is None:
-            self.lead_score = self.calculate_lead_score()
+        if not self._state.adding:
+            # A new version makes every process compile the profile again
+            self.version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'version'}
         super().save(*args, **kwargs)
+        invalidate_profile(self.user_id)
+        rescore_user_leads(self.user)
+
+    def delete(self, *args, **kwargs):
+        user = self.user
+        result = super().delete(*args, **kwargs)
+        invalidate_profile(user.pk)
+        rescore_user_leads(user)
+        return result
+
+class LeadDailyRollup(models.Model):
+    """Per-user, per-day lead counts by status and score band"""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='lead_rollups'
+    )
+    day = models.DateField(help_text="Day the leads were created")
+    status = models.CharField(max_length=20)
+    score_band = models.CharField(max_length=10)
+    lead_count = models.IntegerField(default=0)
+    scored_count = models.IntegerField(default=0, help_text="Leads in this bucket with a score")
+    score_sum = models.BigIntegerField(default=0, help_text="Sum of lead scores in this bucket")
+
+    def __str__(self):
+        return f"{self.user_id} {self.day} {self.status}/{self.score_band}: {self.lead_count}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'day', 'status', 'score_band'],
+                name='unique_lead_daily_rollup'
+            ),
+        ]
+
+class LeadDeletion(models.Model):
+    """Tombstone for a deleted lead, read by the delta-sync endpoint"""
+    lead_id = models.BigIntegerField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='lead_deletions'
+    )
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Lead {self.lead_id} deleted at {self.deleted_at}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'deleted_at'], name='lead_deletion_sync_idx'),
+        ]
+
+class LeadJob(models.Model):
+    """A bulk admin action running in the background"""
+    ACTION_CHOICES = [
+        ('rescore', 'Rescore'),
+        ('generate_outreach', 'Generate outreach'),
+        ('mark_contacted', 'Mark contacted'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    action = models.CharField(max_length=30, choices=ACTION_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    lead_ids = models.JSONField(default=list, help_text="Ids of the leads the action applies to")
+    total = models.IntegerField(default=0)
+    processed = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0, help_text="Leads the action could not be applied to")
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name='lead_jobs',
+        null=True,
+        blank=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True, help_text="Last progress from the running process")
+    run_token = models.CharField(max_length=32, blank=True, editable=False,
+                                 help_text="Identifies the run that currently owns the job")
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.get_action_display()} ({self.processed}/{self.total})"
+
+    @property
+    def progress(self):
+        """Percentage of leads processed"""
+        return round(100 * self.processed / self.total) if self.total else 100
+
+    class Meta:
+        ordering = ['-created_at']
 
 class LeadMessage(models.Model):
     lead = models.ForeignKey(
@@ -202,5 +496,14 @@ class Outreach(models.Model):
     def __str__(self):
         return f"Outreach for {self.lead.company if self.lead else 'Unknown'} - {self.generated_at.strftime('%Y-%m-%d %H:%M')}"
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if adding and self.lead_id:
+            publish_event(self.lead.created_by_id, 'outreach.created', {
+                'id': self.pk,
+                'lead_id': self.lead_id,
+            })
+
     class Meta:
         ordering = ['-generated_at']
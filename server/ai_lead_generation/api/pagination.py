@@ -0,0 +1,55 @@
+"""Paginators that avoid exact ``COUNT(*)`` queries on large tables."""
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+# Below this many rows an exact count is cheap enough to run
+ESTIMATE_MIN_ROWS = 10000
+DEFAULT_COUNT_CACHE_TIMEOUT = 60
+
+
+def estimated_row_count(model, using='default'):
+    """Return the planner's row estimate for ``model``'s table, or None if unavailable"""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                       [model._meta.db_table])
+        row = cursor.fetchone()
+    # reltuples is -1 for tables that have never been analyzed
+    return row[0] if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator whose count comes from planner statistics or a short-lived cache.
+
+    Unfiltered querysets on PostgreSQL use ``pg_class.reltuples`` once the
+    table is large enough for the estimate to matter. Anything else runs the
+    exact count once and caches it for ``ADMIN_COUNT_CACHE_TIMEOUT`` seconds,
+    keyed by the query, so paging through a filtered changelist counts once.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is None:
+            return super().count
+
+        if not query.where and not query.distinct:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= ESTIMATE_MIN_ROWS:
+                return estimate
+
+        sql, params = query.sql_with_params()
+        digest = hashlib.md5(f'{queryset.db}:{sql}:{params!r}'.encode('utf-8')).hexdigest()
+        key = f'paginator-count:{queryset.model._meta.label_lower}:{digest}'
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, getattr(settings, 'ADMIN_COUNT_CACHE_TIMEOUT', DEFAULT_COUNT_CACHE_TIMEOUT))
+        return count
@@ -0,0 +1,57 @@
+"""Bulk rescoring in id-range chunks.
+
+``rescore_chunk`` scores and writes one ``[start, end)`` range of lead ids
+and is safe to run in any process; ``manage.py rescore_leads`` fans the
+chunks of ``id_chunks`` out over a process pool and checkpoints finished
+chunks so an interrupted run can resume. A full rescore compares stored
+scores in SQL against the rules each lead is scored by (the default rules
+or its owner's profile), so only leads that actually change are loaded
+into Python.
+"""
+from django.db import transaction
+from django.db.models import Max, Min, Q
+from .scoring import stale_score_filter
+from .scoring_profiles import profile_key, rules_for_user
+from .scoring_rules import LEAD_SCORING
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def id_chunks(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Return ``[(start, end), ...]`` id ranges covering ``queryset``"""
+    bounds = queryset.aggregate(low=Min('id'), high=Max('id'))
+    if bounds['low'] is None:
+        return []
+    return [
+        (start, min(start + chunk_size, bounds['high'] + 1))
+        for start in range(bounds['low'], bounds['high'] + 1, chunk_size)
+    ]
+
+
+def rescore_chunk(start, end, stale_only=False):
+    """Rescore leads with ``start <= id < end``; returns ``(scanned, updated)``"""
+    from .models import SCORE_FIELDS, Lead
+    from .services import bulk_update_leads
+
+    leads = Lead.objects.filter(id__gte=start, id__lt=end)
+    if stale_only:
+        leads = leads.filter(stale_score_filter())
+    else:
+        # Only load leads whose stored score disagrees with the rules they are scored by
+        disagrees = Q(score_profile='') & ~Q(lead_score=LEAD_SCORING.expression())
+        owners = leads.exclude(score_profile='').order_by().values_list('created_by_id', flat=True).distinct()
+        for user_id in owners:
+            disagrees |= (Q(created_by_id=user_id, score_profile=profile_key(user_id))
+                          & ~Q(lead_score=rules_for_user(user_id).expression()))
+        leads = leads.filter(stale_score_filter() | disagrees)
+    leads = list(leads)
+
+    changed = []
+    for lead in leads:
+        before = tuple(getattr(lead, field) for field in SCORE_FIELDS)
+        lead.refresh_score(force=not stale_only)
+        if tuple(getattr(lead, field) for field in SCORE_FIELDS) != before:
+            changed.append(lead)
+    with transaction.atomic():
+        bulk_update_leads(changed, SCORE_FIELDS)
+    return len(leads), len(changed)
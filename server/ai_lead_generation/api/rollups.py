@@ -0,0 +1,157 @@
+"""Per-user, per-day lead rollups that back the dashboard summary.
+
+Each ``LeadDailyRollup`` row holds the number of leads a user created on a
+given day, split by status and score band, together with the running score
+sum used for averages. Rows are adjusted incrementally whenever a lead is
+written and can be rebuilt from scratch with ``manage.py rebuild_rollups``.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+from .facets import score_band, score_band_expression
+
+logger = logging.getLogger(__name__)
+
+# Lead attributes that decide which rollup bucket a lead falls into
+ROLLUP_FIELDS = ('created_by_id', 'created_at', 'status', 'lead_score')
+
+
+def lead_rollup_values(lead):
+    """Snapshot the rollup-relevant attributes of a lead instance"""
+    return {field: getattr(lead, field) for field in ROLLUP_FIELDS}
+
+
+def _bucket(values):
+    """Return ``(key, score)`` for a snapshot, or ``None`` if it is not rolled up"""
+    if not values or values.get('created_by_id') is None or values.get('created_at') is None:
+        return None
+    day = timezone.localtime(values['created_at']).date()
+    key = (values['created_by_id'], day, values['status'], score_band(values['lead_score']))
+    return key, values['lead_score']
+
+
+def add_rollup_delta(deltas, values, sign):
+    """Add (``sign=1``) or remove (``sign=-1``) one lead snapshot from ``deltas``"""
+    bucket = _bucket(values)
+    if bucket is None:
+        return
+    key, score = bucket
+    delta = deltas[key]
+    delta[0] += sign
+    if score is not None:
+        delta[1] += sign * score
+        delta[2] += sign
+
+
+def new_rollup_deltas():
+    """Return an empty delta map: key -> [lead_count, score_sum, scored_count]"""
+    return defaultdict(lambda: [0, 0, 0])
+
+
+def apply_rollup_deltas(deltas):
+    """Write accumulated deltas to the rollup table"""
+    from .models import LeadDailyRollup
+
+    for (user_id, day, status, band), (count, score_sum, scored) in deltas.items():
+        if not (count or score_sum or scored):
+            continue
+        bucket = LeadDailyRollup.objects.filter(user_id=user_id, day=day, status=status, score_band=band)
+        changes = {
+            'lead_count': F('lead_count') + count,
+            'score_sum': F('score_sum') + score_sum,
+            'scored_count': F('scored_count') + scored,
+        }
+        if bucket.update(**changes):
+            continue
+        try:
+            with transaction.atomic():
+                LeadDailyRollup.objects.create(
+                    user_id=user_id, day=day, status=status, score_band=band,
+                    lead_count=count, score_sum=score_sum, scored_count=scored
+                )
+        except IntegrityError:
+            # Another writer created the bucket first
+            bucket.update(**changes)
+
+
+def record_lead_change(before, after):
+    """Move a lead between rollup buckets given its old and new snapshots"""
+    deltas = new_rollup_deltas()
+    add_rollup_delta(deltas, before, -1)
+    add_rollup_delta(deltas, after, 1)
+    apply_rollup_deltas(deltas)
+
+
+def rebuild_rollups(user_ids=None):
+    """Recompute rollups from the lead table; returns the number of rows written"""
+    from .models import Lead, LeadDailyRollup
+
+    leads = Lead.objects.filter(created_by__isnull=False)
+    rollups = LeadDailyRollup.objects.all()
+    if user_ids is not None:
+        leads = leads.filter(created_by_id__in=user_ids)
+        rollups = rollups.filter(user_id__in=user_ids)
+
+    rows = leads.order_by().annotate(
+        day=TruncDate('created_at'),
+        score_band=score_band_expression(),
+    ).values('created_by_id', 'day', 'status', 'score_band').annotate(
+        lead_count=Count('id'),
+        scored_count=Count('lead_score'),
+        score_sum=Coalesce(Sum('lead_score'), 0),
+    )
+    with transaction.atomic():
+        rollups.delete()
+        created = LeadDailyRollup.objects.bulk_create([
+            LeadDailyRollup(
+                user_id=row['created_by_id'], day=row['day'], status=row['status'],
+                score_band=row['score_band'], lead_count=row['lead_count'],
+                scored_count=row['scored_count'], score_sum=row['score_sum']
+            )
+            for row in rows
+        ], batch_size=1000)
+    return len(created)
+
+
+def dashboard_summary(user, days=30):
+    """Summarize a user's leads from the rollup table in a constant number of queries"""
+    from .models import LeadDailyRollup
+
+    rollups = LeadDailyRollup.objects.filter(user=user).order_by()
+    totals = rollups.aggregate(
+        total=Coalesce(Sum('lead_count'), 0),
+        scored=Coalesce(Sum('scored_count'), 0),
+        score_sum=Coalesce(Sum('score_sum'), 0),
+    )
+    by_status = {
+        row['status']: row['count']
+        for row in rollups.values('status').annotate(count=Sum('lead_count')) if row['count']
+    }
+    by_score_band = {
+        row['score_band']: row['count']
+        for row in rollups.values('score_band').annotate(count=Sum('lead_count')) if row['count']
+    }
+    since = timezone.localdate() - timedelta(days=days - 1)
+    daily = [
+        {'day': row['day'].isoformat(), 'count': row['count']}
+        for row in rollups.filter(day__gte=since).values('day').annotate(
+            count=Sum('lead_count')
+        ).order_by('day') if row['count']
+    ]
+
+    total = totals['total']
+    converted = by_status.get('converted', 0)
+    return {
+        'total_leads': total,
+        'average_score': round(totals['score_sum'] / totals['scored'], 2) if totals['scored'] else None,
+        'by_status': by_status,
+        'by_score_band': by_score_band,
+        'qualified': by_status.get('qualified', 0),
+        'converted': converted,
+        'conversion_rate': round(converted / total, 4) if total else 0.0,
+        'daily': daily,
+    }
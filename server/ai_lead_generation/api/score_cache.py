@@ -0,0 +1,146 @@
+"""Memoized lead scores.
+
+Many leads share the same scoring inputs, e.g. every contact at one
+company. ``ScoreCache`` is a bounded LRU map from ``(rules key, feature
+tuple)`` to the score those rules give. The rules key changes with the rule
+version (and the scoring profile version), so a rule change never serves
+an old score. The cache is per process; its size is capped by
+``SCORE_CACHE_MAX_ENTRIES`` (0 disables it).
+"""
+import threading
+from collections import OrderedDict
+from decimal import Decimal, InvalidOperation
+from django.conf import settings
+
+DEFAULT_SCORE_CACHE_MAX_ENTRIES = 50000
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def _feature(value):
+    if isinstance(value, (Decimal, int, float)) and not isinstance(value, bool):
+        try:
+            # Equal amounts share a key: Decimal('1500000.00') == 1500000
+            return Decimal(str(value))
+        except InvalidOperation:
+            pass
+    return value
+
+
+class ScoreCache:
+    """A thread-safe LRU cache of scores with hit accounting"""
+
+    def __init__(self, max_entries=DEFAULT_SCORE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, rules, lead):
+        return (rules.key,) + tuple(
+            _feature(getattr(lead, factor.field)) for factor in rules.factors.values()
+        )
+
+    def _get(self, key):
+        # Caller holds the lock
+        try:
+            score = self._entries[key]
+        except KeyError:
+            return None
+        self._entries.move_to_end(key)
+        return score
+
+    def _put(self, key, score):
+        # Caller holds the lock
+        self._entries[key] = score
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def score(self, rules, lead):
+        """Score one lead with ``rules``, reusing a cached score if possible"""
+        if self.max_entries <= 0:
+            return rules.score(lead)
+        try:
+            key = self.key(rules, lead)
+            hash(key)
+        except TypeError:
+            return rules.score(lead)
+        with self._lock:
+            score = self._get(key)
+            if score is not None:
+                self.hits += 1
+                return score
+            self.misses += 1
+        score = rules.score(lead)
+        with self._lock:
+            self._put(key, score)
+        return score
+
+    def score_many(self, rules, leads):
+        """Score a sequence of leads, computing each distinct miss once in one vectorized pass"""
+        leads = list(leads)
+        if self.max_entries <= 0:
+            return rules.score_many(leads)
+        keys = [self.key(rules, lead) for lead in leads]
+        scores = [None] * len(leads)
+        pending = {}
+        with self._lock:
+            for index, key in enumerate(keys):
+                score = self._get(key)
+                if score is not None:
+                    self.hits += 1
+                    scores[index] = score
+                elif key in pending:
+                    # Computed once below for the first row with this key
+                    self.hits += 1
+                else:
+                    self.misses += 1
+                    pending[key] = index
+        if pending:
+            computed = rules.score_many([leads[index] for index in pending.values()])
+            computed = dict(zip(pending, computed))
+            with self._lock:
+                for key, score in computed.items():
+                    self._put(key, score)
+            for index, key in enumerate(keys):
+                if scores[index] is None:
+                    scores[index] = computed[key]
+        return scores
+
+    def stats(self):
+        """Return hit counts, the hit ratio and the current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+def get_score_cache():
+    """Return the process-wide score cache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ScoreCache(getattr(settings, 'SCORE_CACHE_MAX_ENTRIES', DEFAULT_SCORE_CACHE_MAX_ENTRIES))
+    return _cache
+
+
+def describe_stats(stats):
+    """One-line summary of ``ScoreCache.stats()`` for logs"""
+    return (
+        f"score cache: {stats['hit_ratio']:.1%} hits "
+        f"({stats['hits']} hits, {stats['misses']} misses, {stats['size']}/{stats['max_entries']} entries)"
+    )
@@ -1,86 +1,103 @@
+import copy
+import hashlib
 import logging
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 import pandas as pd
 import numpy as np
+from django.db.models import Q
+from .conversion_model import load_model
+from .score_cache import get_score_cache
+from .scoring_rules import FIT_SCORE_RULES, FIT_SCORING, LEAD_SCORE_RULES, compile_rules
 
 logger = logging.getLogger(__name__)
 
+# Bumped with LEAD_SCORE_RULES so stored scores show up as stale
+SCORE_VERSION = LEAD_SCORE_RULES['version']
+# Lead fields Lead.calculate_lead_score reads
+SCORE_INPUT_FIELDS = ('company_size', 'funding_amount', 'industry')
+
+
+def _normalize_input(value):
+    if value is None:
+        return ''
+    if isinstance(value, (Decimal, int, float)):
+        try:
+            # 1500000 and Decimal('1500000.00') are the same input
+            return f'{Decimal(str(value)):.2f}'
+        except InvalidOperation:
+            pass
+    return str(value)
+
+
+def score_inputs_hash(lead):
+    """Fingerprint of the scoring inputs of ``lead``"""
+    raw = '\x1f'.join(_normalize_input(getattr(lead, field)) for field in SCORE_INPUT_FIELDS)
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def stale_score_filter():
+    """Q matching leads whose score predates the current rules or the owner's current scoring profile"""
+    from .scoring_profiles import profile_key_expression
+
+    return (Q(lead_score__isnull=True) | ~Q(score_version=SCORE_VERSION)
+            | ~Q(score_profile=profile_key_expression()))
+
+@lru_cache(maxsize=64)
+def fit_rules(target_industries=()):
+    """Fit rules with ``target_industries`` added to the top industry group"""
+    rules = copy.deepcopy(FIT_SCORE_RULES)
+    for factor in rules['factors']:
+        if factor['name'] == 'industry':
+            (points, keywords), *rest = factor['keywords']
+            extra = tuple(industry.lower() for industry in target_industries if industry.lower() not in keywords)
+            if not extra:
+                return FIT_SCORING
+            factor['keywords'] = ((points, keywords + extra), *rest)
+    return compile_rules(rules, key=('fit', rules['version'], target_industries))
+
 class LeadScorer:
-    def __init__(self, target_industry: str = "SaaS"):
+    MODES = ('rules', 'model')
+
+    def __init__(self, target_industry="SaaS", mode='rules'):
+        # One industry name or a list of them, e.g. a scoring profile's targets
         self.target_industry = target_industry
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown scoring mode: {mode}")
+        # "model" scores with the trained conversion model, falling back to the rules without one
+        self.mode = mode
+        targets = [target_industry] if isinstance(target_industry, str) else list(target_industry or ())
+        self.rules = fit_rules(tuple(target.strip() for target in targets if target and target.strip()))
 
     def calculate_company_size_score(self, lead):
         """Calculate score based on company size"""
-        try:
-            company_size = int(lead.company_size) if lead.company_size else 0
-        except (ValueError, TypeError):
-            return 0.1
-        
-        if company_size >= 1000:
-            return 1.0
-        elif company_size >= 500:
-            return 0.8
-        elif company_size >= 100:
-            return 0.6
-        elif company_size >= 50:
-            return 0.3
-        else:
-            return 0.1
+        return self.rules.factor_score('company_size', lead.company_size)
 
     def calculate_funding_score(self, lead):
         """Calculate score based on funding amount"""
-        try:
-            funding_amount = float(lead.funding_amount) if lead.funding_amount else 0
-        except (ValueError, TypeError):
-            return 0.1
-        
-        if funding_amount >= 10000000:  # 10M+
-            return 1.0
-        elif funding_amount >= 5000000:  # 5M+
-            return 0.8
-        elif funding_amount >= 1000000:  # 1M+
-            return 0.5
-        elif funding_amount >= 100000:   # 100K+
-            return 0.2
-        else:
-            return 0.1
+        return self.rules.factor_score('funding', lead.funding_amount)
 
     def calculate_industry_score(self, lead):
         """Calculate score based on industry"""
-        industry = str(lead.industry).lower() if lead.industry else ""
-        
-        high_value_industries = ['technology', 'tech', 'saas', 'fintech', 'ai', 'machine learning']
-        medium_value_industries = ['healthcare', 'finance', 'retail', 'manufacturing']
-        
-        if any(ind in industry for ind in high_value_industries):
-            return 1.0
-        elif any(ind in industry for ind in medium_value_industries):
-            return 0.8
-        else:
-            return 0.5
+        return self.rules.factor_score('industry', lead.industry)
 
     def calculate_total_score(self, lead):
         """Calculate total lead score"""
         try:
-            # Calculate individual scores
-            company_size_score = self.calculate_company_size_score(lead)
-            funding_score = self.calculate_funding_score(lead)
-            industry_score = self.calculate_industry_score(lead)
-            
-            # Weights for each factor
-            weights = {
-                'company_size': 0.3,
-                'funding': 0.3,
-                'industry': 0.4
-            }
-            
-            # Calculate weighted average
-            total_score = (
-                company_size_score * weights['company_size'] +
-                funding_score * weights['funding'] +
-                industry_score * weights['industry']
-            )
-            
-            return round(total_score, 2)
+            if self.mode == 'model':
+                model = load_model()
+                if model is not None:
+                    return round(float(model.predict_leads([lead])[0]), 2)
+            return get_score_cache().score(self.rules, lead)
         except Exception as e:
             logger.error(f"Error calculating lead score: {str(e)}")
             return 0.0
+
+    def calculate_total_scores(self, leads):
+        """Calculate total scores for many leads in one vectorized pass"""
+        leads = list(leads)
+        if self.mode == 'model':
+            model = load_model()
+            if model is not None:
+                return [round(float(probability), 2) for probability in model.predict_leads(leads)]
+        return get_score_cache().score_many(self.rules, leads)
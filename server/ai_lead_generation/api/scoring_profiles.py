@@ -0,0 +1,154 @@
+"""Per-user scoring profiles.
+
+A ``ScoringProfile`` overrides parts of ``LEAD_SCORE_RULES`` for one user's
+leads: factor weights, the company size and funding tiers, and the
+industries that earn the industry points. ``rules_for_user`` returns the
+compiled rules to score a user's leads with. Which profile version a user
+has is cached in the Django cache, and the compiled rules are kept per
+process keyed by ``(profile id, version)``, so scoring a lead costs no
+queries and no recompilation. Saving a profile bumps its version and
+rescores only that user's leads in a background job. Each lead records the
+``profile_key`` it was scored under, so leads left behind by an edit stay
+detectable as stale (see ``scoring.stale_score_filter``).
+"""
+import copy
+import threading
+from numbers import Number
+from django.core.cache import cache
+from .scoring_rules import LEAD_SCORE_RULES, LEAD_SCORING, compile_rules
+
+PROFILE_CACHE_TIMEOUT = 300
+
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+def _cache_key(user_id):
+    return f'scoring-profile:1:{user_id}'
+
+
+def validate_profile(weights, company_size_tiers, funding_tiers, target_industries):
+    """Raise ``ValueError`` if the profile settings cannot be compiled"""
+    factors = {factor['name'] for factor in LEAD_SCORE_RULES['factors']}
+    if not isinstance(weights, dict):
+        raise ValueError("weights must be an object")
+    unknown = set(weights) - factors
+    if unknown:
+        raise ValueError(f"Unknown scoring factors: {', '.join(sorted(unknown))}")
+    for name, weight in weights.items():
+        if not isinstance(weight, Number) or isinstance(weight, bool) or weight < 0:
+            raise ValueError(f"Weight for {name} must be a non-negative number")
+    for field, tiers in (('company_size_tiers', company_size_tiers), ('funding_tiers', funding_tiers)):
+        if not isinstance(tiers, list):
+            raise ValueError(f"{field} must be a list of [threshold, points] pairs")
+        for tier in tiers:
+            if (not isinstance(tier, (list, tuple)) or len(tier) != 2
+                    or not all(isinstance(part, Number) and not isinstance(part, bool) for part in tier)):
+                raise ValueError(f"{field} must be a list of [threshold, points] pairs")
+        if len({threshold for threshold, _ in tiers}) != len(tiers):
+            raise ValueError(f"{field} has duplicate thresholds")
+    if not isinstance(target_industries, list) or not all(
+        isinstance(industry, str) and industry.strip() for industry in target_industries
+    ):
+        raise ValueError("target_industries must be a list of industry names")
+
+
+def profile_rules(weights, company_size_tiers, funding_tiers, target_industries):
+    """Build a declarative rule set from profile settings.
+
+    Empty settings keep the defaults from ``LEAD_SCORE_RULES``.
+    """
+    rules = copy.deepcopy(LEAD_SCORE_RULES)
+    rules['weights'].update(weights)
+    tiers = {'company_size': company_size_tiers, 'funding': funding_tiers}
+    for factor in rules['factors']:
+        if tiers.get(factor['name']):
+            factor['tiers'] = tuple(tuple(tier) for tier in tiers[factor['name']])
+        if factor['name'] == 'industry' and target_industries:
+            points = factor['keywords'][0][0]
+            factor['keywords'] = ((points, tuple(industry.strip() for industry in target_industries)),)
+    return rules
+
+
+def _profile_settings(profile):
+    return {
+        'id': profile.pk,
+        'version': profile.version,
+        'weights': profile.weights,
+        'company_size_tiers': profile.company_size_tiers,
+        'funding_tiers': profile.funding_tiers,
+        'target_industries': profile.target_industries,
+    }
+
+
+def compiled_profile(settings):
+    """Compiled rules for a profile snapshot, compiled once per process and version"""
+    key = (settings['id'], settings['version'])
+    rules = _compiled.get(key)
+    if rules is None:
+        rules = compile_rules(profile_rules(
+            settings['weights'], settings['company_size_tiers'],
+            settings['funding_tiers'], settings['target_industries'],
+        ), key=('profile',) + key + (LEAD_SCORE_RULES['version'],))
+        with _compiled_lock:
+            # Older versions of this profile are never used again
+            for stale in [cached for cached in _compiled if cached[0] == key[0]]:
+                del _compiled[stale]
+            _compiled[key] = rules
+    return rules
+
+
+def _settings_for_user(user_id):
+    if user_id is None:
+        return False
+    key = _cache_key(user_id)
+    settings = cache.get(key)
+    if settings is None:
+        from .models import ScoringProfile
+
+        profile = ScoringProfile.objects.filter(user_id=user_id).first()
+        # False marks "no profile" so the miss is cached too
+        settings = _profile_settings(profile) if profile else False
+        cache.set(key, settings, PROFILE_CACHE_TIMEOUT)
+    return settings
+
+
+def rules_for_user(user_id):
+    """Compiled rules for scoring ``user_id``'s leads"""
+    settings = _settings_for_user(user_id)
+    if not settings:
+        return LEAD_SCORING
+    return compiled_profile(settings)
+
+
+def profile_key(user_id):
+    """``'<profile id>:<version>'`` of ``user_id``'s profile, or ``''`` for the default rules"""
+    settings = _settings_for_user(user_id)
+    return f"{settings['id']}:{settings['version']}" if settings else ''
+
+
+def profile_key_expression(user_field='created_by_id'):
+    """SQL counterpart of ``profile_key`` for the user in ``user_field``"""
+    from django.db.models import CharField, OuterRef, Subquery, Value
+    from django.db.models.functions import Cast, Coalesce, Concat
+    from .models import ScoringProfile
+
+    keys = ScoringProfile.objects.filter(user_id=OuterRef(user_field)).annotate(
+        key=Concat(Cast('id', CharField()), Value(':'), Cast('version', CharField()), output_field=CharField())
+    ).values('key')[:1]
+    return Coalesce(Subquery(keys), Value(''), output_field=CharField())
+
+
+def invalidate_profile(user_id):
+    cache.delete(_cache_key(user_id))
+
+
+def rescore_user_leads(user):
+    """Rescore every lead of ``user`` in a background job; returns the job"""
+    from .jobs import start_job
+    from .models import Lead
+
+    lead_ids = list(Lead.objects.filter(created_by=user).order_by('id').values_list('id', flat=True))
+    if not lead_ids:
+        return None
+    return start_job('rescore', lead_ids, user)
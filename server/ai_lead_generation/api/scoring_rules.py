@@ -0,0 +1,353 @@
+"""Declarative lead scoring rules.
+
+Scoring is described as data: each rule set lists its factors (threshold
+tiers over a numeric field, or keyword groups over a text field) and how the
+factor scores are weighted, clamped and rounded. ``compile_rules`` turns a
+rule set into a ``CompiledRules`` object once; that object scores single
+leads in Python, whole columns with NumPy, and querysets in SQL, so the
+three paths cannot drift apart.
+
+``LEAD_SCORE_RULES`` produces the stored 0-100 ``Lead.lead_score``;
+``FIT_SCORE_RULES`` produces the 0-1 fit score returned by ``LeadScorer``.
+Changing either one means bumping its ``version``.
+"""
+from bisect import bisect_left, bisect_right
+import re
+import numpy as np
+from django.db.models import Case, DecimalField, F, FloatField, IntegerField, Q, Value, When
+from django.db.models.functions import Cast, Greatest, Least, Round
+from django.db.models.lookups import GreaterThan, GreaterThanOrEqual
+
+# Strings Python's int() accepts that the SQL path can cast safely
+INTEGER_RE = r'^\s*[-+]?[0-9]+\s*$'
+# Distinct raw values remembered per keyword factor before the memo resets
+KEYWORD_MEMO_SIZE = 10000
+
+LEAD_SCORE_RULES = {
+    'name': 'lead',
+    'version': 1,
+    'factors': (
+        {
+            'name': 'company_size',
+            'field': 'company_size',
+            'type': 'integer',
+            # Strictly above the threshold, e.g. more than 1000 employees
+            'inclusive': False,
+            'tiers': ((1000, 30), (500, 20), (100, 10)),
+            'default': 0,
+            'invalid': 0,
+        },
+        {
+            'name': 'funding',
+            'field': 'funding_amount',
+            'type': 'number',
+            'inclusive': False,
+            'tiers': ((10000000, 40), (5000000, 30), (1000000, 20), (500000, 10)),
+            'default': 0,
+            # No 'invalid' score: an unparseable amount is an error, not a low score
+        },
+        {
+            'name': 'industry',
+            'field': 'industry',
+            'type': 'keywords',
+            'match': 'exact',
+            'keywords': ((30, ('tech', 'technology', 'software', 'it', 'saas')),),
+            'default': 0,
+        },
+    ),
+    'weights': {'company_size': 1, 'funding': 1, 'industry': 1},
+    'clamp': (0, 100),
+    'round': 0,
+}
+
+FIT_SCORE_RULES = {
+    'name': 'fit',
+    'version': 1,
+    'factors': (
+        {
+            'name': 'company_size',
+            'field': 'company_size',
+            'type': 'integer',
+            'inclusive': True,
+            'tiers': ((1000, 1.0), (500, 0.8), (100, 0.6), (50, 0.3)),
+            'default': 0.1,
+            'invalid': 0.1,
+        },
+        {
+            'name': 'funding',
+            'field': 'funding_amount',
+            'type': 'number',
+            'inclusive': True,
+            'tiers': ((10000000, 1.0), (5000000, 0.8), (1000000, 0.5), (100000, 0.2)),
+            'default': 0.1,
+            'invalid': 0.1,
+        },
+        {
+            'name': 'industry',
+            'field': 'industry',
+            'type': 'keywords',
+            # Any keyword appearing in the industry, first group wins
+            'match': 'contains',
+            'keywords': (
+                (1.0, ('technology', 'tech', 'saas', 'fintech', 'ai', 'machine learning')),
+                (0.8, ('healthcare', 'finance', 'retail', 'manufacturing')),
+            ),
+            'default': 0.5,
+        },
+    ),
+    'weights': {'company_size': 0.3, 'funding': 0.3, 'industry': 0.4},
+    'clamp': None,
+    'round': 2,
+}
+
+
+class TierFactor:
+    """A numeric field mapped onto score tiers by threshold"""
+
+    def __init__(self, spec):
+        self.name = spec['name']
+        self.field = spec['field']
+        self.parse = int if spec['type'] == 'integer' else float
+        self.inclusive = spec['inclusive']
+        tiers = sorted(spec['tiers'])
+        self.thresholds = tuple(threshold for threshold, _ in tiers)
+        self.values = (spec['default'],) + tuple(value for _, value in tiers)
+        self.default = spec['default']
+        self.strict = 'invalid' not in spec
+        self.invalid = spec.get('invalid')
+        self._side = 'right' if self.inclusive else 'left'
+        self._bisect = bisect_right if self.inclusive else bisect_left
+        self._table = np.array(self.values, dtype=float)
+
+    def number(self, value):
+        """Parse a raw value; empty values count as 0, unparseable ones as ``None`` (or raise, for strict factors)"""
+        try:
+            return self.parse(value) if value else 0
+        except (ValueError, TypeError):
+            if self.strict:
+                raise
+            return None
+
+    def score(self, value):
+        number = self.number(value)
+        if number is None:
+            return self.invalid
+        return self.values[self._bisect(self.thresholds, number)]
+
+    def score_array(self, values):
+        if isinstance(values, np.ndarray) and values.dtype.kind == 'f':
+            # Already numeric (e.g. a LeadFrame column): NULL counts as empty
+            parsed = np.nan_to_num(values, nan=0.0)
+            return self._table[np.searchsorted(self.thresholds, parsed, side=self._side)]
+        numbers = [self.number(value) for value in values]
+        invalid = np.fromiter((number is None for number in numbers), dtype=bool, count=len(numbers))
+        parsed = np.array([0 if number is None else number for number in numbers], dtype=float)
+        scores = self._table[np.searchsorted(self.thresholds, parsed, side=self._side)]
+        scores[invalid] = self.invalid
+        return scores
+
+    def expression(self):
+        column = F(self.field)
+        compare = GreaterThanOrEqual if self.inclusive else GreaterThan
+        empty = Q(**{f'{self.field}__isnull': True})
+        if self.parse is int:
+            empty |= Q(**{self.field: ''})
+            # numeric, not integer: a long digit string must not overflow and abort the query
+            column = Cast(self.field, DecimalField(max_digits=65, decimal_places=0))
+        whens = [When(empty, then=Value(self.score(0)))]
+        if self.parse is int and not self.strict:
+            whens.append(When(~Q(**{f'{self.field}__regex': INTEGER_RE}), then=Value(self.invalid)))
+        for threshold, value in reversed(list(zip(self.thresholds, self.values[1:]))):
+            whens.append(When(compare(column, Value(threshold)), then=Value(value)))
+        return Case(*whens, default=Value(self.default))
+
+
+class KeywordFactor:
+    """A text field scored by the first keyword group it matches.
+
+    All keywords are compiled into one regex alternation, and results are
+    memoized per distinct raw value: a lead table holds few distinct
+    industries, so bulk scoring classifies each one once.
+    """
+
+    def __init__(self, spec):
+        self.name = spec['name']
+        self.field = spec['field']
+        self.contains = spec.get('match', 'exact') == 'contains'
+        self.default = spec['default']
+        self.groups = tuple(
+            (value, tuple(keyword.lower() for keyword in keywords))
+            for value, keywords in spec['keywords']
+        )
+        # keyword -> index of the first group listing it
+        self.ranks = {}
+        for rank, (_, keywords) in enumerate(self.groups):
+            for keyword in keywords:
+                self.ranks.setdefault(keyword, rank)
+        # A lookahead finds keywords overlapping each other ("retail" and "ai");
+        # alternatives are ordered by group so each position yields its best rank
+        alternatives = sorted(self.ranks, key=lambda keyword: (self.ranks[keyword], -len(keyword)))
+        self.pattern = re.compile('(?=(%s))' % '|'.join(map(re.escape, alternatives))) if alternatives else None
+        self._memo = {}
+
+    def normalize(self, value):
+        return str(value).lower() if value else ''
+
+    def _classify(self, value):
+        text = self.normalize(value)
+        if not self.contains:
+            rank = self.ranks.get(text)
+        else:
+            rank = None
+            for match in self.pattern.finditer(text) if self.pattern else ():
+                found = self.ranks[match.group(1)]
+                if rank is None or found < rank:
+                    rank = found
+                    if rank == 0:
+                        break
+        return self.default if rank is None else self.groups[rank][0]
+
+    def score(self, value):
+        try:
+            return self._memo[value]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable input, classify without memoizing
+            return self._classify(value)
+        if len(self._memo) >= KEYWORD_MEMO_SIZE:
+            self._memo.clear()
+        score = self._memo[value] = self._classify(value)
+        return score
+
+    def distinct_table(self, values):
+        """Return ``(distinct, codes, scores)`` for a column of raw values.
+
+        ``distinct`` lists each raw value once, ``codes`` maps every row to
+        its position in ``distinct`` and ``scores`` holds the score per
+        distinct value, so ``scores[codes]`` scores the whole column.
+        """
+        index = {}
+        codes = np.fromiter(
+            (index.setdefault(value, len(index)) for value in values), dtype=np.intp
+        )
+        distinct = list(index)
+        scores = np.array([self.score(value) for value in distinct], dtype=float)
+        return distinct, codes, scores
+
+    def score_array(self, values):
+        _, codes, scores = self.distinct_table(values)
+        return scores[codes]
+
+    def expression(self):
+        lookup = 'icontains' if self.contains else 'iexact'
+        whens = []
+        for value, keywords in self.groups:
+            match = Q()
+            for keyword in keywords:
+                match |= Q(**{f'{self.field}__{lookup}': keyword})
+            whens.append(When(match, then=Value(value)))
+        return Case(*whens, default=Value(self.default))
+
+
+FACTOR_TYPES = {
+    'integer': TierFactor,
+    'number': TierFactor,
+    'keywords': KeywordFactor,
+}
+
+
+class CompiledRules:
+    """A rule set compiled into threshold tables and keyword lookups"""
+
+    def __init__(self, rules, key=None):
+        self.version = rules['version']
+        # Identifies these exact rules, e.g. in score caches
+        self.key = key or (rules.get('name'), rules['version'])
+        self.factors = {}
+        for spec in rules['factors']:
+            self.factors[spec['name']] = FACTOR_TYPES[spec['type']](spec)
+        self.weights = tuple((name, rules['weights'][name]) for name in self.factors)
+        self.clamp = rules.get('clamp')
+        self.ndigits = rules.get('round')
+
+    def factor_score(self, name, value):
+        """Score one raw value against a single factor"""
+        return self.factors[name].score(value)
+
+    def _finish(self, total):
+        if self.clamp is not None:
+            low, high = self.clamp
+            total = max(low, min(high, total))
+        if self.ndigits == 0:
+            return int(round(total))
+        if self.ndigits is not None:
+            return round(total, self.ndigits)
+        return total
+
+    def score(self, lead):
+        """Score an object exposing the factor fields as attributes"""
+        total = 0
+        for name, weight in self.weights:
+            factor = self.factors[name]
+            total += factor.score(getattr(lead, factor.field)) * weight
+        return self._finish(total)
+
+    def score_columns(self, columns):
+        """Score column-wise inputs, ``{field: sequence}``; returns a list"""
+        totals = None
+        for name, weight in self.weights:
+            factor = self.factors[name]
+            part = factor.score_array(columns[factor.field]) * weight
+            totals = part if totals is None else totals + part
+        if totals is None:
+            return []
+        return [self._finish(float(total)) for total in totals]
+
+    def score_many(self, leads):
+        """Score a sequence of lead-like objects in one vectorized pass"""
+        leads = list(leads)
+        fields = {factor.field for factor in self.factors.values()}
+        return self.score_columns({
+            field: [getattr(lead, field) for lead in leads] for field in fields
+        })
+
+    def score_frame(self, frame):
+        """Score every row of a ``LeadFrame``; returns an array aligned with ``frame.ids``"""
+        totals = np.zeros(len(frame))
+        for name, weight in self.weights:
+            factor = self.factors[name]
+            column = frame[factor.field]
+            codes = getattr(column, 'codes', None)
+            if codes is not None:
+                # Dictionary-encoded: score each distinct value once
+                part = factor.score_array(column.categories)[codes]
+            else:
+                part = factor.score_array(column)
+            totals = totals + part * weight
+        return np.array([self._finish(float(total)) for total in totals])
+
+    def expression(self):
+        """Database expression computing the score for each row"""
+        total = None
+        for name, weight in self.weights:
+            part = self.factors[name].expression() * Value(weight)
+            total = part if total is None else total + part
+        total = Cast(total, FloatField())
+        if self.clamp is not None:
+            low, high = self.clamp
+            total = Greatest(Least(total, Value(float(high))), Value(float(low)))
+        if self.ndigits == 0:
+            return Cast(Round(total), IntegerField())
+        if self.ndigits is not None:
+            return Round(total, self.ndigits)
+        return total
+
+
+def compile_rules(rules, key=None):
+    """Compile a declarative rule set; ``key`` must change whenever ``rules`` do"""
+    return CompiledRules(rules, key)
+
+
+LEAD_SCORING = compile_rules(LEAD_SCORE_RULES)
+FIT_SCORING = compile_rules(FIT_SCORE_RULES)
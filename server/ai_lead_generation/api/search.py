@@ -0,0 +1,141 @@
+"""Full-text search over leads.
+
+PostgreSQL keeps a weighted ``tsvector`` in ``Lead.search_vector`` behind a
+GIN index declared in ``Lead.Meta``. SQLite keeps an FTS5 shadow table keyed
+by lead id, created by the migrations. Both are refreshed explicitly by
+``index_leads`` from ``Lead.save`` and the bulk write paths, so searches
+never fall back to ``icontains`` scans.
+"""
+import logging
+import re
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'api_lead_fts'
+SEARCH_CONFIG = 'english'
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Weighted columns indexed for search
+SEARCH_COLUMNS = (
+    ('name', 'A'),
+    ('company', 'A'),
+    ('email', 'B'),
+    ('industry', 'B'),
+    ('linkedin_url', 'C'),
+    ('domain', 'C'),
+)
+SEARCH_FIELDS = frozenset(column for column, _ in SEARCH_COLUMNS)
+
+
+def _vendor(using=None):
+    return (using or connection).vendor
+
+
+def _search_vector():
+    from django.contrib.postgres.search import SearchVector
+
+    vector = None
+    for column, weight in SEARCH_COLUMNS:
+        part = SearchVector(column, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def _chunks(ids, size=500):
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def index_leads(lead_ids):
+    """Refresh the search index for the given lead ids in bulk"""
+    from .models import Lead
+
+    lead_ids = [lead_id for lead_id in lead_ids if lead_id is not None]
+    if not lead_ids:
+        return
+    vendor = _vendor()
+    if vendor == 'postgresql':
+        for chunk in _chunks(lead_ids):
+            Lead.objects.filter(id__in=chunk).update(search_vector=_search_vector())
+    elif vendor == 'sqlite':
+        columns = ', '.join(column for column, _ in SEARCH_COLUMNS)
+        with connection.cursor() as cursor:
+            for chunk in _chunks(lead_ids):
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', chunk)
+                cursor.execute(
+                    f'INSERT INTO {FTS_TABLE} (rowid, {columns}) '
+                    f'SELECT id, {columns} FROM api_lead WHERE id IN ({placeholders})',
+                    chunk
+                )
+
+
+def unindex_leads(lead_ids):
+    """Drop deleted leads from the search index"""
+    lead_ids = [lead_id for lead_id in lead_ids if lead_id is not None]
+    if not lead_ids or _vendor() != 'sqlite':
+        # The PostgreSQL vector lives on the row itself
+        return
+    with connection.cursor() as cursor:
+        for chunk in _chunks(lead_ids):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', chunk)
+
+
+def rebuild_search_index(batch_size=2000):
+    """Re-index every lead; returns the number of leads indexed"""
+    from .models import Lead
+
+    total = 0
+    batch = []
+    for lead_id in Lead.objects.order_by('id').values_list('id', flat=True).iterator(chunk_size=batch_size):
+        batch.append(lead_id)
+        if len(batch) >= batch_size:
+            index_leads(batch)
+            total += len(batch)
+            batch = []
+    index_leads(batch)
+    return total + len(batch)
+
+
+def _fts_query(query):
+    """Turn free text into a safe FTS5 expression: every term must prefix-match"""
+    terms = TOKEN_RE.findall(query)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_leads(queryset, query):
+    """Filter ``queryset`` to leads matching ``query``, best matches first.
+
+    Results are ordered by relevance and then by ``lead_score``. Each lead is
+    annotated with ``search_rank``.
+    """
+    if not TOKEN_RE.search(query or ''):
+        return queryset.none()
+    vendor = _vendor()
+    if vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+        return queryset.filter(search_vector=search_query).annotate(
+            search_rank=SearchRank(F('search_vector'), search_query)
+        ).order_by('-search_rank', F('lead_score').desc(nulls_last=True))
+    if vendor == 'sqlite':
+        # bm25() is lower-is-better, so negate it to rank like SearchRank
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = api_lead.id', f'{FTS_TABLE} MATCH %s'],
+            params=[_fts_query(query)],
+            select={'search_rank': f'-bm25({FTS_TABLE})'},
+        ).order_by('-search_rank', F('lead_score').desc(nulls_last=True))
+
+    logger.warning(f"No full-text index for database vendor {vendor}, falling back to icontains")
+    match = Q()
+    for column, _ in SEARCH_COLUMNS:
+        match |= Q(**{f'{column}__icontains': query})
+    return queryset.filter(match).annotate(
+        search_rank=Value(0.0, output_field=FloatField())
+    ).order_by(F('lead_score').desc(nulls_last=True))
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import Lead, Outreach
+from .models import Lead, Outreach, ScoringProfile
+from .scoring_profiles import validate_profile
 
 User = get_user_model()
 
@@ -17,7 +18,7 @@ class UserSerializer(serializers.ModelSerializer):
 class LeadSerializer(serializers.ModelSerializer):
     class Meta:
         model = Lead
-        fields = '__all__'
+        exclude = ('search_vector', 'score_inputs_hash')
         read_only_fields = ('created_by', 'created_at', 'updated_at', 'lead_score')
 
 class OutreachSerializer(serializers.ModelSerializer):
@@ -25,3 +26,24 @@ class OutreachSerializer(serializers.ModelSerializer):
         model = Outreach
         fields = '__all__'
         read_only_fields = ('generated_at',)
+
+class ScoringProfileSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ScoringProfile
+        fields = ('name', 'weights', 'company_size_tiers', 'funding_tiers', 'target_industries',
+                  'version', 'updated_at')
+        read_only_fields = ('version', 'updated_at')
+
+    def validate(self, attrs):
+        values = {
+            field: attrs.get(field, getattr(self.instance, field, None))
+            for field in ('weights', 'company_size_tiers', 'funding_tiers', 'target_industries')
+        }
+        try:
+            validate_profile(
+                values['weights'] or {}, values['company_size_tiers'] or [],
+                values['funding_tiers'] or [], values['target_industries'] or []
+            )
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return attrs
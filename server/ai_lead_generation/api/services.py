@@ -1,7 +1,15 @@
 import logging
+from django.db import transaction
 from django.utils import timezone
-from .models import Lead
+from .models import SCORE_FIELDS, Lead
+from .metadata import PROMOTED_METADATA_KEYS
+from .serializers import LeadSerializer
 from .scoring import LeadScorer
+from .score_cache import describe_stats, get_score_cache
+from .search import SEARCH_FIELDS, index_leads, unindex_leads
+from .sync import record_deletions
+from .events import publish_lead_change
+from .rollups import add_rollup_delta, apply_rollup_deltas, lead_rollup_values, new_rollup_deltas
 from .message_generator import MessageGenerator, generate_messages
 import csv
 import io
@@ -9,6 +17,38 @@ import random
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on the number of operations accepted by a single batch request
+BATCH_MAX_OPERATIONS = 10000
+BATCH_OPERATIONS = ('create', 'update', 'delete')
+
+
+def bulk_update_leads(leads, fields, now=None, rollup_deltas=None):
+    """Write ``fields`` of loaded leads with one ``bulk_update``.
+
+    bulk_update bypasses ``Lead.save()``, so this applies ``auto_now`` and
+    keeps the search index, rollups and event stream in step. Pass
+    ``rollup_deltas`` to accumulate into a caller's deltas instead of
+    applying them here.
+    """
+    if not leads:
+        return
+    fields = set(fields) | {'updated_at'}
+    now = now or timezone.now()
+    for lead in leads:
+        lead.updated_at = now
+    Lead.objects.bulk_update(leads, sorted(fields), batch_size=500)
+    if fields & SEARCH_FIELDS:
+        index_leads([lead.id for lead in leads])
+
+    deltas = new_rollup_deltas() if rollup_deltas is None else rollup_deltas
+    for lead in leads:
+        add_rollup_delta(deltas, lead._loaded_values, -1)
+        add_rollup_delta(deltas, lead_rollup_values(lead), 1)
+        publish_lead_change(lead._loaded_values, lead)
+        lead._snapshot()
+    if rollup_deltas is None:
+        apply_rollup_deltas(deltas)
+
 class LeadAutomationService:
     def __init__(self):
         self.email_templates = [
@@ -86,6 +126,7 @@ class LeadAutomationService:
                     logger.error(f"Error importing lead: {str(e)}")
                     error_count += 1
 
+            logger.info(f"Imported {imported_count} leads, {describe_stats(get_score_cache().stats())}")
             return {
                 'imported_count': imported_count,
                 'error_count': error_count
@@ -94,6 +135,34 @@ class LeadAutomationService:
             logger.error(f"Error reading CSV file: {str(e)}")
             raise
 
+    async def aimport_leads_from_csv(self, csv_data, user):
+        """Async variant of import_leads_from_csv using the async ORM"""
+        imported_count = 0
+        error_count = 0
+
+        for row in csv_data:
+            try:
+                await Lead.objects.acreate(
+                    name=row.get('name', ''),
+                    email=row.get('email', ''),
+                    company=row.get('company', ''),
+                    position=row.get('position', ''),
+                    industry=row.get('industry', ''),
+                    company_size=row.get('company_size', 0),
+                    funding_amount=row.get('funding_amount', 0.0),
+                    created_by=user
+                )
+                imported_count += 1
+            except Exception as e:
+                logger.error(f"Error importing lead: {str(e)}")
+                error_count += 1
+
+        logger.info(f"Imported {imported_count} leads, {describe_stats(get_score_cache().stats())}")
+        return {
+            'imported_count': imported_count,
+            'error_count': error_count
+        }
+
     def score_lead(self, lead):
         """Calculate lead score using LeadScorer"""
         scorer = LeadScorer()
@@ -113,15 +182,19 @@ class LeadAutomationService:
                 
                 leads = leads.filter(**filters)
             
+            leads = list(leads)
+            # Score each distinct feature tuple once, in one vectorized pass
+            scores = LeadScorer().calculate_total_scores(leads)
+            logger.info(f"process_all_leads scored {len(leads)} leads, {describe_stats(get_score_cache().stats())}")
             results = []
-            for lead in leads:
+            for lead, score in zip(leads, scores):
                 lead_data = {
                     'id': lead.id,
                     'name': lead.name,
                     'company': lead.company,
                     'industry': lead.industry,
                     'status': lead.status,
-                    'score': self.score_lead(lead)
+                    'score': score
                 }
                 results.append(lead_data)
             
@@ -133,3 +206,126 @@ class LeadAutomationService:
         except Exception as e:
             logger.error(f"Error in process_all_leads: {str(e)}")
             raise
+
+    def apply_lead_batch(self, operations, user):
+        """Validate and apply a batch of create/update/delete operations.
+
+        Every operation is validated before anything is written. If any
+        operation is invalid nothing is applied and ``(False, results)`` is
+        returned with the per-item errors. Otherwise all operations are
+        applied in a single transaction using bulk queries and
+        ``(True, results)`` is returned.
+        """
+        if not isinstance(operations, list):
+            raise ValueError("'operations' must be a list")
+        if len(operations) > BATCH_MAX_OPERATIONS:
+            raise ValueError(f"A batch may contain at most {BATCH_MAX_OPERATIONS} operations")
+
+        # Fetch every lead referenced by an update or delete in one query
+        referenced_ids = set()
+        for op in operations:
+            if isinstance(op, dict) and op.get('op') in ('update', 'delete'):
+                try:
+                    referenced_ids.add(int(op.get('id')))
+                except (TypeError, ValueError):
+                    pass
+        existing = Lead.objects.filter(created_by=user, id__in=referenced_ids).in_bulk()
+
+        results = []
+        to_create = []
+        to_update = []
+        update_fields = set()
+        to_delete = []
+        seen_ids = set()
+        has_errors = False
+
+        for index, op in enumerate(operations):
+            result = {'index': index}
+            results.append(result)
+            if not isinstance(op, dict) or op.get('op') not in BATCH_OPERATIONS:
+                result['errors'] = {'op': [f"Must be one of: {', '.join(BATCH_OPERATIONS)}"]}
+                has_errors = True
+                continue
+
+            action = result['op'] = op['op']
+            if action == 'create':
+                serializer = LeadSerializer(data=op.get('data') or {})
+                if not serializer.is_valid():
+                    result['errors'] = serializer.errors
+                    has_errors = True
+                    continue
+                to_create.append((result, Lead(created_by=user, **serializer.validated_data)))
+                continue
+
+            try:
+                lead_id = int(op.get('id'))
+            except (TypeError, ValueError):
+                lead_id = None
+            lead = existing.get(lead_id)
+            if lead is None:
+                result['errors'] = {'id': [f"Lead with id {op.get('id')} not found"]}
+                has_errors = True
+                continue
+            if lead_id in seen_ids:
+                result['errors'] = {'id': ['Lead appears more than once in this batch']}
+                has_errors = True
+                continue
+            seen_ids.add(lead_id)
+            result['id'] = lead_id
+
+            if action == 'delete':
+                to_delete.append((result, lead_id))
+                continue
+
+            serializer = LeadSerializer(lead, data=op.get('data') or {}, partial=True)
+            if not serializer.is_valid():
+                result['errors'] = serializer.errors
+                has_errors = True
+                continue
+            for field, value in serializer.validated_data.items():
+                setattr(lead, field, value)
+            if lead.refresh_score():
+                update_fields.update(SCORE_FIELDS)
+            if 'metadata' in serializer.validated_data:
+                lead.promote_metadata()
+                update_fields.update(PROMOTED_METADATA_KEYS)
+            update_fields.update(serializer.validated_data.keys())
+            to_update.append((result, lead))
+
+        if has_errors:
+            return False, results
+
+        now = timezone.now()
+        rollup_deltas = new_rollup_deltas()
+        with transaction.atomic():
+            if to_delete:
+                deleted_ids = [lead_id for _, lead_id in to_delete]
+                Lead.objects.filter(id__in=deleted_ids).delete()
+                unindex_leads(deleted_ids)
+                record_deletions([(lead_id, user.id) for lead_id in deleted_ids])
+                for result, lead_id in to_delete:
+                    add_rollup_delta(rollup_deltas, existing[lead_id]._loaded_values, -1)
+                    result['status'] = 'deleted'
+
+            if to_update:
+                bulk_update_leads([lead for _, lead in to_update], update_fields,
+                                  now=now, rollup_deltas=rollup_deltas)
+                for result, _ in to_update:
+                    result['status'] = 'updated'
+
+            if to_create:
+                # bulk_create bypasses save(), so score new leads here
+                for _, lead in to_create:
+                    lead.refresh_score()
+                    lead.promote_metadata()
+                created = Lead.objects.bulk_create([lead for _, lead in to_create], batch_size=500)
+                index_leads([lead.id for lead in created])
+                for (result, _), lead in zip(to_create, created):
+                    add_rollup_delta(rollup_deltas, lead_rollup_values(lead), 1)
+                    lead._snapshot()
+                    result['id'] = lead.id
+                    result['status'] = 'created'
+
+            apply_rollup_deltas(rollup_deltas)
+
+        return True, results
@@ -0,0 +1,125 @@
+"""Delta sync for lead lists.
+
+Clients hold an opaque token and ask for ``leads/changes/?since=<token>``.
+The response lists leads created or updated after the token's cursor, in
+``(updated_at, id)`` order, plus tombstones for leads deleted since then.
+Cursors stay a few seconds behind the clock so rows from transactions that
+commit late are sent again rather than missed; clients apply changes as
+idempotent upserts.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+from django.db.models import Q
+from django.utils import timezone
+
+SYNC_PAGE_SIZE = 500
+# How far behind "now" a final cursor is held to cover in-flight transactions
+SYNC_SAFETY_WINDOW = timedelta(seconds=2)
+# Tombstones older than this are pruned; older tokens must resync from scratch
+SYNC_TOMBSTONE_RETENTION = timedelta(days=30)
+
+
+class SyncTokenError(ValueError):
+    """Raised for malformed sync tokens"""
+
+
+class SyncTokenExpired(SyncTokenError):
+    """Raised when a token predates the tombstone retention window"""
+
+
+def encode_token(updated_at, last_id, deleted_since):
+    payload = {
+        'u': updated_at.isoformat() if updated_at else None,
+        'i': last_id,
+        'd': deleted_since.isoformat(),
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_token(token):
+    """Return ``(updated_at, last_id, deleted_since)`` for a token"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        updated_at = datetime.fromisoformat(payload['u']) if payload['u'] else None
+        last_id = int(payload['i'])
+        deleted_since = datetime.fromisoformat(payload['d'])
+        # Tokens are always issued with aware timestamps
+        if timezone.is_naive(deleted_since) or (updated_at is not None and timezone.is_naive(updated_at)):
+            raise ValueError('naive timestamp')
+    except (binascii.Error, ValueError, TypeError, KeyError, AttributeError):
+        raise SyncTokenError('Invalid sync token')
+    if deleted_since < timezone.now() - SYNC_TOMBSTONE_RETENTION:
+        raise SyncTokenExpired('Sync token has expired')
+    return updated_at, last_id, deleted_since
+
+
+def current_token():
+    """Token for a client that has just loaded the full list"""
+    horizon = timezone.now() - SYNC_SAFETY_WINDOW
+    return encode_token(horizon, 0, horizon)
+
+
+def lead_changes(user, token=None, limit=SYNC_PAGE_SIZE):
+    """Return the leads and tombstones that changed for ``user`` since ``token``"""
+    from .models import Lead, LeadDeletion
+
+    horizon = timezone.now() - SYNC_SAFETY_WINDOW
+    if token:
+        updated_at, last_id, deleted_since = decode_token(token)
+    else:
+        updated_at, last_id, deleted_since = None, 0, horizon
+
+    leads = Lead.objects.filter(created_by=user)
+    if updated_at is not None:
+        leads = leads.filter(
+            Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=last_id)
+        )
+    page = list(leads.order_by('updated_at', 'id')[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    if page:
+        last = page[-1]
+        if has_more or last.updated_at < horizon:
+            updated_at, last_id = last.updated_at, last.id
+        elif updated_at is None or updated_at < horizon:
+            # Hold the cursor behind rows that may still be committing
+            updated_at, last_id = horizon, 0
+
+    deleted = []
+    if token:
+        deleted = list(
+            LeadDeletion.objects.filter(user=user, deleted_at__gt=deleted_since)
+            .order_by('deleted_at').values_list('lead_id', flat=True)
+        )
+        deleted_since = max(deleted_since, horizon)
+
+    return {
+        'changed': page,
+        'deleted': deleted,
+        'has_more': has_more,
+        'next': encode_token(updated_at, last_id, deleted_since),
+    }
+
+
+def record_deletions(leads):
+    """Write tombstones for ``(lead_id, user_id)`` pairs"""
+    from .models import LeadDeletion
+
+    LeadDeletion.objects.bulk_create([
+        LeadDeletion(lead_id=lead_id, user_id=user_id)
+        for lead_id, user_id in leads if lead_id is not None and user_id is not None
+    ], batch_size=1000)
+
+
+def prune_deletions(now=None):
+    """Delete tombstones older than the retention window; returns the count"""
+    from .models import LeadDeletion
+
+    cutoff = (now or timezone.now()) - SYNC_TOMBSTONE_RETENTION
+    deleted, _ = LeadDeletion.objects.filter(deleted_at__lt=cutoff).delete()
+    return deleted
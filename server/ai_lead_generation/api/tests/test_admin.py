@@ -0,0 +1,139 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from ..models import Lead, LeadDailyRollup, LeadDeletion, LeadMessage, Outreach
+from ..search import search_leads
+
+User = get_user_model()
+
+class AdminChangelistQueryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123'
+        )
+        self.client.force_login(self.user)
+
+    def _add_leads(self, count):
+        for i in range(count):
+            lead = Lead.objects.create(name=f'Lead {i}', company=f'Company {i}',
+                                       industry='Technology', created_by=self.user)
+            Outreach.objects.create(lead=lead, email_content='Hello', linkedin_content='Hi')
+            LeadMessage.objects.create(lead=lead, email_content='Hello', linkedin_message='Hi')
+
+    def _count_queries(self, url):
+        # Start cold so cached counts and filter options are fetched every time
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def _assert_constant_queries(self, url):
+        self._add_leads(2)
+        small = self._count_queries(url)
+        self._add_leads(20)
+        self.assertEqual(self._count_queries(url), small)
+
+    def test_lead_changelist(self):
+        """Test the lead changelist query count does not grow with the page"""
+        url = reverse('admin:api_lead_changelist')
+        self._assert_constant_queries(url)
+        self.assertContains(self.client.get(url), 'icon-yes.svg')
+
+    def test_linkedin_link(self):
+        """Test that the changelist and change form render the LinkedIn URL as a link"""
+        lead = Lead.objects.create(name='Linked Lead', metadata={'linkedin_url': 'https://linkedin.com/in/linked'},
+                                   created_by=self.user)
+        Lead.objects.create(name='Unlinked Lead', created_by=self.user)
+        anchor = '<a href="https://linkedin.com/in/linked" target="_blank">'
+
+        response = self.client.get(reverse('admin:api_lead_changelist'))
+        self.assertContains(response, anchor)
+        self.assertContains(response, 'alt="No LinkedIn"')
+
+        response = self.client.get(reverse('admin:api_lead_change', args=[lead.id]))
+        self.assertContains(response, anchor)
+
+    def test_outreach_changelist(self):
+        """Test the outreach changelist query count does not grow with the page"""
+        self._assert_constant_queries(reverse('admin:api_outreach_changelist'))
+
+    def test_lead_message_changelist(self):
+        """Test the lead message changelist query count does not grow with the page"""
+        self._assert_constant_queries(reverse('admin:api_leadmessage_changelist'))
+
+
+class LeadChangelistCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123'
+        )
+        self.client.force_login(self.user)
+        for industry in ('Technology', 'Retail', 'Technology'):
+            Lead.objects.create(name=f'{industry} Lead', industry=industry, created_by=self.user)
+        self.url = reverse('admin:api_lead_changelist')
+
+    def _queries(self, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response, [query['sql'] for query in context.captured_queries]
+
+    def test_counts_and_industries_cached(self):
+        """Test that repeat page loads skip COUNT(*) and the DISTINCT industry scan"""
+        response, queries = self._queries()
+        self.assertEqual(sum('COUNT(' in sql for sql in queries), 1)
+        self.assertTrue(any('DISTINCT' in sql for sql in queries))
+        self.assertContains(response, '?industry=Retail')
+
+        response, queries = self._queries()
+        self.assertFalse(any('COUNT(' in sql for sql in queries))
+        self.assertFalse(any('DISTINCT' in sql for sql in queries))
+        self.assertContains(response, '3 leads')
+
+    def test_industry_filter(self):
+        """Test filtering the changelist by a cached industry option"""
+        response, _ = self._queries({'industry': 'Retail'})
+        self.assertContains(response, 'Retail Lead')
+        self.assertNotContains(response, 'Technology Lead')
+
+
+class LeadAdminDeleteTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123'
+        )
+        self.client.force_login(self.user)
+        self.doomed = [
+            Lead.objects.create(name=f'Doomed {i}', company='Zyxcorp', created_by=self.user) for i in range(2)
+        ]
+        self.kept = Lead.objects.create(name='Kept', company='Zyxcorp', created_by=self.user)
+
+    def test_delete_selected_keeps_derived_data_in_step(self):
+        """Test that the bulk delete action updates rollups, tombstones and the search index"""
+        response = self.client.post(reverse('admin:api_lead_changelist'), {
+            'action': 'delete_selected',
+            '_selected_action': [lead.id for lead in self.doomed],
+            'post': 'yes',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(list(Lead.objects.values_list('id', flat=True)), [self.kept.id])
+
+        self.assertEqual(sum(LeadDailyRollup.objects.values_list('lead_count', flat=True)), 1)
+        self.assertEqual(
+            set(LeadDeletion.objects.values_list('lead_id', flat=True)), {lead.id for lead in self.doomed}
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT rowid FROM api_lead_fts WHERE api_lead_fts MATCH %s', ['"Zyxcorp"'])
+            self.assertEqual([row[0] for row in cursor.fetchall()], [self.kept.id])
+        self.assertEqual(list(search_leads(Lead.objects.all(), 'Zyxcorp')), [self.kept])
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+from ..models import Lead, Outreach
+from ..message_generator import agenerate_llm_messages
+
+User = get_user_model()
+
+class SlowAsyncCompletions:
+    """Stands in for groq.AsyncGroq: every completion waits on simulated network I/O"""
+    def __init__(self, delay):
+        self.delay = delay
+        self.chat = SimpleNamespace(completions=self)
+
+    async def create(self, **kwargs):
+        await asyncio.sleep(self.delay)
+        message = SimpleNamespace(content=f" {kwargs['max_tokens']} ")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+class AsyncLLMGenerationTests(SimpleTestCase):
+    def test_concurrent_generation_is_not_thread_bound(self):
+        """Test that 100 generations overlap on one event loop"""
+        client = SlowAsyncCompletions(delay=0.2)
+        leads = [Lead(name=f'Lead {i}', company='Acme', industry='tech') for i in range(100)]
+
+        async def scenario():
+            return await asyncio.gather(*(agenerate_llm_messages(lead, client) for lead in leads))
+
+        started = time.perf_counter()
+        results = asyncio.run(scenario())
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(results[0], ('1000', '300'))
+        # Serially this is 100 leads x 2 calls x 0.2s = 40s
+        self.assertLess(elapsed, 2.0)
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        token = str(RefreshToken.for_user(self.user).access_token)
+        self.headers = {'Authorization': f'Bearer {token}'}
+        self.lead = Lead.objects.create(
+            name='John Doe', company='Test Company', industry='Technology', created_by=self.user
+        )
+
+    async def test_generate_messages_async(self):
+        """Test the async message generation endpoint"""
+        url = reverse('generate-messages-async', args=[self.lead.id])
+        response = await self.async_client.post(url, headers=self.headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('John Doe', response.json()['email_content'])
+        self.assertEqual(await Outreach.objects.filter(lead=self.lead).acount(), 1)
+
+    async def test_generate_messages_async_requires_auth_and_ownership(self):
+        """Test that anonymous users and other users' leads are rejected"""
+        url = reverse('generate-messages-async', args=[self.lead.id])
+        response = await self.async_client.post(url)
+        self.assertEqual(response.status_code, 401)
+
+        other = await User.objects.acreate(username='other')
+        token = str(RefreshToken.for_user(other).access_token)
+        response = await self.async_client.post(url, headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 404)
+
+    async def test_import_leads_async(self):
+        """Test the async CSV import endpoint"""
+        csv_file = SimpleUploadedFile(
+            'leads.csv',
+            b'name,email,company,position,industry,company_size,funding_amount\n'
+            b'Jane,jane@example.com,Acme,CTO,tech,200,1000000\n'
+            b'Bad,bad@example.com,Acme,CTO,tech,200,not-a-number\n',
+            content_type='text/csv'
+        )
+        response = await self.async_client.post(
+            reverse('import-leads-async'), {'file': csv_file}, headers=self.headers
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {'imported_count': 1, 'error_count': 1})
+        self.assertTrue(await Lead.objects.filter(name='Jane', created_by=self.user).aexists())
+
+    async def test_admin_async_generation(self):
+        """Test the async admin generation view for staff users"""
+        url = reverse('admin:generate-lead-messages-async', args=[self.lead.id])
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 403)
+
+        staff = await User.objects.acreate(username='staff', is_staff=True)
+        await self.async_client.aforce_login(staff)
+        with mock.patch('ai_lead_generation.api.admin.agenerate_llm_messages',
+                        return_value=('Email body', 'LinkedIn body')):
+            response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'success')
+        outreach = await Outreach.objects.aget(lead=self.lead)
+        self.assertEqual(outreach.linkedin_content, 'LinkedIn body')
@@ -0,0 +1,94 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from ..authentication import CachedJWTAuthentication, token_version_key, user_cache_key
+
+User = get_user_model()
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.token = str(AccessToken.for_user(self.user))
+        self.authenticator = CachedJWTAuthentication()
+
+    def _authenticate(self):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        return self.authenticator.authenticate(request)
+
+    def _cached(self):
+        version = cache.get(token_version_key(self.user.pk), 0)
+        return cache.get(user_cache_key(self.user.pk, version))
+
+    def test_cache_hit_runs_no_queries(self):
+        """Test that a cached user is resolved without touching the database"""
+        with self.assertNumQueries(1):
+            user, _ = self._authenticate()
+        self.assertEqual(user.pk, self.user.pk)
+        with self.assertNumQueries(0):
+            user, _ = self._authenticate()
+        self.assertEqual(user.pk, self.user.pk)
+
+    def test_cache_hit_user(self):
+        """Test that only the checked fields are cached and the rest load on access"""
+        self._authenticate()
+        cached = self._cached()
+        self.assertEqual(set(cached), {'is_active', 'password_digest'})
+        self.assertNotIn(self.user.password, cached.values())
+
+        with self.assertNumQueries(0):
+            user, _ = self._authenticate()
+            self.assertTrue(user.is_authenticated)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.username, 'testuser')
+
+    def test_save_invalidates(self):
+        """Test that saving the user moves it to a new token version"""
+        self._authenticate()
+        version = cache.get(token_version_key(self.user.pk))
+        self.assertIsNotNone(self._cached())
+
+        self.user.set_password('newpass456')
+        self.user.save()
+        self.assertEqual(cache.get(token_version_key(self.user.pk)), version + 1)
+        self.assertIsNone(self._cached())
+
+    def test_deactivation(self):
+        """Test that a deactivated user is rejected on the next request"""
+        self._authenticate()
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self._authenticate()
+
+    def test_delete_invalidates(self):
+        """Test that deleting the user drops the cached entry"""
+        self._authenticate()
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self._authenticate()
+
+    @override_settings(AUTH_USER_CACHE_SINGLE_PROCESS=False)
+    def test_process_local_cache_unused(self):
+        """Test that a cache other workers cannot see is not used by default"""
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                self._authenticate()
+        self.assertIsNone(self._cached())
+
+    def test_api_request(self):
+        """Test that API views authenticate with the cached backend"""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        response = client.get(reverse('lead-list-create'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(self._cached())
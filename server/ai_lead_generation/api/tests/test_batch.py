@@ -0,0 +1,95 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..models import Lead
+
+User = get_user_model()
+
+class BatchLeadsViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('batch-leads')
+
+        self.lead = Lead.objects.create(
+            name='Existing Lead',
+            email='existing@example.com',
+            company='Existing Company',
+            created_by=self.user
+        )
+        self.other_lead = Lead.objects.create(
+            name='Doomed Lead',
+            email='doomed@example.com',
+            company='Doomed Company',
+            created_by=self.user
+        )
+
+    def test_mixed_batch_is_applied(self):
+        """Test creates, updates and deletes applied together"""
+        operations = [
+            {'op': 'create', 'data': {'name': 'New Lead', 'email': 'new@example.com',
+                                      'company_size': '1500', 'industry': 'tech'}},
+            {'op': 'update', 'id': self.lead.id, 'data': {'status': 'contacted'}},
+            {'op': 'delete', 'id': self.other_lead.id},
+        ]
+        response = self.client.post(self.url, {'operations': operations}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['applied'])
+        results = response.data['results']
+        self.assertEqual([r['status'] for r in results], ['created', 'updated', 'deleted'])
+
+        created = Lead.objects.get(id=results[0]['id'])
+        self.assertEqual(created.created_by, self.user)
+        self.assertEqual(created.lead_score, 60)
+        self.lead.refresh_from_db()
+        self.assertEqual(self.lead.status, 'contacted')
+        self.assertFalse(Lead.objects.filter(id=self.other_lead.id).exists())
+
+    def test_invalid_item_rolls_back_whole_batch(self):
+        """Test that one invalid operation prevents every write"""
+        operations = [
+            {'op': 'create', 'data': {'name': 'New Lead'}},
+            {'op': 'update', 'id': self.lead.id, 'data': {'status': 'not-a-status'}},
+            {'op': 'delete', 'id': 999999},
+        ]
+        response = self.client.post(self.url, {'operations': operations}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(response.data['applied'])
+        results = response.data['results']
+        self.assertNotIn('errors', results[0])
+        self.assertIn('status', results[1]['errors'])
+        self.assertIn('id', results[2]['errors'])
+        self.assertEqual(Lead.objects.count(), 2)
+
+    def test_cannot_touch_other_users_leads(self):
+        """Test that leads owned by another user are not found"""
+        other_user = User.objects.create_user(username='other', password='testpass123')
+        foreign = Lead.objects.create(name='Foreign', created_by=other_user)
+
+        response = self.client.post(
+            self.url, {'operations': [{'op': 'delete', 'id': foreign.id}]}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(Lead.objects.filter(id=foreign.id).exists())
+
+    def test_operations_must_be_a_list(self):
+        """Test that a missing operations list is rejected"""
+        response = self.client.post(self.url, {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.data)
+
+    def test_body_must_be_an_object(self):
+        """Test that a list or scalar body is rejected"""
+        for body in ([{'action': 'delete', 'id': 1}], 5):
+            response = self.client.post(self.url, body, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('error', response.data)
@@ -0,0 +1,97 @@
+import io
+import json
+import os
+import tempfile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from ..conversion_model import (
+    ModelError, load_model, predict_conversion, train_from_database
+)
+from ..models import Lead
+from ..scoring import LeadScorer
+
+User = get_user_model()
+
+MODEL_PATH = os.path.join(tempfile.mkdtemp(), 'conversion_model.json')
+
+@override_settings(CONVERSION_MODEL_PATH=MODEL_PATH)
+class ConversionModelTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        if os.path.exists(MODEL_PATH):
+            os.remove(MODEL_PATH)
+        leads = []
+        for i in range(40):
+            # Well-funded software companies convert; small retailers do not
+            converted = i % 2 == 0
+            leads.append(Lead(
+                name=f'Lead {i}',
+                industry='Software' if converted else 'Retail',
+                company_size=str(800 + i) if converted else str(10 + i),
+                funding_amount=20000000 if converted else 50000,
+                status='converted' if converted else 'unqualified',
+                created_by=self.user,
+            ))
+        leads.append(Lead(name='Open', industry='Software', company_size='900',
+                          funding_amount=15000000, status='new', created_by=self.user))
+        Lead.objects.bulk_create(leads)
+
+    def test_train_and_predict(self):
+        """Test training on outcomes and batch inference over a snapshot"""
+        model = train_from_database()
+        self.assertEqual(model.version, 1)
+        self.assertEqual(model.metrics['samples'], 40)
+        self.assertEqual(model.metrics['accuracy'], 1.0)
+        self.assertEqual(model.industries, ['retail', 'software'])
+
+        ids, probabilities = predict_conversion()
+        self.assertEqual(len(ids), 41)
+        scores = dict(zip(ids.tolist(), probabilities.tolist()))
+        open_lead = Lead.objects.get(name='Open')
+        retail = Lead.objects.filter(industry='Retail').first()
+        self.assertGreater(scores[open_lead.id], 0.9)
+        self.assertLess(scores[retail.id], 0.1)
+
+    def test_artifact_versioning(self):
+        """Test that retraining writes the next artifact version and reloads it"""
+        train_from_database()
+        with open(MODEL_PATH) as f:
+            self.assertEqual(json.load(f)['version'], 1)
+        self.assertEqual(load_model().version, 1)
+        train_from_database()
+        self.assertEqual(load_model().version, 2)
+
+    def test_not_enough_outcomes(self):
+        """Test that training refuses when too few outcomes are recorded"""
+        with self.assertRaises(ModelError):
+            train_from_database(Lead.objects.filter(status='new'))
+        with self.assertRaises(ModelError):
+            train_from_database(Lead.objects.filter(status='converted'), min_samples=5)
+
+    def test_scorer_model_mode(self):
+        """Test the scorer's model mode and its fallback to the rules"""
+        lead = Lead.objects.get(name='Open')
+        rules_score = LeadScorer().calculate_total_score(lead)
+        self.assertEqual(LeadScorer(mode='model').calculate_total_score(lead), rules_score)
+
+        train_from_database()
+        model_score = LeadScorer(mode='model').calculate_total_score(lead)
+        self.assertGreater(model_score, 0.9)
+        self.assertEqual(LeadScorer(mode='model').calculate_total_scores([lead]), [model_score])
+        with self.assertRaises(ValueError):
+            LeadScorer(mode='magic')
+
+    def test_command(self):
+        """Test the training command"""
+        out = io.StringIO()
+        call_command('train_conversion_model', '--score-all', stdout=out)
+        self.assertIn('Trained conversion model v1 on 40 leads', out.getvalue())
+        self.assertIn('leads/sec', out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('train_conversion_model', '--min-samples', '1000', stdout=io.StringIO())
@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+from decimal import Decimal
+from importlib import import_module
+from types import SimpleNamespace
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from ..models import Lead, LeadEnrichment
+
+User = get_user_model()
+
+class LeadEnrichmentTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.lead = Lead.objects.create(name='Test Lead', company='Acme', company_size='1200',
+                                        created_by=self.user)
+
+    def test_update_lead_scores_writes_enrichment(self):
+        """Test that the command stores typed enrichment instead of encoded metadata"""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write('company_name,funding_amount,industry,open_positions\n')
+            f.write('acme,15000000,SaaS,12\n')
+        try:
+            call_command('update_lead_scores', f.name, stdout=open(os.devnull, 'w'))
+        finally:
+            os.unlink(f.name)
+
+        self.lead.refresh_from_db()
+        self.assertIsNone(self.lead.metadata)
+        # Blank lead fields are filled from the CSV and scored with the standard rules
+        self.assertEqual((self.lead.funding_amount, self.lead.industry), (Decimal('15000000.00'), 'SaaS'))
+        self.assertEqual(self.lead.lead_score, 100)
+        self.assertEqual(self.lead.lead_score, self.lead.calculate_lead_score())
+        enrichment = self.lead.enrichment
+        self.assertEqual(enrichment.funding_amount, Decimal('15000000.00'))
+        self.assertEqual(enrichment.industry, 'SaaS')
+        self.assertEqual(enrichment.open_positions, 12)
+        self.assertEqual(enrichment.source, 'csv')
+
+    def test_update_lead_scores_keeps_entered_values(self):
+        """Test that the command only overwrites lead fields with --apply-to-lead"""
+        Lead.objects.filter(pk=self.lead.pk).update(funding_amount=Decimal('500000'), industry='Retail')
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write('company_name,funding_amount,industry,open_positions\n')
+            f.write('acme,15000000,SaaS,12\n')
+        try:
+            call_command('update_lead_scores', f.name, stdout=open(os.devnull, 'w'))
+            self.lead.refresh_from_db()
+            self.assertEqual((self.lead.funding_amount, self.lead.industry), (Decimal('500000.00'), 'Retail'))
+            self.assertEqual(self.lead.enrichment.industry, 'SaaS')
+
+            call_command('update_lead_scores', f.name, '--apply-to-lead', stdout=open(os.devnull, 'w'))
+            self.lead.refresh_from_db()
+            self.assertEqual((self.lead.funding_amount, self.lead.industry), (Decimal('15000000.00'), 'SaaS'))
+        finally:
+            os.unlink(f.name)
+
+    def test_convert_encoded_metadata(self):
+        """Test the migration unwraps double-encoded metadata"""
+        encoded = json.dumps({'funding_amount': 2500000.0, 'industry': 'Fintech',
+                              'open_positions': 3, 'linkedin_url': 'https://linkedin.com/in/acme'})
+        Lead.objects.filter(pk=self.lead.pk).update(metadata=encoded)
+        other = Lead.objects.create(name='Plain', metadata={'source': 'api'}, created_by=self.user)
+
+        migration = import_module('..migrations.0019_leadenrichment', __package__)
+        migration.convert_encoded_metadata(apps, SimpleNamespace(connection=connection))
+
+        self.lead.refresh_from_db()
+        self.assertEqual(self.lead.metadata, {'linkedin_url': 'https://linkedin.com/in/acme'})
+        self.assertEqual(self.lead.linkedin_url, 'https://linkedin.com/in/acme')
+        self.assertEqual(self.lead.enrichment.funding_amount, Decimal('2500000.00'))
+        self.assertEqual(self.lead.enrichment.open_positions, 3)
+        other.refresh_from_db()
+        self.assertEqual(other.metadata, {'source': 'api'})
+        self.assertFalse(LeadEnrichment.objects.filter(lead=other).exists())
+
+    def test_filter_by_enrichment(self):
+        """Test filtering the lead list on enrichment columns"""
+        LeadEnrichment.objects.create(lead=self.lead, funding_amount=5000000, source='crunchbase')
+        Lead.objects.create(name='Not Enriched', created_by=self.user)
+
+        response = self.client.get(reverse('lead-list-create'), {
+            'enrichment_source': 'crunchbase', 'min_enriched_funding': '1000000'
+        })
+        self.assertEqual([lead['name'] for lead in response.data], ['Test Lead'])
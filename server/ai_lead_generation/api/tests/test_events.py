@@ -0,0 +1,101 @@
+import asyncio
+from unittest import mock
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+from ..models import Lead, Outreach
+from ..events import InProcessBackend, event_stream
+
+User = get_user_model()
+
+class RecordingBackend:
+    def __init__(self):
+        self.events = []
+
+    def publish(self, user_id, event):
+        self.events.append((user_id, event['type'], event['data']))
+
+class InProcessBackendTests(SimpleTestCase):
+    def test_hundreds_of_subscribers_on_one_loop(self):
+        """Test that one event loop holds hundreds of open streams"""
+        backend = InProcessBackend()
+        subscribers = 500
+
+        async def scenario():
+            subscriptions = [backend.subscribe(user_id=1) for _ in range(subscribers)]
+            self.assertEqual(backend.subscriber_count(), subscribers)
+
+            # Writers publish from worker threads, as sync views do
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, backend.publish, 1, {'id': 1, 'type': 'lead.updated', 'data': {}})
+            received = await asyncio.gather(*(s.get(timeout=5) for s in subscriptions))
+
+            for subscription in subscriptions:
+                subscription.close()
+            return received
+
+        received = asyncio.run(scenario())
+        self.assertEqual(len(received), subscribers)
+        self.assertEqual(backend.subscriber_count(), 0)
+
+    def test_event_stream_frames(self):
+        """Test the SSE wire format and keepalives"""
+        backend = InProcessBackend()
+
+        async def scenario():
+            subscription = backend.subscribe(user_id=7)
+            stream = event_stream(subscription, heartbeat=0.01)
+            frames = [await stream.__anext__(), await stream.__anext__()]
+            backend.publish(7, {'id': 3, 'type': 'lead.updated', 'data': {'id': 5, 'lead_score': 90}})
+            frames.append(await stream.__anext__())
+            await stream.aclose()
+            return frames
+
+        frames = asyncio.run(scenario())
+        self.assertEqual(frames[0], 'retry: 3000\n\n')
+        self.assertEqual(frames[1], ': keepalive\n\n')
+        self.assertEqual(frames[2], 'id: 3\nevent: lead.updated\ndata: {"id":5,"lead_score":90}\n\n')
+        self.assertEqual(backend.subscriber_count(), 0)
+
+class LeadEventPublishingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.backend = RecordingBackend()
+        patcher = mock.patch('ai_lead_generation.api.events.get_backend', return_value=self.backend)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_score_and_status_changes_are_published(self):
+        """Test that score/status changes and new outreach emit events on commit"""
+        lead = Lead.objects.create(name='Lead', lead_score=10, created_by=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            lead.notes = 'unrelated edit'
+            lead.save()
+        self.assertEqual(self.backend.events, [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            lead.status = 'contacted'
+            lead.save()
+            Outreach.objects.create(lead=lead, email_content='Hi')
+        self.assertEqual([event[1] for event in self.backend.events], ['lead.updated', 'outreach.created'])
+        self.assertEqual(self.backend.events[0][2], {'id': lead.id, 'status': 'contacted', 'lead_score': 10})
+        self.assertEqual(self.backend.events[0][0], self.user.id)
+
+class LeadEventsViewTests(TestCase):
+    def test_requires_authentication(self):
+        """Test that the stream rejects anonymous clients"""
+        response = self.client.get(reverse('lead-events'))
+        self.assertEqual(response.status_code, 401)
+
+    async def test_stream_opens_with_query_token(self):
+        """Test that a token in the query string opens an event stream"""
+        user = await User.objects.acreate(username='streamer')
+        token = str(RefreshToken.for_user(user).access_token)
+
+        response = await self.async_client.get(reverse('lead-events'), {'token': token})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = response.streaming_content
+        self.assertEqual(await stream.__anext__(), b'retry: 3000\n\n')
+        await stream.aclose()
@@ -0,0 +1,69 @@
+import csv
+import gzip
+import io
+import json
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..models import Lead
+
+User = get_user_model()
+
+class ExportLeadsViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('export-leads')
+
+        Lead.objects.create(name='Tech Lead', company='Acme', industry='Technology',
+                            funding_amount=1500000, created_by=self.user)
+        Lead.objects.create(name='Retail Lead', company='Shop', industry='Retail',
+                            status='contacted', created_by=self.user)
+        other_user = User.objects.create_user(username='other', password='testpass123')
+        Lead.objects.create(name='Foreign Lead', created_by=other_user)
+
+    def _content(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_csv_export(self):
+        """Test exporting the user's leads as CSV"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+
+        rows = list(csv.DictReader(io.StringIO(self._content(response).decode('utf-8'))))
+        self.assertEqual(sorted(row['name'] for row in rows), ['Retail Lead', 'Tech Lead'])
+        tech = next(row for row in rows if row['name'] == 'Tech Lead')
+        self.assertEqual(tech['funding_amount'], '1500000.00')
+
+    def test_ndjson_export_with_filters(self):
+        """Test NDJSON export honours the list filters"""
+        response = self.client.get(self.url, {'export_format': 'ndjson', 'status': 'contacted'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        lines = self._content(response).decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])['name'], 'Retail Lead')
+
+    def test_gzip_export(self):
+        """Test gzip-compressed export decompresses to the same rows"""
+        response = self.client.get(self.url, {'export_format': 'ndjson', 'compress': 'gzip'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn('leads.ndjson.gz', response['Content-Disposition'])
+
+        lines = gzip.decompress(self._content(response)).decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 2)
+
+    def test_invalid_format(self):
+        """Test that unknown export formats are rejected"""
+        response = self.client.get(self.url, {'export_format': 'xml'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,60 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..models import Lead
+
+User = get_user_model()
+
+class LeadFacetsViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('lead-facets')
+
+        Lead.objects.create(name='A', industry='tech', lead_score=80, created_by=self.user)
+        Lead.objects.create(name='B', industry='tech', lead_score=50, status='contacted', created_by=self.user)
+        Lead.objects.create(name='C', industry='Retail', lead_score=10, created_by=self.user)
+        other_user = User.objects.create_user(username='other', password='testpass123')
+        Lead.objects.create(name='D', industry='tech', created_by=other_user)
+
+    def _counts(self, facet):
+        return {item['value']: item['count'] for item in facet}
+
+    def test_facet_counts(self):
+        """Test counts per status, industry, score band and month"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total'], 3)
+
+        facets = response.data['facets']
+        self.assertEqual(self._counts(facets['status']), {'new': 2, 'contacted': 1})
+        self.assertEqual(self._counts(facets['industry']), {'tech': 2, 'Retail': 1})
+        self.assertEqual(self._counts(facets['score_band']), {'high': 1, 'medium': 1, 'low': 1})
+        self.assertEqual(sum(self._counts(facets['created_month']).values()), 3)
+
+    def test_facets_respect_filters(self):
+        """Test that list filters narrow the facet counts"""
+        response = self.client.get(self.url, {'industry': 'tech', 'facets': 'status'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data['facets']), ['status'])
+        self.assertEqual(self._counts(response.data['facets']['status']), {'new': 1, 'contacted': 1})
+
+    def test_one_query_per_facet(self):
+        """Test that facets are computed with grouped queries, not row downloads"""
+        for _ in range(20):
+            Lead.objects.create(name='More', industry='tech', created_by=self.user)
+        # total + one grouped query per facet (auth is forced, so no user lookup)
+        with self.assertNumQueries(5):
+            self.client.get(self.url)
+
+    def test_invalid_facet(self):
+        """Test that unknown facets are rejected"""
+        response = self.client.get(self.url, {'facets': 'bogus'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
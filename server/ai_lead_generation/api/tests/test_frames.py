@@ -0,0 +1,72 @@
+import numpy as np
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from ..facets import frame_facets, lead_facets
+from ..frames import Categorical, LeadFrame
+from ..models import Lead
+from ..scoring_rules import FIT_SCORING, LEAD_SCORING
+
+User = get_user_model()
+
+class LeadFrameTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        rows = [
+            ('SaaS', '2000', 12000000, 'new'),
+            ('Retail', '50', None, 'contacted'),
+            ('SaaS', '', 600000, 'converted'),
+            ('Healthcare', '700', 3000000, 'new'),
+            ('SaaS', '2000', 12000000, 'new'),
+        ]
+        self.leads = [
+            Lead.objects.create(name=f'Lead {i}', industry=industry, company_size=size,
+                                funding_amount=funding, status=status, created_by=self.user)
+            for i, (industry, size, funding, status) in enumerate(rows)
+        ]
+        Lead.objects.filter(id=self.leads[1].id).update(lead_score=None)
+
+    def test_load_in_chunks(self):
+        """Test that columns are loaded in id-ordered chunks with compact types"""
+        with self.assertNumQueries(3):
+            frame = LeadFrame.load(chunk_size=2)
+        self.assertEqual(len(frame), 5)
+        self.assertEqual(list(frame.ids), [lead.id for lead in self.leads])
+        self.assertEqual(frame.ids.dtype, np.int64)
+
+        industry = frame['industry']
+        self.assertIsInstance(industry, Categorical)
+        self.assertEqual(industry.categories, ['SaaS', 'Retail', 'Healthcare'])
+        self.assertEqual(industry.codes.dtype, np.int32)
+        self.assertEqual(list(frame.values('industry')), ['SaaS', 'Retail', 'SaaS', 'Healthcare', 'SaaS'])
+
+        self.assertEqual(frame['funding_amount'].dtype, np.float64)
+        self.assertTrue(np.isnan(frame['funding_amount'][1]))
+        self.assertTrue(np.isnan(frame['lead_score'][1]))
+
+    def test_selected_columns_and_filter(self):
+        """Test loading chosen columns from a queryset and filtering rows"""
+        frame = LeadFrame.load(Lead.objects.filter(status='new'), columns=('status', 'created_at', 'created_by'))
+        self.assertEqual(set(frame.columns), {'id', 'status', 'created_at', 'created_by'})
+        self.assertEqual(frame['created_at'].dtype, np.dtype('datetime64[us]'))
+        self.assertEqual(list(frame['created_by']), [self.user.id] * 3)
+
+        saas = frame.filter(frame['created_by'] == self.user.id)
+        self.assertEqual(len(saas), 3)
+        self.assertEqual(saas['status'].value_counts(), [('new', 3)])
+
+    def test_score_frame_matches_rules(self):
+        """Test that scoring a frame matches scoring the lead instances"""
+        frame = LeadFrame.load()
+        for rules in (LEAD_SCORING, FIT_SCORING):
+            leads = list(Lead.objects.order_by('id'))
+            self.assertEqual(list(rules.score_frame(frame)), rules.score_many(leads))
+
+    def test_frame_facets_match_database(self):
+        """Test that in-memory facets match the database facets"""
+        frame = LeadFrame.load()
+        facets = ('status', 'industry', 'score_band')
+        self.assertEqual(frame_facets(frame, facets), lead_facets(Lead.objects.all(), facets))
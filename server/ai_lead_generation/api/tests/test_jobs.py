@@ -0,0 +1,147 @@
+from datetime import timedelta
+from unittest.mock import patch
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from ..jobs import JOB_PREPARERS, generate_outreach_chunk, requeue_stale_jobs, run_job, start_job
+from ..models import Lead, LeadDailyRollup, LeadJob, Outreach
+
+User = get_user_model()
+
+class LeadJobTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpass123'
+        )
+        self.leads = [
+            Lead.objects.create(name=f'Lead {i}', company='Acme', industry='Technology',
+                                created_by=self.user)
+            for i in range(3)
+        ]
+        self.ids = [lead.id for lead in self.leads]
+
+    def test_admin_action_starts_job(self):
+        """Test that the changelist action queues a job and links to its progress"""
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self.client.post(reverse('admin:api_lead_changelist'), {
+                'action': 'mark_selected_contacted',
+                '_selected_action': self.ids,
+            }, follow=True)
+        job = LeadJob.objects.get()
+        self.assertEqual(job.action, 'mark_contacted')
+        self.assertEqual(job.status, 'pending')
+        self.assertEqual(job.total, 3)
+        self.assertEqual(len(callbacks), 1)
+        self.assertContains(response, reverse('admin:api_leadjob_change', args=[job.pk]))
+
+        response = self.client.get(reverse('admin:api_leadjob_change', args=[job.pk]))
+        self.assertContains(response, '0/3')
+
+    def test_mark_contacted(self):
+        """Test that marking contacted updates leads and rollups in bulk"""
+        job = start_job('mark_contacted', self.ids, user=self.user)
+        run_job(job.pk, chunk_size=2)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(job.processed, 3)
+        self.assertEqual(job.progress, 100)
+        self.assertEqual(Lead.objects.filter(status='contacted', last_contacted__isnull=False).count(), 3)
+        self.assertEqual(
+            LeadDailyRollup.objects.filter(status='contacted').values_list('lead_count', flat=True).get(), 3
+        )
+
+    def test_rescore(self):
+        """Test that rescoring writes fresh scores"""
+        Lead.objects.filter(id__in=self.ids).update(lead_score=0)
+        job = start_job('rescore', self.ids)
+        run_job(job.pk)
+        self.assertEqual(set(Lead.objects.values_list('lead_score', flat=True)), {30})
+
+    @patch('groq.Groq')
+    @patch('ai_lead_generation.api.jobs.generate_llm_messages')
+    def test_generate_outreach(self, mock_generate, mock_groq):
+        """Test outreach generation bulk-inserts messages and counts failures"""
+        depth = len(connection.atomic_blocks)
+        in_transaction = []
+        replies = iter([('Email', 'LinkedIn'), Exception('LLM down'), ('Email', 'LinkedIn')])
+        mock_generate.side_effect = self._replies(depth, in_transaction, replies)
+        job = start_job('generate_outreach', self.ids)
+        run_job(job.pk, chunk_size=2)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(job.processed, 2)
+        self.assertEqual(job.failed, 1)
+        self.assertEqual(Outreach.objects.count(), 2)
+        # The LLM is never called with a transaction open
+        self.assertEqual(in_transaction, [False, False, False])
+
+    @patch('groq.Groq')
+    @patch('ai_lead_generation.api.jobs.generate_llm_messages')
+    def test_generate_outreach_chunk(self, mock_generate, mock_groq):
+        """Test the work queue handler skips leads with outreach and calls the LLM outside a transaction"""
+        Outreach.objects.create(lead=self.leads[0], email_content='Old', linkedin_content='Old')
+        depth = len(connection.atomic_blocks)
+        in_transaction = []
+        replies = iter([('Email', 'LinkedIn'), Exception('LLM down')])
+        mock_generate.side_effect = self._replies(depth, in_transaction, replies)
+
+        self.assertEqual(generate_outreach_chunk(min(self.ids), max(self.ids) + 1), [2, 1])
+        self.assertEqual(Outreach.objects.count(), 2)
+        self.assertEqual(in_transaction, [False, False])
+
+    @staticmethod
+    def _replies(depth, in_transaction, replies):
+        def reply(lead, client):
+            in_transaction.append(len(connection.atomic_blocks) > depth)
+            result = next(replies)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return reply
+
+    def test_requeue_stale_job(self):
+        """Test that a job orphaned by a restart resumes after its last recorded chunk"""
+        job = start_job('mark_contacted', self.ids)
+        fresh = start_job('rescore', self.ids)
+        stale = timezone.now() - timedelta(hours=1)
+        LeadJob.objects.filter(pk=job.pk).update(status='running', processed=2, heartbeat_at=stale)
+        LeadJob.objects.filter(pk=fresh.pk).update(status='running', heartbeat_at=timezone.now())
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.assertEqual(requeue_stale_jobs(), [job.pk])
+        self.assertEqual(len(callbacks), 1)
+        run_job(job.pk)
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed), ('done', 3))
+        self.assertEqual(list(Lead.objects.filter(status='contacted').values_list('id', flat=True)),
+                         [self.ids[2]])
+
+    def test_slow_run_stops_after_requeue(self):
+        """Test that a run whose job was requeued and reclaimed rolls back its chunk and stops"""
+        job = start_job('mark_contacted', self.ids)
+
+        def reclaim(leads, context):
+            # Another run takes the job over while this chunk is in flight
+            LeadJob.objects.filter(pk=job.pk).update(run_token='other-run')
+
+        with patch.dict(JOB_PREPARERS, {'mark_contacted': reclaim}):
+            run_job(job.pk, chunk_size=1)
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed, job.run_token), ('running', 0, 'other-run'))
+        self.assertFalse(Lead.objects.filter(status='contacted').exists())
+
+    def test_job_runs_once(self):
+        """Test that a job that is already running is not started again"""
+        job = start_job('mark_contacted', self.ids)
+        LeadJob.objects.filter(pk=job.pk).update(status='running')
+        run_job(job.pk)
+        self.assertFalse(Lead.objects.filter(status='contacted').exists())
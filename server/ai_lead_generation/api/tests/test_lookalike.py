@@ -0,0 +1,111 @@
+from unittest.mock import patch
+import numpy as np
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..frames import LeadFrame
+from ..lookalike import INDEX_COLUMNS, LeadVectorIndex, VECTOR_DIM, get_index, reset_index
+from ..models import Lead
+
+User = get_user_model()
+
+@override_settings(LOOKALIKE_REFRESH_SECONDS=0)
+class LookalikeTests(TestCase):
+    def setUp(self):
+        reset_index()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('lookalike-leads')
+        other = User.objects.create_user(username='other', password='testpass123')
+
+        def lead(name, industry, size, funding, lead_status='new', owner=self.user):
+            return Lead.objects.create(name=name, industry=industry, company_size=size,
+                                       funding_amount=funding, status=lead_status, created_by=owner)
+
+        self.won = lead('Won', 'SaaS', '800', 20000000, 'converted')
+        self.twin = lead('Twin', 'SaaS', '900', 25000000)
+        self.cousin = lead('Cousin', 'SaaS', '20', 100000)
+        self.stranger = lead('Stranger', 'Retail', '5', 0)
+        self.worked = lead('Worked', 'SaaS', '850', 20000000, 'contacted')
+        self.foreign = lead('Foreign', 'SaaS', '800', 20000000, owner=other)
+
+    def tearDown(self):
+        reset_index()
+
+    def _names(self, response):
+        return [row['name'] for row in response.data['results']]
+
+    def test_lookalikes_of_converted_leads(self):
+        """Test that unworked leads are ranked by similarity to converted ones"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['seed_count'], 1)
+        self.assertEqual(self._names(response), ['Twin', 'Cousin', 'Stranger'])
+        similarities = [row['similarity'] for row in response.data['results']]
+        self.assertEqual(similarities, sorted(similarities, reverse=True))
+        self.assertGreater(similarities[0], 0.99)
+
+        response = self.client.get(self.url, {'limit': 1, 'status': ['new', 'contacted']})
+        self.assertEqual(self._names(response), ['Worked'])
+
+    def test_explicit_seeds_and_validation(self):
+        """Test seeding the search with chosen leads and rejecting bad parameters"""
+        response = self.client.get(self.url, {'seed': [self.cousin.id, self.stranger.id]})
+        self.assertEqual(response.data['seed_count'], 2)
+        # Seeds are never returned as their own lookalikes
+        self.assertEqual(self._names(response), ['Twin'])
+        # Another user's lead cannot be a seed
+        response = self.client.get(self.url, {'seed': self.foreign.id})
+        self.assertEqual(response.data['results'], [])
+        self.assertEqual(self.client.get(self.url, {'seed': 'x'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'status': 'gone'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_incremental_refresh(self):
+        """Test that changed and deleted leads are applied without rebuilding the index"""
+        self.client.get(self.url)
+        index = get_index()
+        self.assertEqual(len(index), 6)
+        # Skip the overlap window so only the changes below are reloaded
+        index.watermark = timezone.now()
+
+        self.stranger.industry = 'SaaS'
+        self.stranger.company_size = '950'
+        self.stranger.funding_amount = 22000000
+        self.stranger.save()
+        self.twin.delete()
+        Lead.objects.create(name='Newcomer', industry='Mining', company_size='3', created_by=self.user)
+
+        with patch.object(LeadFrame, 'load', wraps=LeadFrame.load) as load:
+            response = self.client.get(self.url)
+        loaded = load.call_args[0][0]
+        self.assertEqual(sorted(loaded.values_list('name', flat=True)), ['Newcomer', 'Stranger'])
+        self.assertEqual(self._names(response), ['Stranger', 'Cousin', 'Newcomer'])
+        self.assertIs(get_index(), index)
+        self.assertEqual(len(index), 6)
+
+    def test_top_k_matches_full_sort(self):
+        """Test that partial selection returns the same top K as a full sort"""
+        rng = np.random.default_rng(7)
+        index = LeadVectorIndex()
+        index.upsert(LeadFrame.load(columns=INDEX_COLUMNS))
+        vectors = rng.random((3000, VECTOR_DIM), dtype=np.float32)
+        with index._lock:
+            index._grow(3000)
+            index.vectors[:3000] = vectors / np.linalg.norm(vectors, axis=1)[:, None]
+            index.ids[:3000] = np.arange(1, 3001)
+            index.owners[:3000] = 99
+            index.statuses[:3000] = index._status_code('new')
+            index.alive[:3000] = True
+            index._size = 3000
+            index._blocks.clear()
+        query = index.vectors[0]
+        expected = np.argsort(-(index.vectors[:3000] @ query), kind='stable')[:10] + 1
+        self.assertEqual([lead_id for lead_id, _ in index.search(99, query, k=10)], expected.tolist())
@@ -0,0 +1,70 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..models import Lead
+from ..search import search_leads
+from ..services import LeadAutomationService
+
+User = get_user_model()
+
+class PromotedMetadataTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.lead = Lead.objects.create(
+            name='Mary Jones', company='Acme', created_by=self.user,
+            metadata={'linkedin_url': 'https://linkedin.com/in/maryjones',
+                      'source': 'csv', 'domain': 'Acme.COM'}
+        )
+
+    def test_save_promotes_metadata(self):
+        """Test that saving copies metadata keys into their columns"""
+        self.assertEqual(self.lead.linkedin_url, 'https://linkedin.com/in/maryjones')
+        self.assertEqual(self.lead.source, 'csv')
+        self.assertEqual(self.lead.domain, 'acme.com')
+
+        self.lead.metadata = {'source': 'api'}
+        self.lead.save(update_fields=['metadata'])
+        self.lead.refresh_from_db()
+        self.assertEqual(self.lead.source, 'api')
+        self.assertEqual(self.lead.linkedin_url, '')
+
+    def test_batch_promotes_metadata(self):
+        """Test that the bulk batch paths keep the columns in sync"""
+        applied, results = LeadAutomationService().apply_lead_batch([
+            {'op': 'create', 'data': {'name': 'New', 'metadata': {'source': 'batch'}}},
+            {'op': 'update', 'id': self.lead.id, 'data': {'metadata': {'domain': 'initech.com'}}},
+        ], self.user)
+        self.assertTrue(applied)
+        self.assertEqual(Lead.objects.get(id=results[0]['id']).source, 'batch')
+        self.lead.refresh_from_db()
+        self.assertEqual(self.lead.domain, 'initech.com')
+        self.assertEqual(self.lead.source, '')
+
+    def test_api_filters_and_search(self):
+        """Test filtering and searching on the promoted columns"""
+        Lead.objects.create(name='Other', created_by=self.user, metadata={'source': 'manual'})
+
+        response = self.client.get(reverse('lead-list-create'), {'domain': 'ACME.com'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([lead['name'] for lead in response.data], ['Mary Jones'])
+        self.assertEqual(response.data[0]['linkedin_url'], 'https://linkedin.com/in/maryjones')
+
+        response = self.client.get(reverse('lead-list-create'), {'source': 'manual'})
+        self.assertEqual([lead['name'] for lead in response.data], ['Other'])
+
+        self.assertEqual(list(search_leads(Lead.objects.all(), 'maryjones')), [self.lead])
+
+    def test_admin_search(self):
+        """Test that the admin searches the LinkedIn URL column"""
+        admin = User.objects.create_superuser(username='admin', password='adminpass123')
+        self.client.force_login(admin)
+        response = self.client.get(reverse('admin:api_lead_changelist'), {'q': 'maryjones'})
+        self.assertContains(response, 'Mary Jones')
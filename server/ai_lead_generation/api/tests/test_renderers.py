@@ -0,0 +1,128 @@
+import asyncio
+import gzip
+import json
+from decimal import Decimal
+from django.test import TestCase, RequestFactory, override_settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..middleware import CompressionMiddleware, brotli, choose_encoding
+from ..models import Lead
+from ..renderers import FastJSONParser, FastJSONRenderer
+from ..serializers import LeadSerializer
+
+User = get_user_model()
+
+class FastJSONRendererTests(TestCase):
+    def test_matches_json_renderer(self):
+        """Test Decimal, datetime and unicode output matches DRF's JSONRenderer"""
+        data = {
+            'amount': Decimal('1500000.50'),
+            'created_at': timezone.now(),
+            'name': 'Caf\u00e9\u2028Lead',
+            1: 'int key',
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_serialized_lead(self):
+        """Test a serialized lead renders identically"""
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        lead = Lead.objects.create(name='Test Lead', funding_amount=1500000,
+                                   metadata={'source': 'csv'}, created_by=user)
+        data = LeadSerializer(lead).data
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_parser(self):
+        """Test the parser decodes JSON and rejects malformed input"""
+        from io import BytesIO
+        from rest_framework.exceptions import ParseError
+
+        parser = FastJSONParser()
+        self.assertEqual(parser.parse(BytesIO(b'{"name": "Lead"}')), {'name': 'Lead'})
+        with self.assertRaises(ParseError):
+            parser.parse(BytesIO(b'{"name": '))
+
+
+class CompressionMiddlewareTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.body = json.dumps([{'name': f'Lead {i}'} for i in range(200)]).encode('utf-8')
+
+    def _process(self, response, accept_encoding='gzip'):
+        request = self.factory.get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda r: response)(request)
+
+    def test_choose_encoding(self):
+        """Test Accept-Encoding negotiation honours q-values"""
+        self.assertEqual(choose_encoding('gzip'), 'gzip')
+        self.assertIsNone(choose_encoding('identity'))
+        self.assertIsNone(choose_encoding('gzip;q=0'))
+        self.assertEqual(choose_encoding('br;q=0.5, gzip'), 'gzip')
+        if brotli is not None:
+            self.assertEqual(choose_encoding('gzip, br'), 'br')
+
+    def test_gzip_above_threshold(self):
+        """Test large JSON responses are gzipped"""
+        response = self._process(HttpResponse(self.body, content_type='application/json'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), self.body)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    @override_settings(API_COMPRESSION_MIN_SIZE=10 ** 6)
+    def test_below_threshold(self):
+        """Test small responses are sent uncompressed"""
+        response = self._process(HttpResponse(self.body, content_type='application/json'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, self.body)
+
+    def test_html_untouched(self):
+        """Test HTML pages, which may hold CSRF tokens, are never compressed"""
+        body = b'<html>' + self.body + b'</html>'
+        response = self._process(HttpResponse(body, content_type='text/html; charset=utf-8'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, body)
+
+    def test_streaming_untouched(self):
+        """Test streaming responses are passed through"""
+        response = self._process(StreamingHttpResponse(iter([self.body]), content_type='text/csv'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_async_chain(self):
+        """Test the middleware runs natively in an async chain without buffering streams"""
+        async def get_response(request):
+            return HttpResponse(self.body, content_type='application/json')
+
+        middleware = CompressionMiddleware(get_response)
+        self.assertTrue(CompressionMiddleware.async_capable)
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+        request = self.factory.get('/', HTTP_ACCEPT_ENCODING='gzip')
+        response = asyncio.run(middleware(request))
+        self.assertEqual(gzip.decompress(response.content), self.body)
+
+        async def events():
+            yield b'data: {}\n\n'
+
+        async def get_stream(request):
+            return StreamingHttpResponse(events(), content_type='text/event-stream')
+
+        response = asyncio.run(CompressionMiddleware(get_stream)(request))
+        self.assertTrue(response.is_async)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_api_response_compressed(self):
+        """Test API list responses are compressed end to end"""
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        Lead.objects.bulk_create([
+            Lead(name=f'Lead {i}', company='Acme', created_by=user) for i in range(30)
+        ])
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.get(reverse('lead-list-create'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))), 30)
@@ -0,0 +1,80 @@
+import io
+import json
+import os
+import tempfile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from ..models import Lead
+from ..rescoring import id_chunks, rescore_chunk
+from ..scoring import SCORE_VERSION
+
+User = get_user_model()
+
+class RescoreLeadsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.leads = [
+            Lead.objects.create(name=f'Lead {i}', industry='Technology', created_by=self.user)
+            for i in range(5)
+        ]
+        # Simulate scores written under older rules
+        Lead.objects.update(lead_score=0, score_version=SCORE_VERSION - 1)
+        self.checkpoint = os.path.join(tempfile.mkdtemp(), 'rescore.json')
+
+    def _call(self, *args):
+        out = io.StringIO()
+        call_command('rescore_leads', '--workers', '1', '--checkpoint', self.checkpoint, *args, stdout=out)
+        return out.getvalue()
+
+    def test_id_chunks(self):
+        """Test that chunks cover the id range without overlap"""
+        chunks = id_chunks(Lead.objects.all(), 2)
+        ids = [lead.id for lead in self.leads]
+        self.assertEqual(chunks[0][0], ids[0])
+        self.assertEqual(chunks[-1][1], ids[-1] + 1)
+        self.assertEqual(len(chunks), 3)
+
+    def test_rescore_chunk(self):
+        """Test rescoring one chunk writes only the leads that changed"""
+        first = self.leads[0].id
+        scanned, updated = rescore_chunk(first, first + 2)
+        self.assertEqual((scanned, updated), (2, 2))
+        self.assertEqual(rescore_chunk(first, first + 2, stale_only=True), (0, 0))
+        self.assertEqual(Lead.objects.get(id=first).lead_score, 30)
+
+    def test_command_rescores_everything(self):
+        """Test the command rescores all leads and reports throughput"""
+        output = self._call('--chunk-size', '2')
+        self.assertIn('leads/sec', output)
+        self.assertEqual(set(Lead.objects.values_list('lead_score', flat=True)), {30})
+        self.assertEqual(set(Lead.objects.values_list('score_version', flat=True)), {SCORE_VERSION})
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_resume_from_checkpoint(self):
+        """Test that chunks recorded in the checkpoint are skipped"""
+        first_chunk = id_chunks(Lead.objects.all(), 2)[0]
+        with open(self.checkpoint, 'w') as f:
+            json.dump({
+                'params': {'chunk_size': 2, 'stale_only': False, 'score_version': SCORE_VERSION},
+                'done': [list(first_chunk)],
+            }, f)
+
+        output = self._call('--chunk-size', '2')
+        self.assertIn('Resuming', output)
+        scores = dict(Lead.objects.values_list('id', 'lead_score'))
+        self.assertEqual([scores[lead.id] for lead in self.leads], [0, 0, 30, 30, 30])
+
+    def test_checkpoint_mismatch(self):
+        """Test that a checkpoint from different options is rejected"""
+        with open(self.checkpoint, 'w') as f:
+            json.dump({'params': {'chunk_size': 99}, 'done': []}, f)
+        with self.assertRaises(CommandError):
+            self._call('--chunk-size', '2')
+        self._call('--chunk-size', '2', '--restart')
+        self.assertEqual(set(Lead.objects.values_list('lead_score', flat=True)), {30})
@@ -0,0 +1,83 @@
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..models import Lead, LeadDailyRollup
+from ..rollups import dashboard_summary
+from ..services import LeadAutomationService
+
+User = get_user_model()
+
+class LeadRollupTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('dashboard-summary')
+
+        self.high = Lead.objects.create(name='High', lead_score=80, created_by=self.user)
+        self.low = Lead.objects.create(name='Low', lead_score=20, created_by=self.user)
+
+    def _snapshot(self):
+        return sorted(
+            LeadDailyRollup.objects.filter(lead_count__gt=0).values_list(
+                'user_id', 'day', 'status', 'score_band', 'lead_count', 'scored_count', 'score_sum'
+            )
+        )
+
+    def test_rollups_follow_lead_writes(self):
+        """Test that creates, updates and deletes adjust the rollups"""
+        summary = dashboard_summary(self.user)
+        self.assertEqual(summary['total_leads'], 2)
+        self.assertEqual(summary['average_score'], 50)
+        self.assertEqual(summary['by_score_band'], {'high': 1, 'low': 1})
+
+        self.low.status = 'converted'
+        self.low.save()
+        summary = dashboard_summary(self.user)
+        self.assertEqual(summary['by_status'], {'new': 1, 'converted': 1})
+        self.assertEqual(summary['converted'], 1)
+        self.assertEqual(summary['conversion_rate'], 0.5)
+
+        self.high.delete()
+        summary = dashboard_summary(self.user)
+        self.assertEqual(summary['total_leads'], 1)
+        self.assertEqual(summary['average_score'], 20)
+
+    def test_reloaded_instance_updates_rollups_once(self):
+        """Test that saving a freshly loaded lead moves it between buckets"""
+        lead = Lead.objects.get(pk=self.high.pk)
+        lead.status = 'qualified'
+        lead.save()
+        lead.save()
+        self.assertEqual(dashboard_summary(self.user)['by_status'], {'new': 1, 'qualified': 1})
+
+    def test_batch_path_matches_rebuild(self):
+        """Test that incremental batch updates equal a full rebuild"""
+        service = LeadAutomationService()
+        applied, _ = service.apply_lead_batch([
+            {'op': 'create', 'data': {'name': 'Tech', 'industry': 'tech', 'company_size': '2000'}},
+            {'op': 'update', 'id': self.high.id, 'data': {'status': 'contacted'}},
+            {'op': 'delete', 'id': self.low.id},
+        ], self.user)
+        self.assertTrue(applied)
+
+        incremental = self._snapshot()
+        call_command('rebuild_rollups', stdout=open('/dev/null', 'w'))
+        self.assertEqual(incremental, self._snapshot())
+
+    def test_summary_endpoint_query_count_is_constant(self):
+        """Test that the summary cost does not grow with the number of leads"""
+        for i in range(30):
+            Lead.objects.create(name=f'Lead {i}', lead_score=i, created_by=self.user)
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_leads'], 32)
+        self.assertEqual(response.data['daily'][-1]['count'], 32)
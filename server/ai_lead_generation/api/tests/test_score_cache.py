@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from ..models import Lead
+from ..score_cache import ScoreCache, get_score_cache
+from ..scoring_rules import FIT_SCORE_RULES, FIT_SCORING, LEAD_SCORING, compile_rules
+from ..services import LeadAutomationService
+
+User = get_user_model()
+
+def features(company_size='500', funding_amount=1000000, industry='SaaS'):
+    return SimpleNamespace(company_size=company_size, funding_amount=funding_amount, industry=industry)
+
+class ScoreCacheTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.cache = ScoreCache(max_entries=2)
+        get_score_cache().clear()
+
+    def test_hits_and_ratio(self):
+        """Test that repeated feature tuples are served from the cache"""
+        with patch.object(LEAD_SCORING, 'score', wraps=LEAD_SCORING.score) as score:
+            first = self.cache.score(LEAD_SCORING, features())
+            # Equal amounts in another type share the entry
+            second = self.cache.score(LEAD_SCORING, features(funding_amount='1000000'))
+            third = self.cache.score(LEAD_SCORING, features(funding_amount=1000000.0))
+        self.assertEqual(first, third)
+        self.assertEqual(score.call_count, 2)
+        self.assertEqual(second, first)
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 2))
+        self.assertEqual(stats['hit_ratio'], 0.3333)
+
+    def test_lru_eviction(self):
+        """Test that the cache stays within its cap, evicting the least recently used entry"""
+        a, b, c = features('10'), features('600'), features('2000')
+        for lead in (a, b, a, c):
+            self.cache.score(LEAD_SCORING, lead)
+        self.assertEqual(self.cache.stats()['size'], 2)
+        self.cache.score(LEAD_SCORING, a)
+        self.cache.score(LEAD_SCORING, b)
+        self.assertEqual(self.cache.stats()['misses'], 4)
+
+    def test_rule_version_in_key(self):
+        """Test that a new rule version never reuses old scores"""
+        bumped = compile_rules(dict(FIT_SCORE_RULES, version=FIT_SCORE_RULES['version'] + 1,
+                                    weights={'company_size': 1, 'funding': 0, 'industry': 0}))
+        self.assertEqual(self.cache.score(FIT_SCORING, features()), 0.79)
+        self.assertEqual(self.cache.score(bumped, features()), 0.8)
+
+    def test_score_many_dedupes(self):
+        """Test that bulk scoring computes each distinct tuple once"""
+        leads = [features(), features(industry='Mining'), features(), features()]
+        with patch.object(FIT_SCORING, 'score_many', wraps=FIT_SCORING.score_many) as score_many:
+            scores = self.cache.score_many(FIT_SCORING, leads)
+        self.assertEqual(scores, [FIT_SCORING.score(lead) for lead in leads])
+        self.assertEqual(len(score_many.call_args[0][0]), 2)
+        self.assertEqual(self.cache.stats()['hits'], 2)
+
+    def test_process_and_import_use_cache(self):
+        """Test that process_all_leads and imports reuse cached scores"""
+        service = LeadAutomationService()
+        service.import_leads_from_csv([
+            {'name': f'Contact {i}', 'company': 'Acme', 'industry': 'SaaS',
+             'company_size': '600', 'funding_amount': '2000000'}
+            for i in range(5)
+        ], self.user)
+        self.assertEqual(get_score_cache().stats()['hits'], 4)
+        result = service.process_all_leads()
+        self.assertEqual({lead['score'] for lead in result['processed']}, {0.79})
+        self.assertEqual(get_score_cache().stats()['hits'], 8)
+
+    @override_settings(SCORE_CACHE_MAX_ENTRIES=0)
+    def test_disabled(self):
+        """Test that a zero cap disables caching"""
+        cache = ScoreCache(max_entries=0)
+        cache.score(LEAD_SCORING, features())
+        self.assertEqual(cache.stats()['size'], 0)
+        self.assertEqual(cache.score_many(LEAD_SCORING, [features()]), [LEAD_SCORING.score(features())])
@@ -0,0 +1,74 @@
+from unittest.mock import patch
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from ..models import Lead
+from ..scoring import SCORE_VERSION, score_inputs_hash, stale_score_filter
+from ..services import LeadAutomationService
+
+User = get_user_model()
+
+class ScoreTrackingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.lead = Lead.objects.create(name='Test Lead', industry='Retail', company_size='50',
+                                        funding_amount=1500000, created_by=self.user)
+
+    def test_new_lead_is_scored(self):
+        """Test that a new lead records its score inputs and version"""
+        self.assertEqual(self.lead.lead_score, 20)
+        self.assertEqual(self.lead.score_version, SCORE_VERSION)
+        self.assertEqual(self.lead.score_inputs_hash, score_inputs_hash(self.lead))
+
+    def test_input_change_rescores(self):
+        """Test that changing a scoring input recomputes a stale score"""
+        lead = Lead.objects.get(pk=self.lead.pk)
+        lead.industry = 'Technology'
+        lead.save()
+        lead.refresh_from_db()
+        self.assertEqual(lead.lead_score, 50)
+
+    def test_unrelated_change_skips_scoring(self):
+        """Test that saving without input changes does not recompute"""
+        lead = Lead.objects.get(pk=self.lead.pk)
+        lead.notes = 'Called twice'
+        with patch.object(Lead, 'calculate_lead_score') as calculate:
+            lead.save()
+        calculate.assert_not_called()
+
+    def test_update_fields_include_score(self):
+        """Test that a partial save writes the recomputed score"""
+        lead = Lead.objects.get(pk=self.lead.pk)
+        lead.company_size = '2000'
+        lead.save(update_fields=['company_size'])
+        lead.refresh_from_db()
+        self.assertEqual(lead.lead_score, 50)
+
+    def test_assigned_score_is_kept(self):
+        """Test that an explicitly assigned score is not overwritten"""
+        lead = Lead.objects.get(pk=self.lead.pk)
+        lead.lead_score = 77
+        lead.save()
+        lead.refresh_from_db()
+        self.assertEqual(lead.lead_score, 77)
+        self.assertEqual(lead.score_version, SCORE_VERSION)
+
+    def test_stale_filter(self):
+        """Test that leads scored under older rules are found by query"""
+        fresh = Lead.objects.create(name='Fresh', created_by=self.user)
+        Lead.objects.filter(pk=self.lead.pk).update(score_version=SCORE_VERSION - 1)
+        self.assertEqual(list(Lead.objects.filter(stale_score_filter())), [self.lead])
+        self.assertNotIn(fresh, Lead.objects.filter(stale_score_filter()))
+
+    def test_batch_update_rescores(self):
+        """Test that the bulk batch path rescores changed inputs"""
+        applied, _ = LeadAutomationService().apply_lead_batch([
+            {'op': 'update', 'id': self.lead.id, 'data': {'industry': 'SaaS'}},
+        ], self.user)
+        self.assertTrue(applied)
+        self.lead.refresh_from_db()
+        self.assertEqual(self.lead.lead_score, 50)
+        self.assertEqual(self.lead.score_inputs_hash, score_inputs_hash(self.lead))
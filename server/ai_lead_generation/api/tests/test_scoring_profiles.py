@@ -0,0 +1,113 @@
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..jobs import run_job
+from ..rescoring import rescore_chunk
+from ..models import Lead, LeadJob, ScoringProfile
+from ..scoring import LeadScorer, stale_score_filter
+from ..scoring_profiles import rules_for_user
+from ..scoring_rules import LEAD_SCORING, compile_rules
+
+User = get_user_model()
+
+class ScoringProfileTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(username='other', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('scoring-profile')
+        self.lead = Lead.objects.create(name='Clinic', industry='Healthcare', company_size='2000',
+                                        created_by=self.user)
+        self.foreign = Lead.objects.create(name='Other', industry='Healthcare', company_size='2000',
+                                           created_by=self.other)
+
+    def tearDown(self):
+        # Profile lookups are cached per user id, which later tests reuse
+        cache.clear()
+
+    def test_default_profile(self):
+        """Test that users without a profile get the default rules"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['weights'], {})
+        self.assertIs(rules_for_user(self.user.id), LEAD_SCORING)
+        self.assertFalse(ScoringProfile.objects.exists())
+
+    def test_update_rescores_only_own_leads(self):
+        """Test that saving a profile rescores the owner's leads in a background job"""
+        self.assertEqual(self.lead.lead_score, 30)
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.put(self.url, {
+                'name': 'Healthcare team',
+                'weights': {'industry': 2},
+                'target_industries': ['Healthcare'],
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(callbacks), 1)
+
+        job = LeadJob.objects.get()
+        self.assertEqual((job.action, job.lead_ids), ('rescore', [self.lead.id]))
+        run_job(job.id)
+
+        self.lead.refresh_from_db()
+        self.foreign.refresh_from_db()
+        self.assertEqual(self.lead.lead_score, 90)
+        self.assertEqual(self.foreign.lead_score, 30)
+
+    def test_profile_compiled_once_per_version(self):
+        """Test that rules are compiled once per profile version"""
+        profile = ScoringProfile.objects.create(user=self.user, weights={'company_size': 3})
+        with patch('ai_lead_generation.api.scoring_profiles.compile_rules', wraps=compile_rules) as compiled:
+            first = rules_for_user(self.user.id)
+            self.assertIs(rules_for_user(self.user.id), first)
+            self.assertEqual(compiled.call_count, 1)
+
+            profile.weights = {'company_size': 1}
+            profile.save()
+            self.assertEqual(profile.version, 2)
+            second = rules_for_user(self.user.id)
+            self.assertIsNot(second, first)
+            self.assertEqual(compiled.call_count, 2)
+        self.assertEqual(Lead(company_size='2000', created_by=self.user).calculate_lead_score(), 30)
+
+    def test_invalid_profile(self):
+        """Test that unknown factors and malformed tiers are rejected"""
+        response = self.client.patch(self.url, {'weights': {'colour': 1}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.patch(self.url, {'funding_tiers': [[1000000]]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ScoringProfile.objects.exists())
+
+    def test_scorer_target_industry(self):
+        """Test that LeadScorer honours its target industry"""
+        lead = Lead(industry='Mining')
+        self.assertEqual(LeadScorer().calculate_industry_score(lead), 0.5)
+        self.assertEqual(LeadScorer(target_industry='Mining').calculate_industry_score(lead), 1.0)
+        self.assertEqual(LeadScorer(target_industry=['Energy', 'Mining']).calculate_industry_score(lead), 1.0)
+
+    def test_profile_edit_marks_leads_stale(self):
+        """Test that leads scored under an older profile version are found by the stale query"""
+        bounds = (self.lead.id, self.foreign.id + 1)
+        self.assertEqual(rescore_chunk(*bounds), (0, 0))
+        with self.captureOnCommitCallbacks(execute=False):
+            # The rescore job never runs, e.g. because the process died
+            profile = ScoringProfile.objects.create(user=self.user, weights={'industry': 2},
+                                                    target_industries=['Healthcare'])
+        self.assertEqual(list(Lead.objects.filter(stale_score_filter())), [self.lead])
+
+        self.assertEqual(rescore_chunk(*bounds, stale_only=True), (1, 1))
+        self.lead.refresh_from_db()
+        self.assertEqual((self.lead.lead_score, self.lead.score_profile), (90, f'{profile.id}:1'))
+        self.assertFalse(Lead.objects.filter(stale_score_filter()).exists())
+        # A full run compares each lead with its own rules, so nothing is reloaded
+        self.assertEqual(rescore_chunk(*bounds), (0, 0))
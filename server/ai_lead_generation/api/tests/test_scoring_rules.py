@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from ..models import Lead
+from ..scoring_rules import (
+    FIT_SCORE_RULES, FIT_SCORING, LEAD_SCORE_RULES, LEAD_SCORING, compile_rules
+)
+
+User = get_user_model()
+
+CASES = [
+    {'company_size': '5000', 'funding_amount': 50000000, 'industry': 'Technology'},
+    {'company_size': '1000', 'funding_amount': 10000000, 'industry': 'SaaS'},
+    {'company_size': '1001', 'funding_amount': 10000001, 'industry': 'IT'},
+    {'company_size': '500', 'funding_amount': 500000, 'industry': 'Fintech Services'},
+    {'company_size': ' 120 ', 'funding_amount': 100000, 'industry': 'Healthcare'},
+    {'company_size': '50', 'funding_amount': 99999, 'industry': 'software'},
+    {'company_size': 'invalid', 'funding_amount': None, 'industry': 'Mining'},
+    {'company_size': '1200.5', 'funding_amount': 0, 'industry': ''},
+    {'company_size': '', 'funding_amount': 7500000, 'industry': 'Machine Learning'},
+    # Beyond 32- and 64-bit integer range
+    {'company_size': '98765432109876543210', 'funding_amount': 1, 'industry': 'AI'},
+]
+
+
+class ScoringRulesTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.leads = [
+            Lead.objects.create(name=f'Lead {i}', created_by=self.user, **case)
+            for i, case in enumerate(CASES)
+        ]
+
+    def test_lead_score_tiers(self):
+        """Test the stored score keeps its strict tiers and exact industry match"""
+        score = LEAD_SCORING.score
+        self.assertEqual(score(SimpleNamespace(**CASES[0])), 100)
+        self.assertEqual(score(SimpleNamespace(**CASES[1])), 20 + 30 + 30)
+        self.assertEqual(score(SimpleNamespace(**CASES[3])), 10)
+        self.assertEqual(score(SimpleNamespace(**CASES[6])), 0)
+
+    def test_fit_score_tiers(self):
+        """Test the fit score keeps its inclusive tiers and substring industry match"""
+        self.assertEqual(FIT_SCORING.factor_score('company_size', '1000'), 1.0)
+        self.assertEqual(FIT_SCORING.factor_score('company_size', '49'), 0.1)
+        self.assertEqual(FIT_SCORING.factor_score('funding', '100000'), 0.2)
+        self.assertEqual(FIT_SCORING.factor_score('funding', 'invalid'), 0.1)
+        self.assertEqual(FIT_SCORING.factor_score('industry', 'Fintech Services'), 1.0)
+        self.assertEqual(FIT_SCORING.factor_score('industry', 'Manufacturing'), 0.8)
+        self.assertEqual(FIT_SCORING.score(SimpleNamespace(**CASES[0])), 1.0)
+
+    def test_industry_keyword_priority(self):
+        """Test that overlapping keywords resolve to the highest-priority group"""
+        industry = FIT_SCORING.factors['industry']
+        # "retail" is a medium keyword but also contains "ai"
+        self.assertEqual(industry.score('Retail'), 1.0)
+        self.assertEqual(industry.score('Finance'), 0.8)
+        self.assertEqual(industry.score('Mining'), 0.5)
+        self.assertEqual(industry.score(None), 0.5)
+        self.assertEqual(LEAD_SCORING.factors['industry'].score('Tech'), 30)
+        self.assertEqual(LEAD_SCORING.factors['industry'].score('Fintech'), 0)
+
+    def test_industry_distinct_table(self):
+        """Test that bulk scoring classifies each distinct industry once"""
+        industry = compile_rules(FIT_SCORE_RULES).factors['industry']
+        values = ['SaaS', 'Mining', 'SaaS', 'Healthcare', 'Mining', 'SaaS']
+        with patch.object(industry, '_classify', wraps=industry._classify) as classify:
+            distinct, codes, scores = industry.distinct_table(values)
+            self.assertEqual(list(scores[codes]), [1.0, 0.5, 1.0, 0.8, 0.5, 1.0])
+            industry.score('SaaS')
+        self.assertEqual(distinct, ['SaaS', 'Mining', 'Healthcare'])
+        self.assertEqual(list(codes), [0, 1, 0, 2, 1, 0])
+        self.assertEqual(classify.call_count, 3)
+
+    def test_vectorized_matches_python(self):
+        """Test that scoring a column batch matches scoring leads one by one"""
+        for rules in (LEAD_SCORING, FIT_SCORING):
+            self.assertEqual(rules.score_many(self.leads), [rules.score(lead) for lead in self.leads])
+        self.assertEqual(LEAD_SCORING.score_many([]), [])
+
+    def test_sql_matches_python(self):
+        """Test that the database expression matches the Python scores"""
+        for rules in (LEAD_SCORING, FIT_SCORING):
+            rows = dict(Lead.objects.annotate(rule_score=rules.expression()).values_list('id', 'rule_score'))
+            for lead in self.leads:
+                self.assertAlmostEqual(rows[lead.id], rules.score(lead), places=6)
+
+    def test_model_uses_rules(self):
+        """Test that saved leads are scored by the compiled rules"""
+        for lead in self.leads:
+            self.assertEqual(lead.lead_score, LEAD_SCORING.score(lead))
+
+    def test_compile_custom_rules(self):
+        """Test compiling a modified rule set"""
+        rules = dict(LEAD_SCORE_RULES, weights={'company_size': 2, 'funding': 1, 'industry': 0})
+        compiled = compile_rules(rules)
+        self.assertEqual(compiled.score(SimpleNamespace(**CASES[2])), 100)
+        self.assertEqual(compiled.score(SimpleNamespace(**CASES[3])), 20)
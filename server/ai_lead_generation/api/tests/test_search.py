@@ -0,0 +1,98 @@
+from unittest.mock import patch
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from .. import models
+from ..models import Lead
+from ..search import search_leads
+from ..services import LeadAutomationService
+
+User = get_user_model()
+
+class LeadSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('search-leads')
+
+        self.acme = Lead.objects.create(
+            name='Jane Smith', company='Acme Robotics', industry='Technology',
+            email='jane@acme.io', lead_score=40, created_by=self.user
+        )
+        self.acme_big = Lead.objects.create(
+            name='John Brown', company='Acme Holdings', industry='Finance',
+            email='john@acmeholdings.com', lead_score=90, created_by=self.user
+        )
+        self.other = Lead.objects.create(
+            name='Mary Jones', company='Globex', industry='Retail',
+            metadata={'linkedin_url': 'https://linkedin.com/in/maryjones'},
+            created_by=self.user
+        )
+
+    def test_search_matches_indexed_columns(self):
+        """Test that search finds leads by company, name and metadata"""
+        companies = [lead.company for lead in search_leads(Lead.objects.all(), 'acme')]
+        self.assertEqual(sorted(companies), ['Acme Holdings', 'Acme Robotics'])
+        self.assertEqual(list(search_leads(Lead.objects.all(), 'maryjones')), [self.other])
+
+    def test_index_follows_updates_and_deletes(self):
+        """Test that save and delete keep the index in sync"""
+        self.other.company = 'Initech'
+        self.other.save()
+        self.assertEqual(list(search_leads(Lead.objects.all(), 'initech')), [self.other])
+        self.assertFalse(search_leads(Lead.objects.all(), 'globex').exists())
+
+        self.other.delete()
+        self.assertFalse(search_leads(Lead.objects.all(), 'initech').exists())
+
+    def test_save_reindexes_only_search_fields(self):
+        """Test that a save limited to non-search fields leaves the index alone"""
+        with patch.object(models, 'index_leads') as index_leads:
+            self.other.status = 'contacted'
+            self.other.save(update_fields=['status'])
+            index_leads.assert_not_called()
+
+            self.other.company = 'Initech'
+            self.other.save(update_fields=['company'])
+            index_leads.assert_called_once_with([self.other.pk])
+
+    def test_fallback_vendor_annotates_rank(self):
+        """Test that databases without a full-text index still annotate search_rank"""
+        with patch('ai_lead_generation.api.search._vendor', return_value='mysql'):
+            results = list(search_leads(Lead.objects.all(), 'acme'))
+        self.assertEqual(len(results), 2)
+        self.assertEqual({lead.search_rank for lead in results}, {0.0})
+
+    def test_bulk_paths_are_indexed(self):
+        """Test that leads written through the batch path are searchable"""
+        service = LeadAutomationService()
+        applied, results = service.apply_lead_batch([
+            {'op': 'create', 'data': {'name': 'Bulk Lead', 'company': 'Umbrella'}},
+            {'op': 'update', 'id': self.acme.id, 'data': {'company': 'Wayne Enterprises'}},
+        ], self.user)
+        self.assertTrue(applied)
+        self.assertEqual(search_leads(Lead.objects.all(), 'umbrella').count(), 1)
+        self.assertEqual(list(search_leads(Lead.objects.all(), 'wayne')), [self.acme])
+
+    def test_search_endpoint(self):
+        """Test the search endpoint returns ranked results for the user"""
+        other_user = User.objects.create_user(username='other', password='testpass123')
+        Lead.objects.create(name='Hidden', company='Acme Secret', created_by=other_user)
+
+        response = self.client.get(self.url, {'q': 'acme'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertIn('search_rank', response.data['results'][0])
+        self.assertNotIn('search_vector', response.data['results'][0])
+
+    def test_search_endpoint_requires_query(self):
+        """Test that an empty query is rejected"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
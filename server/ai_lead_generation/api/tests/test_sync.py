@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+from unittest import mock
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..models import Lead, LeadDeletion
+from ..sync import encode_token, prune_deletions
+
+User = get_user_model()
+
+class LeadChangesViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('lead-changes')
+
+        self.first = Lead.objects.create(name='First', created_by=self.user)
+        self.second = Lead.objects.create(name='Second', created_by=self.user)
+
+    def _later(self, seconds=10):
+        """Patch the clock so earlier writes fall outside the safety window"""
+        return mock.patch(
+            'django.utils.timezone.now',
+            return_value=timezone.now() + timedelta(seconds=seconds)
+        )
+
+    def test_initial_sync_returns_everything(self):
+        """Test that a request without a token returns every lead"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({lead['name'] for lead in response.data['changed']}, {'First', 'Second'})
+        self.assertEqual(response.data['deleted'], [])
+        self.assertTrue(response.data['next'])
+
+    def test_only_changes_since_token_are_returned(self):
+        """Test that a token only yields updates and tombstones after it"""
+        with self._later(10):
+            token = self.client.get(self.url).data['next']
+
+        with self._later(20):
+            self.first.status = 'contacted'
+            self.first.save()
+            second_id = self.second.id
+            self.second.delete()
+            third = Lead.objects.create(name='Third', created_by=self.user)
+
+        with self._later(30):
+            response = self.client.get(self.url, {'since': token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([lead['id'] for lead in response.data['changed']], [self.first.id, third.id])
+        self.assertEqual(response.data['deleted'], [second_id])
+
+        with self._later(40):
+            response = self.client.get(self.url, {'since': response.data['next']})
+        self.assertEqual(response.data['changed'], [])
+        self.assertEqual(response.data['deleted'], [])
+
+    def test_pages_through_changes(self):
+        """Test that a small limit pages through changes without gaps"""
+        seen = []
+        token = None
+        with self._later(10):
+            while True:
+                params = {'limit': 1}
+                if token:
+                    params['since'] = token
+                data = self.client.get(self.url, params).data
+                seen.extend(lead['id'] for lead in data['changed'])
+                token = data['next']
+                if not data['has_more']:
+                    break
+        self.assertEqual(seen, [self.first.id, self.second.id])
+
+    def test_list_returns_sync_token(self):
+        """Test that the full list hands out a token for later delta syncs"""
+        with self._later(10):
+            token = self.client.get(reverse('lead-list-create'))['X-Sync-Token']
+        with self._later(20):
+            self.first.name = 'Renamed'
+            self.first.save()
+        with self._later(30):
+            response = self.client.get(self.url, {'since': token})
+        self.assertEqual([lead['name'] for lead in response.data['changed']], ['Renamed'])
+
+    def test_invalid_and_expired_tokens(self):
+        """Test that bad tokens are rejected and stale ones ask for a reset"""
+        response = self.client.get(self.url, {'since': 'garbage'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        naive = encode_token(None, 0, datetime(2026, 1, 1))
+        response = self.client.get(self.url, {'since': naive})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        stale = encode_token(None, 0, timezone.now() - timedelta(days=90))
+        response = self.client.get(self.url, {'since': stale})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+        self.assertTrue(response.data['reset'])
+
+    def test_prune_deletions(self):
+        """Test that old tombstones are pruned"""
+        self.first.delete()
+        self.assertEqual(prune_deletions(now=timezone.now() + timedelta(days=60)), 1)
+        self.assertFalse(LeadDeletion.objects.exists())
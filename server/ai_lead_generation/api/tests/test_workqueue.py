@@ -0,0 +1,94 @@
+import io
+from datetime import timedelta
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from ..models import Lead, WorkChunk
+from ..scoring import SCORE_VERSION
+from ..workqueue import (
+    MAX_ATTEMPTS, claim_chunk, complete_chunk, enqueue_chunks, fail_chunk, heartbeat, queue_status, run_worker
+)
+
+User = get_user_model()
+
+class WorkQueueTests(TestCase):
+    def setUp(self):
+        enqueue_chunks('rescore', 'nightly', [(1, 11), (11, 21), (21, 31)])
+
+    def test_enqueue_is_idempotent(self):
+        """Test that enqueuing the same run twice does not duplicate chunks"""
+        enqueue_chunks('rescore', 'nightly', [(1, 11), (11, 21), (21, 31)])
+        self.assertEqual(WorkChunk.objects.count(), 3)
+
+    def test_workers_claim_distinct_chunks(self):
+        """Test that each claim hands out a different chunk until none are left"""
+        claimed = [claim_chunk('rescore', 'nightly', f'worker-{i}') for i in range(3)]
+        self.assertEqual(sorted(chunk.start_id for chunk in claimed), [1, 11, 21])
+        self.assertIsNone(claim_chunk('rescore', 'nightly', 'worker-3'))
+        self.assertEqual(queue_status('rescore', 'nightly'), {'claimed': 3})
+
+    def test_expired_lease_is_reclaimed(self):
+        """Test that a chunk whose worker stopped heartbeating is claimed again"""
+        dead = claim_chunk('rescore', 'nightly', 'dead-worker')
+        claim_chunk('rescore', 'nightly', 'worker-a')
+        claim_chunk('rescore', 'nightly', 'worker-b')
+        self.assertIsNone(claim_chunk('rescore', 'nightly', 'worker-c'))
+        WorkChunk.objects.filter(id=dead.id).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+
+        rescued = claim_chunk('rescore', 'nightly', 'worker-c')
+        self.assertEqual(rescued.id, dead.id)
+        self.assertEqual(rescued.attempts, 2)
+        self.assertFalse(heartbeat(dead))
+        self.assertFalse(complete_chunk(dead))
+        self.assertTrue(complete_chunk(rescued, [10, 10]))
+
+    def test_failed_chunks_are_retried(self):
+        """Test that failures release the chunk until MAX_ATTEMPTS"""
+        for attempt in range(MAX_ATTEMPTS):
+            chunk = claim_chunk('rescore', 'nightly', 'worker')
+            self.assertEqual(chunk.start_id, 1)
+            fail_chunk(chunk, 'boom')
+        chunk = WorkChunk.objects.get(start_id=1)
+        self.assertEqual(chunk.status, 'failed')
+        self.assertEqual(chunk.error, 'boom')
+        self.assertEqual(claim_chunk('rescore', 'nightly', 'worker').start_id, 11)
+
+    def test_abandoned_last_attempt_fails(self):
+        """Test that a chunk abandoned on its last attempt is reported as failed"""
+        chunk = claim_chunk('rescore', 'nightly', 'dead-worker')
+        WorkChunk.objects.filter(id=chunk.id).update(
+            attempts=MAX_ATTEMPTS, heartbeat_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(queue_status('rescore', 'nightly'), {'pending': 2, 'failed': 1})
+        chunk.refresh_from_db()
+        self.assertIn('Lease expired', chunk.error)
+        self.assertEqual(claim_chunk('rescore', 'nightly', 'worker').start_id, 11)
+
+    def test_run_worker(self):
+        """Test that a worker drains the run and records results"""
+        seen = []
+        results = run_worker('rescore', 'nightly', lambda start, end: seen.append(start) or [end - start, 0])
+        self.assertEqual(sorted(seen), [1, 11, 21])
+        self.assertEqual(results, [[10, 0]] * 3)
+        self.assertEqual(queue_status('rescore', 'nightly'), {'done': 3})
+
+
+class QueuedRescoreTests(TestCase):
+    def test_rescore_leads_queue(self):
+        """Test rescore_leads working through a shared queue run"""
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        for i in range(5):
+            Lead.objects.create(name=f'Lead {i}', industry='Technology', created_by=user)
+        Lead.objects.update(lead_score=0, score_version=SCORE_VERSION - 1)
+
+        out = io.StringIO()
+        call_command('rescore_leads', '--queue', 'nightly', '--workers', '1', '--chunk-size', '2', stdout=out)
+        self.assertIn('from 3 chunks', out.getvalue())
+        self.assertEqual(set(Lead.objects.values_list('lead_score', flat=True)), {30})
+        self.assertEqual(queue_status('rescore', 'nightly'), {'done': 3})
+
+        # A second host joining the finished run has nothing left to do
+        out = io.StringIO()
+        call_command('rescore_leads', '--queue', 'nightly', '--workers', '1', '--chunk-size', '2', stdout=out)
+        self.assertIn('from 0 chunks', out.getvalue())
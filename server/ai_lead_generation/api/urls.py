@@ -4,6 +4,17 @@ from .views import (
     UserRegistrationView,
     LeadListCreateView,
     ImportLeadsView,
+    BatchLeadsView,
+    ExportLeadsView,
+    SearchLeadsView,
+    LookalikeLeadsView,
+    LeadFacetsView,
+    DashboardSummaryView,
+    ScoringProfileView,
+    LeadChangesView,
+    lead_events,
+    generate_messages_async,
+    import_leads_async,
     ProcessLeadsView,
     GenerateMessagesView,
     TestMessageGenerationView
@@ -18,7 +29,26 @@ urlpatterns = [
     # Lead management endpoints
     path('leads/', LeadListCreateView.as_view(), name='lead-list-create'),
     path('leads/import/', ImportLeadsView.as_view(), name='import-leads'),
+    path('leads/batch/', BatchLeadsView.as_view(), name='batch-leads'),
+    path('leads/export/', ExportLeadsView.as_view(), name='export-leads'),
+    path('leads/search/', SearchLeadsView.as_view(), name='search-leads'),
+    path('leads/lookalikes/', LookalikeLeadsView.as_view(), name='lookalike-leads'),
+    path('leads/facets/', LeadFacetsView.as_view(), name='lead-facets'),
+    path('leads/changes/', LeadChangesView.as_view(), name='lead-changes'),
     path('leads/process/', ProcessLeadsView.as_view(), name='process-leads'),
     path('leads/generate-messages/', GenerateMessagesView.as_view(), name='generate-messages'),
     path('leads/test-message/', TestMessageGenerationView.as_view(), name='test_message_generation'),
+
+    # Async variants of the I/O-bound endpoints (served under ASGI)
+    path('async/leads/import/', import_leads_async, name='import-leads-async'),
+    path('async/leads/<int:lead_id>/generate-messages/', generate_messages_async, name='generate-messages-async'),
+
+    # Live updates (server-sent events, served under ASGI)
+    path('events/', lead_events, name='lead-events'),
+
+    # Scoring
+    path('scoring-profile/', ScoringProfileView.as_view(), name='scoring-profile'),
+
+    # Dashboard endpoints
+    path('dashboard/summary/', DashboardSummaryView.as_view(), name='dashboard-summary'),
 ]
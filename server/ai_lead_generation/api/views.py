@@ -1,14 +1,28 @@
 from django.shortcuts import get_object_or_404
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from asgiref.sync import sync_to_async
 from rest_framework import viewsets, status, generics
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from django.contrib.auth import get_user_model
-from .models import Lead, Outreach
-from .serializers import LeadSerializer, UserSerializer, OutreachSerializer
+from .authentication import CachedJWTAuthentication
+from .models import Lead, Outreach, ScoringProfile
+from .serializers import LeadSerializer, UserSerializer, OutreachSerializer, ScoringProfileSerializer
 from .services import LeadAutomationService
+from .filters import filter_leads
+from .search import search_leads
+from .facets import FACETS, lead_facets
+from .lookalike import UNWORKED_STATUSES, find_lookalikes
+from .rollups import dashboard_summary
+from .events import event_stream, get_backend
+from .sync import SYNC_PAGE_SIZE, SyncTokenError, SyncTokenExpired, current_token, lead_changes
+from .exports import EXPORT_FORMATS, stream_leads
 import csv
 import io
 import logging
@@ -27,7 +41,19 @@ class LeadListCreateView(generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return Lead.objects.filter(created_by=self.request.user)
+        try:
+            return filter_leads(
+                Lead.objects.filter(created_by=self.request.user), self.request.query_params
+            )
+        except ValueError as e:
+            raise ValidationError({'error': str(e)})
+
+    def list(self, request, *args, **kwargs):
+        # Taken before the query runs so nothing written meanwhile is skipped
+        sync_token = current_token()
+        response = super().list(request, *args, **kwargs)
+        response['X-Sync-Token'] = sync_token
+        return response
     
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -40,6 +66,149 @@ class LeadDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         return Lead.objects.filter(created_by=self.request.user)
 
+class SearchLeadsView(APIView):
+    permission_classes = [IsAuthenticated]
+    default_limit = 50
+    max_limit = 200
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'Query parameter q is required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(request.query_params.get('limit', self.default_limit)), self.max_limit)
+            leads = filter_leads(Lead.objects.filter(created_by=request.user), request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = []
+        for lead in search_leads(leads, query)[:max(limit, 1)]:
+            data = LeadSerializer(lead).data
+            data['search_rank'] = lead.search_rank
+            results.append(data)
+        return Response({'count': len(results), 'results': results}, status=status.HTTP_200_OK)
+
+class LookalikeLeadsView(APIView):
+    """Unworked leads most similar to the user's converted leads (or to ``seed`` ids)"""
+    permission_classes = [IsAuthenticated]
+    default_limit = 20
+    max_limit = 200
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = min(int(request.query_params.get('limit', self.default_limit)), self.max_limit)
+            seed_ids = [int(seed) for seed in request.query_params.getlist('seed')]
+        except ValueError:
+            return Response({'error': 'limit and seed must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        statuses = request.query_params.getlist('status') or UNWORKED_STATUSES
+        valid = {choice for choice, _ in Lead.STATUS_CHOICES}
+        if not set(statuses) <= valid:
+            return Response({'error': 'Invalid status'}, status=status.HTTP_400_BAD_REQUEST)
+
+        seeds, matches = find_lookalikes(request.user, seed_ids=seed_ids, k=max(limit, 1), statuses=statuses)
+        leads = Lead.objects.filter(created_by=request.user).in_bulk([lead_id for lead_id, _ in matches])
+        results = []
+        for lead_id, similarity in matches:
+            if lead_id in leads:
+                data = LeadSerializer(leads[lead_id]).data
+                data['similarity'] = similarity
+                results.append(data)
+        return Response({'seed_count': len(seeds), 'count': len(results), 'results': results},
+                        status=status.HTTP_200_OK)
+
+class LeadFacetsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        requested = request.query_params.get('facets')
+        facets = [f.strip() for f in requested.split(',') if f.strip()] if requested else list(FACETS)
+        invalid = set(facets) - set(FACETS)
+        if invalid:
+            return Response(
+                {'error': f"Invalid facets: {', '.join(sorted(invalid))}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            leads = filter_leads(Lead.objects.filter(created_by=request.user), request.query_params)
+            return Response({
+                'total': leads.count(),
+                'facets': lead_facets(leads, facets)
+            }, status=status.HTTP_200_OK)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+class LeadChangesView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = int(request.query_params.get('limit', SYNC_PAGE_SIZE))
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, SYNC_PAGE_SIZE))
+
+        try:
+            changes = lead_changes(request.user, request.query_params.get('since'), limit=limit)
+        except SyncTokenExpired as e:
+            return Response({'error': str(e), 'reset': True}, status=status.HTTP_410_GONE)
+        except SyncTokenError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        changes['changed'] = LeadSerializer(changes['changed'], many=True).data
+        return Response(changes, status=status.HTTP_200_OK)
+
+class DashboardSummaryView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            days = int(request.query_params.get('days', 30))
+        except ValueError:
+            return Response({'error': 'days must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        days = max(1, min(days, 366))
+        return Response(dashboard_summary(request.user, days=days), status=status.HTTP_200_OK)
+
+class ScoringProfileView(generics.RetrieveUpdateAPIView):
+    """The user's scoring profile; saving it rescores their leads in the background"""
+    serializer_class = ScoringProfileSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_object(self):
+        try:
+            return self.request.user.scoring_profile
+        except ScoringProfile.DoesNotExist:
+            # Unsaved defaults; the first update creates the profile
+            return ScoringProfile(user=self.request.user)
+
+class ExportLeadsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        # ``format`` is reserved by DRF for renderer selection
+        export_format = request.query_params.get('export_format', 'csv').lower()
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"export_format must be one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        compress = request.query_params.get('compress', '').lower() == 'gzip'
+
+        try:
+            leads = filter_leads(Lead.objects.filter(created_by=request.user), request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        filename = f'leads.{export_format}'
+        content_type = EXPORT_FORMATS[export_format]
+        if compress:
+            filename += '.gz'
+            content_type = 'application/gzip'
+        response = StreamingHttpResponse(
+            stream_leads(leads, export_format, compress=compress), content_type=content_type
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
 class ImportLeadsView(APIView):
     parser_classes = (MultiPartParser, FormParser)
     permission_classes = [IsAuthenticated]
@@ -67,6 +236,32 @@ class ImportLeadsView(APIView):
             logger.error(f"Error importing leads: {str(e)}")
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+class BatchLeadsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        if not isinstance(request.data, dict):
+            return Response(
+                {'error': "Request body must be an object with an 'operations' list"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            service = LeadAutomationService()
+            applied, results = service.apply_lead_batch(
+                request.data.get('operations'), request.user
+            )
+            if not applied:
+                return Response({'applied': False, 'results': results}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({'applied': True, 'results': results}, status=status.HTTP_200_OK)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"Error applying lead batch: {str(e)}")
+            return Response(
+                {'error': 'An error occurred while applying the batch'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
 class ProcessLeadsView(APIView):
     permission_classes = [IsAuthenticated]
     
@@ -141,3 +336,98 @@ class TestMessageGenerationView(APIView):
         except Exception as e:
             logger.error(f"Error testing message generation: {str(e)}")
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+def authenticate_jwt_request(request, allow_query_token=False):
+    """Resolve the user for a plain Django view from a JWT, or return None.
+
+    Browsers' EventSource cannot set headers, so streaming views may accept
+    the access token as ``?token=`` instead.
+    """
+    authenticator = CachedJWTAuthentication()
+    raw_token = None
+    header = authenticator.get_header(request)
+    if header is not None:
+        raw_token = authenticator.get_raw_token(header)
+    if raw_token is None and allow_query_token:
+        raw_token = request.GET.get('token')
+    if not raw_token:
+        return None
+    try:
+        user = authenticator.get_user(authenticator.get_validated_token(raw_token))
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return None
+    return user if user.is_active else None
+
+def _unauthorized():
+    return JsonResponse({'error': 'Authentication credentials were not provided.'}, status=401)
+
+async def lead_events(request):
+    """Stream score, status and outreach events for the user's leads (ASGI)"""
+    user = await sync_to_async(authenticate_jwt_request)(request, allow_query_token=True)
+    if user is None:
+        return _unauthorized()
+
+    subscription = get_backend().subscribe(user.id)
+    response = StreamingHttpResponse(event_stream(subscription), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+# Async variants of the I/O-bound endpoints. DRF's APIView is sync-only, so
+# these are plain Django async views; under ASGI they wait on the database
+# and uploads without holding a worker thread per request.
+
+@csrf_exempt
+async def generate_messages_async(request, lead_id):
+    """Async variant of GenerateMessagesView"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    user = await sync_to_async(authenticate_jwt_request)(request)
+    if user is None:
+        return _unauthorized()
+    try:
+        lead = await Lead.objects.filter(created_by=user).aget(id=lead_id)
+    except Lead.DoesNotExist:
+        return JsonResponse({'error': f'Lead with id {lead_id} not found'}, status=404)
+
+    try:
+        service = LeadAutomationService()
+        outreach = await Outreach.objects.acreate(
+            lead=lead,
+            email_content=service.generate_email_content(lead),
+            linkedin_content=service.generate_linkedin_message(lead)
+        )
+        return JsonResponse(OutreachSerializer(outreach).data, status=201)
+    except Exception as e:
+        logger.error(f"Error generating messages for lead {lead_id}: {str(e)}")
+        return JsonResponse({'error': str(e)}, status=400)
+
+@csrf_exempt
+async def import_leads_async(request):
+    """Async variant of ImportLeadsView"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    user = await sync_to_async(authenticate_jwt_request)(request)
+    if user is None:
+        return _unauthorized()
+
+    files = await sync_to_async(lambda: request.FILES)()
+    if 'file' not in files:
+        return JsonResponse({'error': 'No file provided'}, status=400)
+    csv_file = files['file']
+    if not csv_file.name.endswith('.csv'):
+        return JsonResponse({'error': 'File must be CSV format'}, status=400)
+
+    try:
+        decoded_file = (await sync_to_async(csv_file.read)()).decode('utf-8')
+        csv_data = list(csv.DictReader(io.StringIO(decoded_file)))
+        if not csv_data:
+            return JsonResponse({'error': 'CSV file is empty'}, status=400)
+
+        service = LeadAutomationService()
+        result = await service.aimport_leads_from_csv(csv_data, user)
+        return JsonResponse(result, status=201)
+    except Exception as e:
+        logger.error(f"Error importing leads: {str(e)}")
+        return JsonResponse({'error': str(e)}, status=400)
@@ -0,0 +1,202 @@
+"""Database-backed queue of lead id-range chunks for multi-host batch work.
+
+Every host runs the same command against the same ``run`` label. Chunks are
+enqueued idempotently, then each worker process claims one chunk at a time:
+with ``SELECT ... FOR UPDATE SKIP LOCKED`` where the database supports it
+(PostgreSQL), otherwise with a conditional ``UPDATE`` that only one worker
+can win. Claimed chunks are heartbeated while they run; a chunk whose
+heartbeat is older than the lease is treated as abandoned and can be
+claimed again, up to ``MAX_ATTEMPTS`` times. An abandoned chunk that has
+used up its attempts is marked failed.
+"""
+import logging
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from django.db import close_old_connections, connection, connections, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE = timedelta(minutes=5)
+MAX_ATTEMPTS = 3
+
+
+def default_worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+
+
+def enqueue_chunks(queue, run, chunks):
+    """Queue ``(start, end)`` chunks for ``run``; chunks already queued are left alone"""
+    from .models import WorkChunk
+
+    WorkChunk.objects.bulk_create([
+        WorkChunk(queue=queue, run=run, start_id=start, end_id=end) for start, end in chunks
+    ], batch_size=1000, ignore_conflicts=True)
+
+
+def _claimable(queue, run, lease):
+    from .models import WorkChunk
+
+    expired = timezone.now() - lease
+    return WorkChunk.objects.filter(queue=queue, run=run, attempts__lt=MAX_ATTEMPTS).filter(
+        Q(status='pending') | Q(status='claimed', heartbeat_at__lt=expired)
+    )
+
+
+def fail_abandoned_chunks(queue, run, lease=DEFAULT_LEASE):
+    """Mark chunks whose last attempt's worker stopped heartbeating as failed"""
+    from .models import WorkChunk
+
+    expired = timezone.now() - lease
+    return WorkChunk.objects.filter(
+        queue=queue, run=run, status='claimed', heartbeat_at__lt=expired, attempts__gte=MAX_ATTEMPTS
+    ).update(status='failed', error=f'Lease expired on attempt {MAX_ATTEMPTS}')
+
+
+def claim_chunk(queue, run, worker, lease=DEFAULT_LEASE):
+    """Claim the next available chunk for ``worker``, or return None when none are left"""
+    from .models import WorkChunk
+
+    fail_abandoned_chunks(queue, run, lease)
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            chunk = _claimable(queue, run, lease).select_for_update(skip_locked=True).order_by('id').first()
+            if chunk is None:
+                return None
+            now = timezone.now()
+            chunk.status = 'claimed'
+            chunk.worker = worker
+            chunk.attempts += 1
+            chunk.claimed_at = chunk.heartbeat_at = now
+            chunk.save(update_fields=['status', 'worker', 'attempts', 'claimed_at', 'heartbeat_at'])
+            return chunk
+
+    # No SKIP LOCKED (SQLite): race on a conditional UPDATE; the loser tries the next chunk
+    while True:
+        candidates = list(_claimable(queue, run, lease).order_by('id').values_list('id', flat=True)[:10])
+        if not candidates:
+            return None
+        for chunk_id in candidates:
+            now = timezone.now()
+            won = _claimable(queue, run, lease).filter(id=chunk_id).update(
+                status='claimed', worker=worker, attempts=F('attempts') + 1,
+                claimed_at=now, heartbeat_at=now,
+            )
+            if won:
+                return WorkChunk.objects.get(id=chunk_id)
+
+
+def heartbeat(chunk):
+    """Extend the lease on ``chunk``; False means another worker has taken it over"""
+    from .models import WorkChunk
+
+    return bool(WorkChunk.objects.filter(id=chunk.id, status='claimed', worker=chunk.worker).update(
+        heartbeat_at=timezone.now()
+    ))
+
+
+def complete_chunk(chunk, result=None):
+    from .models import WorkChunk
+
+    return bool(WorkChunk.objects.filter(id=chunk.id, worker=chunk.worker).update(
+        status='done', result=result, finished_at=timezone.now(), error=''
+    ))
+
+
+def fail_chunk(chunk, error):
+    """Release a chunk after an error; it is retried until MAX_ATTEMPTS"""
+    from .models import WorkChunk
+
+    status = 'failed' if chunk.attempts >= MAX_ATTEMPTS else 'pending'
+    WorkChunk.objects.filter(id=chunk.id, worker=chunk.worker).update(status=status, error=error)
+
+
+def queue_status(queue, run, lease=DEFAULT_LEASE):
+    """Return ``{status: count}`` for a run"""
+    from .models import WorkChunk
+
+    fail_abandoned_chunks(queue, run, lease)
+    rows = WorkChunk.objects.filter(queue=queue, run=run).values('status').annotate(count=Count('id'))
+    return {row['status']: row['count'] for row in rows}
+
+
+class _Heartbeat(threading.Thread):
+    def __init__(self, chunk, interval):
+        super().__init__(daemon=True)
+        self.chunk = chunk
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                if not heartbeat(self.chunk):
+                    logger.warning(f"Lost the lease on work chunk {self.chunk.id}")
+                    return
+        finally:
+            close_old_connections()
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def run_worker(queue, run, handler, worker=None, lease=DEFAULT_LEASE):
+    """Claim and process chunks until the run has none left.
+
+    ``handler(start_id, end_id)`` does the work and returns a JSON-serializable
+    result. Returns the list of results this worker produced.
+    """
+    worker = worker or default_worker_name()
+    interval = max(lease.total_seconds() / 3, 1)
+    results = []
+    while True:
+        chunk = claim_chunk(queue, run, worker, lease)
+        if chunk is None:
+            return results
+        beat = _Heartbeat(chunk, interval)
+        beat.start()
+        try:
+            result = handler(chunk.start_id, chunk.end_id)
+        except Exception as e:
+            logger.error(f"Work chunk {chunk.id} failed: {str(e)}")
+            fail_chunk(chunk, str(e))
+            continue
+        finally:
+            beat.stop()
+        if complete_chunk(chunk, result):
+            results.append(result)
+
+
+def init_worker_process():
+    """ProcessPoolExecutor initializer for workers that use the ORM"""
+    import django
+    django.setup()
+
+
+def _worker_process(queue, run, handler, lease):
+    try:
+        return run_worker(queue, run, handler, lease=lease)
+    finally:
+        connections.close_all()
+
+
+def run_workers(queue, run, handler, workers=1, lease=DEFAULT_LEASE):
+    """Work through a run with ``workers`` local processes; returns every result.
+
+    ``handler`` must be picklable (a module-level function or a
+    ``functools.partial`` of one) when ``workers`` is more than 1.
+    """
+    if workers <= 1:
+        return run_worker(queue, run, handler, lease=lease)
+    # Children must not share the parent's database connections
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker_process) as pool:
+        futures = [pool.submit(_worker_process, queue, run, handler, lease) for _ in range(workers)]
+        return [result for future in futures for result in future.result()]